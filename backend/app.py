@@ -4,14 +4,28 @@ Flask API service that provides access to Sea Level Anomaly data from local NetC
 """
 
 import os
+import json
+import math
+import hashlib
+from io import BytesIO
+from functools import lru_cache
 from pathlib import Path
 from flask import Flask, request, jsonify, redirect, send_file
 from flask_cors import CORS
-import xarray as xr
 import numpy as np
 
+from elevation import DEM_COG_PATH, SAMPLE_METHODS, dem_version, elevation_values
+from flood import get_flood_engine
+from netcdf_chunks import read_sla_points, reset_read_stats, read_stats, get_chunk_cache
+from ocean_snap import ocean_index_version, snap_to_ocean
+from profiling import init_profiling
+from sla_store import get_store, scan_years, data_version
+from tiles import tile_lonlat, colorize, encode_png, DIVERGING_STOPS, SEQUENTIAL_STOPS, FLOOD_STOPS
+
 app = Flask(__name__)
-CORS(app)  # Enable CORS for frontend access
+# Enable CORS for frontend access; metadata headers must be exposed to scripts
+CORS(app, expose_headers=['X-Grid-Info', 'X-SLA-Bytes-Decompressed', 'X-SLA-Chunks', 'X-Profile-File'])
+init_profiling(app)  # No-op unless PROFILING=1
 
 # ==================== Data Paths ====================
 
@@ -20,14 +34,16 @@ CORS(app)  # Enable CORS for frontend access
 BACKEND_DIR = Path(__file__).parent
 DATA_DIR = BACKEND_DIR.parent / "data_pipeline" / "jiayou_sat_data" / "monthly_raw"
 
-print(f"📁 Looking for NetCDF files in: {DATA_DIR}")
-
-if not DATA_DIR.exists():
-    print(f"⚠️ Warning: Data directory does not exist: {DATA_DIR}")
-else:
-    # Count files for verification
-    nc_files = list(DATA_DIR.glob("*.nc"))
-    print(f"✅ Found {len(nc_files)} NetCDF files")
+def report_data_directory():
+    """Print where SLA data is read from (run at server start, not at import)"""
+    print(f"📁 Looking for NetCDF files in: {DATA_DIR}")
+    
+    if not DATA_DIR.exists():
+        print(f"⚠️ Warning: Data directory does not exist: {DATA_DIR}")
+    else:
+        # Count files for verification
+        nc_files = list(DATA_DIR.glob("*.nc"))
+        print(f"✅ Found {len(nc_files)} NetCDF files")
 
 # ==================== NetCDF Data Functions ====================
 
@@ -45,28 +61,12 @@ def extract_sla_at_point(filepath: Path, lat: float, lon: float) -> float | None
     """
     Extract SLA value at a specific lat/lon from a NetCDF file
     Returns value in millimeters (mm)
+    Reads whole HDF5 chunks through the shared decoded-chunk cache, so nearby
+    points in the same file are served from memory
     """
     try:
-        # Open the NetCDF file
-        ds = xr.open_dataset(filepath)
-        
-        # Convert longitude from -180/180 to 0/360 if necessary
-        # NetCDF files use 0-360 longitude convention
-        lon_360 = lon if lon >= 0 else lon + 360
-        
-        # The dataset should have 'sla' variable with dimensions (time, latitude, longitude)
-        # Use sel with method='nearest' to find the closest grid point
-        sla_data = ds['sla'].sel(latitude=lat, longitude=lon_360, method='nearest')
-        
-        # If there's a time dimension, take the first (and likely only) time step
-        if 'time' in sla_data.dims:
-            sla_data = sla_data.isel(time=0)
-        
-        # Extract the value (in meters)
-        sla_value_m = float(sla_data.values)
-        
-        # Close the dataset
-        ds.close()
+        # Nearest grid cell (the files use 0-360 longitudes, handled by the reader)
+        sla_value_m = float(read_sla_points(filepath, [lat], [lon])[0])
         
         # Handle NaN values
         if np.isnan(sla_value_m):
@@ -81,15 +81,110 @@ def extract_sla_at_point(filepath: Path, lat: float, lon: float) -> float | None
         traceback.print_exc()
         return None
 
+def available_years() -> list:
+    """
+    Years served by the API, taken from the consolidated store if present,
+    otherwise from the raw NetCDF file names
+    """
+    store = get_store()
+    if store is not None:
+        return store.years
+    return scan_years(DATA_DIR)
+
+def get_sla_value(year: int, month: int, lat: float, lon: float) -> float | None:
+    """
+    SLA in millimeters at a point for one month
+    Reads the consolidated store when it holds the month, else the NetCDF file
+    """
+    store = get_store()
+    if store is not None and store.has_month(year, month):
+        return store.value_mm(year, month, lat, lon)
+    filepath = get_netcdf_filepath(year, month)
+    if filepath.exists():
+        return extract_sla_at_point(filepath, lat, lon)
+    return None
+
+def get_climatology(lat: float, lon: float, month: int, sea_level: float | None) -> dict | None:
+    """
+    Monthly climatology, deseasonalized trend and this month's (standardized) anomaly
+    None until data_pipeline/climatology.py has been run on the store
+    """
+    store = get_store()
+    if store is None:
+        return None
+    climatology = store.climatology(lat, lon, month)
+    if climatology is None:
+        return None
+    anomaly = None
+    standardized = None
+    if sea_level is not None and climatology['mean'] is not None:
+        anomaly = sea_level - climatology['mean']
+        if climatology['std']:
+            standardized = round(anomaly / climatology['std'], 2)
+        anomaly = round(anomaly, 2)
+    return {**climatology, 'anomaly': anomaly, 'standardizedAnomaly': standardized, 'unit': 'mm'}
+
+def get_extremes(lat: float, lon: float) -> dict | None:
+    """
+    Return levels fitted to annual SLA maxima at a point
+    None until data_pipeline/extremes.py has been run on the store
+    """
+    store = get_store()
+    if store is None:
+        return None
+    extremes = store.return_levels(lat, lon)
+    if extremes is None:
+        return None
+    return {**extremes, 'unit': 'mm'}
+
+# Largest slab /api/sla-grid returns: the full 0.25 degree grid (1,036,800 cells)
+# at stride 2, or a viewport of about 128 x 128 degrees at full resolution
+MAX_GRID_CELLS = 2 ** 18
+
+def quantize_grid(values: np.ndarray, dtype: str, vmin: float | None, vmax: float | None) -> tuple:
+    """
+    Quantize mm values to uint8/uint16 with value = q * scale + offset
+    The top code is nodata (NaN); vmin/vmax default to the data range
+    Returns (array, info dict)
+    """
+    nodata = int(np.iinfo(dtype).max)
+    finite = values[np.isfinite(values)]
+    if vmin is None:
+        vmin = float(finite.min()) if finite.size else 0.0
+    if vmax is None:
+        vmax = float(finite.max()) if finite.size else 0.0
+    scale = (vmax - vmin) / (nodata - 1) if vmax > vmin else 1.0
+    with np.errstate(invalid='ignore'):
+        codes = np.clip(np.rint((values - vmin) / scale), 0, nodata - 1)
+    codes = np.where(np.isfinite(values), codes, nodata).astype(dtype)
+    return codes, {'scale': scale, 'offset': vmin, 'nodata': nodata}
+
+def sla_month_available(year: int, month: int) -> bool:
+    store = get_store()
+    if store is not None and store.has_month(year, month):
+        return True
+    return get_netcdf_filepath(year, month).exists()
+
 def get_timeseries_for_point(lat: float, lon: float, month: int) -> list:
     """
-    Get time series of SLA values for a specific lat/lon and month across all years (1993-2022)
+    Get time series of SLA values for a specific lat/lon and month across all available years
     Returns list of dicts with 'date' and 'value' (in mm)
+    Results are cached per data version, so a new ingest invalidates them
     """
-    years = range(1993, 2023)  # 1993 to 2022
+    return _cached_timeseries(data_version(DATA_DIR), lat, lon, month)
+
+@lru_cache(maxsize=1024)
+def _cached_timeseries(version: str, lat: float, lon: float, month: int) -> list:
+    store = get_store()
+    if store is not None:
+        return [
+            {'date': f"{year}-{month:02d}-15", 'value': round(value, 2) if value is not None else None}
+            for year, value in store.month_series_mm(lat, lon, month)
+        ]
+    
     timeseries = []
     
-    for year in years:
+    for year in available_years():
         filepath = get_netcdf_filepath(year, month)
         
         if not filepath.exists():
@@ -111,39 +206,121 @@ def get_timeseries_for_point(lat: float, lon: float, month: int) -> list:
     
     return timeseries
 
+# ==================== Caching ====================
+
+# Per-request counters of NetCDF chunk decompression (fallback read path)
+@app.before_request
+def start_read_stats():
+    reset_read_stats()
+
+@app.after_request
+def add_read_stats(response):
+    stats = read_stats()
+    if stats['chunksDecompressed'] or stats['chunkHits']:
+        response.headers['X-SLA-Bytes-Decompressed'] = str(stats['bytesDecompressed'])
+        response.headers['X-SLA-Chunks'] = f"decompressed={stats['chunksDecompressed']}, hits={stats['chunkHits']}"
+    return response
+
+# SLA responses only change with the data version and the ocean index that snaps
+# their points, so their ETag is those versions plus the request URL and
+# revalidation needs no data access
+SLA_ENDPOINTS = {
+    'get_sea_level', 'get_timeseries', 'get_point_analytics', 'get_anomaly_tiles', 'get_return_level_tiles',
+    'get_slr_tiles', 'get_sla_grid'
+}
+
+# SLA endpoints whose responses also include DEM elevations
+DEM_ENDPOINTS = {'get_point_analytics'}
+
+def sla_etag() -> str:
+    url_hash = hashlib.sha1(request.full_path.encode()).hexdigest()[:16]
+    version = f"{data_version(DATA_DIR)}-{ocean_index_version()}"
+    if request.endpoint in DEM_ENDPOINTS:
+        version += f"-{dem_version()}"
+    return f"{version}-{url_hash}"
+
+@app.before_request
+def check_etag():
+    if request.endpoint in SLA_ENDPOINTS and request.if_none_match:
+        etag = sla_etag()
+        if request.if_none_match.contains_weak(etag):
+            response = app.response_class(status=304)
+            response.set_etag(etag, weak=True)
+            return response
+
+@app.after_request
+def add_etag(response):
+    if request.endpoint in SLA_ENDPOINTS and response.status_code == 200:
+        response.set_etag(sla_etag(), weak=True)
+        response.headers['Cache-Control'] = 'no-cache'
+    return response
+
 # ==================== API Endpoints ====================
 
 @app.route('/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
     nc_files = list(DATA_DIR.glob("*.nc")) if DATA_DIR.exists() else []
+    years = available_years()
     return jsonify({
         'status': 'healthy',
         'service': 'Coastal Flood Viewer API',
         'data_files_available': len(nc_files),
-        'data_directory': str(DATA_DIR)
+        'data_directory': str(DATA_DIR),
+        'data_version': data_version(DATA_DIR),
+        'years': [years[0], years[-1]] if years else None,
+        'netcdf_chunk_cache': get_chunk_cache().info()
     })
 
 @app.route('/api/elevation', methods=['GET'])
 def get_elevation():
     """
     Get elevation at a specific point
-    Query params: lat, lon, scale (optional)
-    Note: DEM functionality removed - using local NetCDF files only
+    Query params: lat, lon, scale (optional, meters), method (optional: bilinear|nearest)
+    Reads the local DEM COG produced by the data pipeline
     """
     try:
-        lat = float(request.args.get('lat'))
-        lon = float(request.args.get('lon'))
+        try:
+            lat = float(request.args['lat'])
+            lon = float(request.args['lon'])
+            scale = float(request.args['scale']) if 'scale' in request.args else None
+            valid = math.isfinite(lat) and math.isfinite(lon) and (scale is None or math.isfinite(scale))
+        except (KeyError, ValueError):
+            valid = False
+        if not valid:
+            return jsonify({
+                'error': 'Invalid parameters',
+                'message': 'lat and lon must be finite numbers, scale a finite number of meters'
+            }), 400
+        method = request.args.get('method', 'bilinear')
+        
+        if method not in SAMPLE_METHODS:
+            return jsonify({
+                'error': 'Invalid method',
+                'message': f"method must be one of {', '.join(SAMPLE_METHODS)}"
+            }), 400
+        
+        if not DEM_COG_PATH.exists():
+            return jsonify({
+                'lat': lat,
+                'lon': lon,
+                'elevation': None,
+                'unit': 'meters',
+                'source': 'Not available - using NetCDF SLA data only',
+                'message': 'DEM data not available in this version'
+            })
+        
+        elevation = elevation_values([lat], [lon], method=method, scale=scale)[0]
         
-        # For now, return a placeholder since we're focusing on SLA data
-        # This can be implemented later with local DEM files
         return jsonify({
             'lat': lat,
             'lon': lon,
-            'elevation': None,
+            'elevation': elevation,
             'unit': 'meters',
-            'source': 'Not available - using NetCDF SLA data only',
-            'message': 'DEM data not available in this version'
+            'source': 'Local DEM COG',
+            'file': DEM_COG_PATH.name,
+            'method': method,
+            'scale': scale
         })
         
     except Exception as e:
@@ -152,6 +329,80 @@ def get_elevation():
             'message': str(e)
         }), 500
 
+@app.route('/api/elevation/batch', methods=['POST'])
+def get_elevation_batch():
+    """
+    Get elevations for many points in one request
+    JSON body: {"points": [{"lat": ..., "lon": ...}, ...], "method": "bilinear", "scale": null}
+    """
+    try:
+        body = request.get_json(force=True, silent=True)
+        if not isinstance(body, dict):
+            return jsonify({
+                'error': 'Invalid body',
+                'message': 'Body must be a JSON object with a points list'
+            }), 400
+        points = body.get('points', [])
+        method = body.get('method', 'bilinear')
+        scale = body.get('scale')
+        
+        if method not in SAMPLE_METHODS:
+            return jsonify({
+                'error': 'Invalid method',
+                'message': f"method must be one of {', '.join(SAMPLE_METHODS)}"
+            }), 400
+        
+        if not isinstance(points, list):
+            return jsonify({
+                'error': 'Invalid points',
+                'message': 'points must be a list of {"lat": ..., "lon": ...} objects'
+            }), 400
+        
+        if len(points) > 10000:
+            return jsonify({
+                'error': 'Too many points',
+                'message': 'At most 10000 points per request'
+            }), 400
+        
+        if scale is not None and (isinstance(scale, bool) or not isinstance(scale, (int, float)) or not math.isfinite(scale)):
+            return jsonify({
+                'error': 'Invalid scale',
+                'message': 'scale must be a finite number or null'
+            }), 400
+        
+        lats, lons = [], []
+        for i, point in enumerate(points):
+            try:
+                lat, lon = float(point['lat']), float(point['lon'])
+                valid = math.isfinite(lat) and math.isfinite(lon)
+            except (KeyError, TypeError, ValueError):
+                valid = False
+            if not valid:
+                return jsonify({
+                    'error': 'Invalid points',
+                    'message': f'Point {i} needs finite numeric lat and lon'
+                }), 400
+            lats.append(lat)
+            lons.append(lon)
+        
+        elevations = elevation_values(lats, lons, method=method, scale=scale)
+        
+        return jsonify({
+            'points': [
+                {'lat': lat, 'lon': lon, 'elevation': elevation}
+                for lat, lon, elevation in zip(lats, lons, elevations)
+            ],
+            'unit': 'meters',
+            'source': 'Local DEM COG' if DEM_COG_PATH.exists() else 'Not available',
+            'method': method
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'error': 'Failed to get elevations',
+            'message': str(e)
+        }), 500
+
 @app.route('/api/sea-level', methods=['GET'])
 def get_sea_level():
     """
@@ -167,14 +418,17 @@ def get_sea_level():
         # Get the NetCDF file path
         filepath = get_netcdf_filepath(year, month)
         
-        if not filepath.exists():
+        if not sla_month_available(year, month):
             return jsonify({
                 'error': 'Data not available',
                 'message': f'No data file found for {year}-{month:02d}'
             }), 404
         
+        # Snap land (NaN) cells to the nearest ocean cell
+        read_lat, read_lon, grid_cell = snap_to_ocean(lat, lon)
+        
         # Extract SLA value at the point
-        sla_value = extract_sla_at_point(filepath, lat, lon)
+        sla_value = get_sla_value(year, month, read_lat, read_lon)
         
         return jsonify({
             'lat': lat,
@@ -182,6 +436,8 @@ def get_sea_level():
             'year': year,
             'month': month,
             'seaLevel': sla_value,
+            'climatology': get_climatology(read_lat, read_lon, month, sla_value),
+            'gridCell': grid_cell,
             'unit': 'mm',
             'source': 'Local NetCDF files',
             'file': filepath.name
@@ -198,7 +454,7 @@ def get_timeseries():
     """
     Get time series of sea level anomaly for a specific point and month
     Query params: lat, lon, month
-    Returns SLA time series from 1993-2022 for the specified month
+    Returns SLA time series across all available years for the specified month
     """
     try:
         lat = float(request.args.get('lat'))
@@ -207,8 +463,11 @@ def get_timeseries():
         
         print(f"📊 Fetching time series for ({lat}, {lon}) for month {month}")
         
+        # Snap land (NaN) cells to the nearest ocean cell
+        read_lat, read_lon, grid_cell = snap_to_ocean(lat, lon)
+        
         # Get time series data from NetCDF files
-        timeseries_data = get_timeseries_for_point(lat, lon, month)
+        timeseries_data = get_timeseries_for_point(read_lat, read_lon, month)
         
         # Filter out None values for cleaner data
         valid_data = [d for d in timeseries_data if d['value'] is not None]
@@ -226,6 +485,7 @@ def get_timeseries():
             'unit': 'mm',
             'variable': 'Sea Level Anomaly',
             'location': {'lat': lat, 'lon': lon},
+            'gridCell': grid_cell,
             'source': 'Local NetCDF files'
         })
         
@@ -252,14 +512,22 @@ def get_point_analytics():
         
         print(f"📍 Point analytics for ({lat}, {lon}) - {year}-{month:02d}")
         
+        # Elevation is a cached block read from the local DEM COG; a bad COG
+        # leaves it empty rather than failing the whole response
+        try:
+            elevation = elevation_values([lat], [lon])[0]
+        except Exception as e:
+            print(f"⚠️ Elevation lookup failed for ({lat}, {lon}): {e}")
+            elevation = None
+        
+        # Snap land (NaN) cells to the nearest ocean cell
+        read_lat, read_lon, grid_cell = snap_to_ocean(lat, lon)
+        
         # Get current SLA value
-        filepath = get_netcdf_filepath(year, month)
-        sea_level = None
-        if filepath.exists():
-            sea_level = extract_sla_at_point(filepath, lat, lon)
+        sea_level = get_sla_value(year, month, read_lat, read_lon)
         
         # Get time series data from NetCDF files
-        timeseries_data = get_timeseries_for_point(lat, lon, month)
+        timeseries_data = get_timeseries_for_point(read_lat, read_lon, month)
         
         # Filter out None values for statistics calculation
         valid_data = [d for d in timeseries_data if d['value'] is not None]
@@ -306,8 +574,11 @@ def get_point_analytics():
         return jsonify({
             'lat': lat,
             'lon': lon,
-            'elevation': None,  # DEM not available in this version
+            'elevation': elevation,
             'seaLevel': sea_level,
+            'climatology': get_climatology(read_lat, read_lon, month, sea_level),
+            'extremes': get_extremes(read_lat, read_lon),
+            'gridCell': grid_cell,
             'timeSeries': {
                 'data': valid_data,
                 'unit': 'mm',
@@ -323,7 +594,7 @@ def get_point_analytics():
                 'recentChange': round(recent_change, 2)
             },
             'source': {
-                'dem': 'Not available',
+                'dem': 'Local DEM COG' if DEM_COG_PATH.exists() else 'Not available',
                 'sla': 'Local NetCDF files'
             }
         })
@@ -351,6 +622,237 @@ def get_flood_tiles(z, x, y):
     )
     return send_file(BytesIO(transparent_png), mimetype='image/png')
 
+@app.route('/api/sla-grid', methods=['GET'])
+def get_sla_grid():
+    """
+    Downsampled SLA slab for one month, read straight from the memory-mapped store
+    Query params: year, month, bbox=minLon,minLat,maxLon,maxLat (optional, default global),
+                  stride (optional, every n-th cell, default 1),
+                  dtype (float32 | uint16 | uint8, default float32), vmin/vmax (mm, quantization range)
+    Body: little-endian row-major array, north-up; metadata in the X-Grid-Info header (JSON)
+    """
+    try:
+        try:
+            year = int(request.args.get('year', '2020'))
+            month = int(request.args.get('month', '1'))
+            stride = int(request.args.get('stride', '1'))
+            vmin = float(request.args['vmin']) if 'vmin' in request.args else None
+            vmax = float(request.args['vmax']) if 'vmax' in request.args else None
+            bbox = [float(v) for v in request.args['bbox'].split(',')] if 'bbox' in request.args else None
+        except ValueError:
+            return jsonify({
+                'error': 'Invalid parameters',
+                'message': 'year, month and stride must be integers, vmin, vmax and bbox numbers'
+            }), 400
+        dtype = request.args.get('dtype', 'float32')
+        if stride < 1:
+            return jsonify({
+                'error': 'Invalid stride',
+                'message': 'stride must be a positive integer'
+            }), 400
+        if bbox is not None:
+            if len(bbox) != 4 or bbox[1] >= bbox[3]:
+                return jsonify({
+                    'error': 'Invalid bbox',
+                    'message': 'bbox must be minLon,minLat,maxLon,maxLat'
+                }), 400
+        if dtype not in ('float32', 'uint16', 'uint8'):
+            return jsonify({
+                'error': 'Invalid dtype',
+                'message': 'dtype must be float32, uint16 or uint8'
+            }), 400
+        
+        store = get_store()
+        if store is None or not store.has_month(year, month):
+            return jsonify({
+                'error': 'No data available',
+                'message': f'No consolidated SLA data for {year}-{month:02d}'
+            }), 404
+        max_stride = min(len(store.latitude), len(store.longitude))
+        if stride > max_stride:
+            return jsonify({
+                'error': 'Invalid stride',
+                'message': f'stride must be at most {max_stride}, the grid dimension'
+            }), 400
+        n_rows, n_cols = store.window_shape(bbox, stride)
+        if n_rows * n_cols > MAX_GRID_CELLS:
+            return jsonify({
+                'error': 'Grid too large',
+                'message': f'{n_rows}x{n_cols} cells requested, at most {MAX_GRID_CELLS}; increase stride'
+            }), 400
+        values, lats, lons = store.window_mm(year, month, bbox, stride)
+        
+        info = {
+            'shape': list(values.shape),
+            'dtype': dtype,
+            'unit': 'mm',
+            'lat': [float(lats[0]), float(lats[1] - lats[0]) if len(lats) > 1 else 0.0],
+            'lon': [float(lons[0]), store.dlon * stride],
+            'stride': stride,
+            'year': year,
+            'month': month
+        }
+        if dtype == 'float32':
+            data = values.astype('<f4')
+            info.update({'scale': 1.0, 'offset': 0.0, 'nodata': None})
+        else:
+            data, quantization = quantize_grid(values, dtype, vmin, vmax)
+            data = data.astype(np.dtype(dtype).newbyteorder('<'))
+            info.update(quantization)
+        
+        response = app.response_class(np.ascontiguousarray(data).tobytes(), mimetype='application/octet-stream')
+        response.headers['X-Grid-Info'] = json.dumps(info, separators=(',', ':'))
+        return response
+        
+    except Exception as e:
+        print(f"❌ Error in get_sla_grid: {e}")
+        return jsonify({
+            'error': 'Failed to get SLA grid',
+            'message': str(e)
+        }), 500
+
+@app.route('/api/flood-dem-tiles/<int:z>/<int:x>/<int:y>.png', methods=['GET'])
+def get_flood_dem_tiles(z, x, y):
+    """
+    Flood depth tiles for a sea-level-rise scenario (bathtub model over the DEM)
+    Query params: slr (meters above current sea level, default 0)
+    Built from the cached per-tile base layer, so changing slr only re-thresholds it
+    """
+    try:
+        scenario = float(request.args.get('slr', '0'))
+        if not math.isfinite(scenario):
+            raise ValueError(scenario)
+    except ValueError:
+        return jsonify({
+            'error': 'Invalid parameters',
+            'message': 'slr must be a finite number of meters'
+        }), 400
+    
+    depth = get_flood_engine().depth_tile(z, x, y, scenario)
+    if depth is None:
+        return send_file(BytesIO(encode_png(np.zeros((1, 1, 4), dtype='uint8'))), mimetype='image/png')
+    
+    png = encode_png(colorize(depth, 0.0, 3.0, FLOOD_STOPS))
+    return send_file(BytesIO(png), mimetype='image/png')
+
+@app.route('/api/flood-scenarios', methods=['GET'])
+def get_flood_scenarios():
+    """
+    Inundated area and exposed DEM cells over a region for many scenarios in one call
+    Query params: bbox=minLon,minLat,maxLon,maxLat (required),
+                  scenarios=comma separated meters (optional, default 0 to 5 by 0.1)
+    """
+    try:
+        try:
+            bbox = [float(v) for v in request.args.get('bbox', '').split(',') if v]
+            scenarios = [float(v) for v in request.args['scenarios'].split(',') if v] if 'scenarios' in request.args else None
+            if not all(math.isfinite(v) for v in bbox + (scenarios or [])):
+                raise ValueError(request.args)
+        except ValueError:
+            return jsonify({
+                'error': 'Invalid parameters',
+                'message': 'bbox and scenarios must be comma separated finite numbers'
+            }), 400
+        if len(bbox) != 4 or bbox[0] >= bbox[2] or bbox[1] >= bbox[3]:
+            return jsonify({
+                'error': 'Invalid bbox',
+                'message': 'bbox must be minLon,minLat,maxLon,maxLat'
+            }), 400
+        
+        if scenarios is None:
+            scenarios = [round(0.1 * i, 1) for i in range(51)]
+        if not scenarios or len(scenarios) > 1000:
+            return jsonify({
+                'error': 'Invalid scenarios',
+                'message': 'Between 1 and 1000 scenario values per request'
+            }), 400
+        
+        result = get_flood_engine().sweep(tuple(bbox), scenarios)
+        if result is None:
+            return jsonify({
+                'error': 'DEM not available',
+                'message': 'Flood scenarios need the local DEM COG'
+            }), 404
+        
+        return jsonify({
+            'bbox': bbox,
+            **result,
+            'unit': 'meters',
+            'method': 'bathtub'
+        })
+        
+    except Exception as e:
+        print(f"❌ Error in get_flood_scenarios: {e}")
+        return jsonify({
+            'error': 'Failed to compute flood scenarios',
+            'message': str(e)
+        }), 500
+
+@app.route('/api/anomaly-tiles/<int:z>/<int:x>/<int:y>.png', methods=['GET'])
+def get_anomaly_tiles(z, x, y):
+    """
+    Standardized SLA anomaly tiles: (SLA - monthly climatology) / monthly std
+    Query params: year, month
+    Rendered from the memory-mapped store; transparent without a store or climatology
+    """
+    try:
+        year = int(request.args.get('year', '2020'))
+        month = int(request.args.get('month', '1'))
+    except ValueError:
+        return jsonify({
+            'error': 'Invalid parameters',
+            'message': 'year and month must be integers'
+        }), 400
+    
+    store = get_store()
+    clim_mean = store.product('clim_mean') if store is not None else None
+    clim_std = store.product('clim_std') if store is not None else None
+    if clim_mean is None or clim_std is None or not store.has_month(year, month):
+        return send_file(BytesIO(encode_png(np.zeros((1, 1, 4), dtype='uint8'))), mimetype='image/png')
+    
+    lons, lats = tile_lonlat(z, x, y)
+    rows, cols = store.cells(lats, lons)
+    values = store.cube[store.month_index[f"{year}-{month:02d}"]][rows, cols] * 1000.0
+    with np.errstate(invalid='ignore', divide='ignore'):
+        standardized = (values - clim_mean[month - 1][rows, cols]) / clim_std[month - 1][rows, cols]
+    
+    png = encode_png(colorize(standardized, -3.0, 3.0, DIVERGING_STOPS))
+    return send_file(BytesIO(png), mimetype='image/png')
+
+@app.route('/api/return-level-tiles/<int:z>/<int:x>/<int:y>.png', methods=['GET'])
+def get_return_level_tiles(z, x, y):
+    """
+    SLA return level tiles from the extreme value fits (data_pipeline/extremes.py)
+    Query params: period (years, default 100), vmin/vmax (mm, default 0-500)
+    """
+    try:
+        period = int(request.args.get('period', '100'))
+        vmin = float(request.args.get('vmin', '0'))
+        vmax = float(request.args.get('vmax', '500'))
+    except ValueError:
+        return jsonify({
+            'error': 'Invalid parameters',
+            'message': 'period must be an integer number of years, vmin and vmax numbers'
+        }), 400
+    
+    store = get_store()
+    levels = store.product('return_levels') if store is not None else None
+    meta = store.metadata('extremes') if store is not None else None
+    if levels is None or meta is None:
+        return send_file(BytesIO(encode_png(np.zeros((1, 1, 4), dtype='uint8'))), mimetype='image/png')
+    if period not in meta['return_periods']:
+        return jsonify({
+            'error': 'Invalid return period',
+            'message': f"Available return periods: {meta['return_periods']}"
+        }), 400
+    
+    lons, lats = tile_lonlat(z, x, y)
+    rows, cols = store.cells(lats, lons)
+    values = levels[meta['return_periods'].index(period)][rows, cols]
+    
+    png = encode_png(colorize(values, vmin, vmax, SEQUENTIAL_STOPS))
+    return send_file(BytesIO(png), mimetype='image/png')
+
 @app.route('/api/dem-tiles/<int:z>/<int:x>/<int:y>.png', methods=['GET'])
 def get_dem_tiles(z, x, y):
     """
@@ -368,18 +870,36 @@ def get_dem_tiles(z, x, y):
 @app.route('/api/slr-tiles/<int:z>/<int:x>/<int:y>.png', methods=['GET'])
 def get_slr_tiles(z, x, y):
     """
-    SLR tile generation - Not available in NetCDF-only version
-    Returns transparent tile
+    Sea level anomaly tiles for one month
+    Query params: year, month, vmin/vmax (mm, default -300 to 300)
+    Rendered from the store, or from cached NetCDF chunks for months it does not hold
     """
-    # Return a transparent 1x1 PNG
-    import base64
-    from io import BytesIO
-    transparent_png = base64.b64decode(
-        'iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNkYPhfDwAChwGA60e6kgAAAABJRU5ErkJggg=='
-    )
-    return send_file(BytesIO(transparent_png), mimetype='image/png')
+    try:
+        year = int(request.args.get('year', '2020'))
+        month = int(request.args.get('month', '1'))
+        vmin = float(request.args.get('vmin', '-300'))
+        vmax = float(request.args.get('vmax', '300'))
+    except ValueError:
+        return jsonify({
+            'error': 'Invalid parameters',
+            'message': 'year and month must be integers, vmin and vmax numbers'
+        }), 400
+    
+    lons, lats = tile_lonlat(z, x, y)
+    store = get_store()
+    if store is not None and store.has_month(year, month):
+        rows, cols = store.cells(lats, lons)
+        values = store.cube[store.month_index[f"{year}-{month:02d}"]][rows, cols]
+    elif get_netcdf_filepath(year, month).exists():
+        values = read_sla_points(get_netcdf_filepath(year, month), lats.ravel(), lons.ravel()).reshape(lats.shape)
+    else:
+        return send_file(BytesIO(encode_png(np.zeros((1, 1, 4), dtype='uint8'))), mimetype='image/png')
+    
+    png = encode_png(colorize(values * 1000.0, vmin, vmax, DIVERGING_STOPS))
+    return send_file(BytesIO(png), mimetype='image/png')
 
 if __name__ == '__main__':
+    report_data_directory()
     port = int(os.environ.get('PORT', 5000))
     app.run(host='0.0.0.0', port=port, debug=True)
 
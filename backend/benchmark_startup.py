@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Cold-start benchmark for the backend
+Starts fresh interpreters that import app.py and serve a first point query
+through the Flask test client, and checks the median against a budget. Also
+fails if heavy libraries end up on the serving path while the store is present.
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).parent
+
+# Import plus first request, milliseconds
+DEFAULT_BUDGET_MS = 1000.0
+
+# Only needed by ingest/admin paths or the NetCDF fallback
+HEAVY_MODULES = ['xarray', 'pandas', 'netCDF4', 'rasterio', 'scipy', 'matplotlib']
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import app
+imported = time.perf_counter()
+client = app.app.test_client()
+response = client.get('/api/sea-level?lat=10&lon=-40&year={year}&month=1')
+done = time.perf_counter()
+print(json.dumps({{
+    'importMs': (imported - start) * 1000,
+    'firstRequestMs': (done - imported) * 1000,
+    'status': response.status_code,
+    'store': app.get_store() is not None,
+    'heavy': [m for m in {heavy!r} if m in sys.modules]
+}}))
+"""
+
+def run_once(year: int) -> dict:
+    """Time one cold start in a fresh interpreter"""
+    output = subprocess.run(
+        [sys.executable, '-c', PROBE.format(year=year, heavy=HEAVY_MODULES)],
+        cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def main():
+    """Run the benchmark"""
+    parser = argparse.ArgumentParser(description="Measure backend cold start against a budget.")
+    parser.add_argument('--runs', type=int, default=5, help='Fresh interpreters to start')
+    parser.add_argument('--budget-ms', type=float, default=DEFAULT_BUDGET_MS, help='Budget for import plus first request')
+    parser.add_argument('--year', type=int, default=2020, help='Year of the probe query')
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("   Backend Cold Start Benchmark")
+    print("=" * 60)
+
+    results = [run_once(args.year) for _ in range(args.runs)]
+    import_ms = statistics.median(r['importMs'] for r in results)
+    request_ms = statistics.median(r['firstRequestMs'] for r in results)
+    total_ms = statistics.median(r['importMs'] + r['firstRequestMs'] for r in results)
+    heavy = sorted({m for r in results for m in r['heavy']})
+
+    print(f"   Import:        {import_ms:8.1f} ms (median of {args.runs})")
+    print(f"   First request: {request_ms:8.1f} ms (status {results[-1]['status']})")
+    print(f"   Total:         {total_ms:8.1f} ms (budget {args.budget_ms:.0f} ms)")
+    print(f"   Store present: {results[-1]['store']}")
+    print(f"   Heavy modules: {', '.join(heavy) or 'none'}")
+    print()
+
+    failed = False
+    if total_ms > args.budget_ms:
+        print(f"❌ Cold start over budget by {total_ms - args.budget_ms:.0f} ms")
+        failed = True
+    if results[-1]['store'] and heavy:
+        print(f"❌ Serving from the store loaded {', '.join(heavy)}")
+        failed = True
+    if not failed:
+        print("✅ Cold start within budget")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,221 @@
+"""
+Elevation lookups from the local DEM Cloud Optimized GeoTIFF
+Points are sampled from individual COG blocks (full resolution or an overview),
+which are decoded once and kept in a small LRU cache.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+import numpy as np
+
+from sla_store import file_version
+
+BACKEND_DIR = Path(__file__).parent
+
+# COG written by data_pipeline/dem_processing.py
+DEM_COG_PATH = Path(os.environ.get(
+    'DEM_COG_PATH',
+    BACKEND_DIR.parent / "data_pipeline" / "output" / "dem" / "coastal_dem.tif"
+))
+
+# Number of decoded blocks kept in memory (512x512 float32 blocks are 1 MB each)
+DEM_BLOCK_CACHE_SIZE = int(os.environ.get('DEM_BLOCK_CACHE_SIZE', 256))
+
+# Interpolation methods accepted by DemReader.sample
+SAMPLE_METHODS = ('bilinear', 'nearest')
+
+
+class ReaderClosedError(RuntimeError):
+    """The reader was closed because the COG was replaced"""
+
+
+class DemReader:
+    """
+    Windowed point reader for a tiled DEM GeoTIFF
+    Only the blocks under the requested points are read, never whole strips.
+    """
+
+    def __init__(self, path: Path, cache_size: int = DEM_BLOCK_CACHE_SIZE):
+        import rasterio
+
+        self.path = Path(path)
+        self.version = file_version(self.path)
+        self._lock = threading.Lock()
+        self._blocks = OrderedDict()
+        self._cache_size = cache_size
+        self.closed = False
+
+        # Level None is full resolution, 0..n-1 are the internal overviews
+        self._datasets = {None: rasterio.open(self.path)}
+        self.crs = self._datasets[None].crs
+        self.nodata = self._datasets[None].nodata
+        self.resolution = abs(self._datasets[None].transform.a)
+        self.overview_factors = self._datasets[None].overviews(1)
+
+    def _dataset(self, level):
+        import rasterio
+
+        if level not in self._datasets:
+            self._datasets[level] = rasterio.open(self.path, overview_level=level)
+        return self._datasets[level]
+
+    def close(self):
+        """Close every open dataset, after any sample in progress"""
+        with self._lock:
+            for ds in self._datasets.values():
+                ds.close()
+            self._datasets.clear()
+            self._blocks.clear()
+            self.closed = True
+
+    def level_for_scale(self, scale: float | None):
+        """Coarsest overview whose pixel size does not exceed `scale` (CRS units)"""
+        level = None
+        if scale:
+            for index, factor in enumerate(self.overview_factors):
+                if self.resolution * factor <= scale:
+                    level = index
+        return level
+
+    def _block(self, level, block_row: int, block_col: int) -> np.ndarray:
+        """Decoded block as float32 with NaN for nodata (cached)"""
+        from rasterio.windows import Window
+
+        key = (level, block_row, block_col)
+        block = self._blocks.get(key)
+        if block is not None:
+            self._blocks.move_to_end(key)
+            return block
+
+        ds = self._dataset(level)
+        block_h, block_w = ds.block_shapes[0]
+        window = Window(
+            block_col * block_w, block_row * block_h,
+            min(block_w, ds.width - block_col * block_w),
+            min(block_h, ds.height - block_row * block_h)
+        )
+        block = ds.read(1, window=window).astype('float32')
+        if self.nodata is not None:
+            block[block == self.nodata] = np.nan
+
+        self._blocks[key] = block
+        if len(self._blocks) > self._cache_size:
+            self._blocks.popitem(last=False)
+        return block
+
+    def _pixels(self, level, rows: np.ndarray, cols: np.ndarray) -> np.ndarray:
+        """Gather pixel values, grouping the lookups by block"""
+        ds = self._dataset(level)
+        block_h, block_w = ds.block_shapes[0]
+        values = np.full(rows.shape, np.nan, dtype='float32')
+        inside = (rows >= 0) & (rows < ds.height) & (cols >= 0) & (cols < ds.width)
+        block_ids = np.where(inside, (rows // block_h) * 1_000_000 + cols // block_w, -1)
+        for block_id in np.unique(block_ids[inside]):
+            block_row, block_col = divmod(int(block_id), 1_000_000)
+            block = self._block(level, block_row, block_col)
+            mask = block_ids == block_id
+            values[mask] = block[rows[mask] - block_row * block_h, cols[mask] - block_col * block_w]
+        return values
+
+    def sample(self, lats, lons, method: str = 'bilinear', scale: float | None = None) -> np.ndarray:
+        """
+        Sample elevations (meters) at many lat/lon points in one pass
+        Returns float32 array with NaN where the DEM has no data
+        """
+        from rasterio.warp import transform
+
+        if method not in SAMPLE_METHODS:
+            raise ValueError(f"method must be one of {', '.join(SAMPLE_METHODS)}")
+        lats = np.atleast_1d(np.asarray(lats, dtype='float64'))
+        lons = np.atleast_1d(np.asarray(lons, dtype='float64'))
+        if lats.size == 0:
+            return np.empty(0, dtype='float32')
+
+        xs, ys = transform('EPSG:4326', self.crs, lons.tolist(), lats.tolist())
+
+        with self._lock:
+            if self.closed:
+                raise ReaderClosedError(self.path)
+            level = self.level_for_scale(scale)
+            ds = self._dataset(level)
+            cols_f, rows_f = ~ds.transform * (np.asarray(xs), np.asarray(ys))
+
+            if method == 'nearest':
+                return self._pixels(level, np.floor(rows_f).astype('int64'), np.floor(cols_f).astype('int64'))
+
+            # Bilinear between the four surrounding pixel centres
+            rows_c = rows_f - 0.5
+            cols_c = cols_f - 0.5
+            row0 = np.floor(rows_c).astype('int64')
+            col0 = np.floor(cols_c).astype('int64')
+            dr = rows_c - row0
+            dc = cols_c - col0
+            row0 = np.clip(row0, 0, ds.height - 1)
+            col0 = np.clip(col0, 0, ds.width - 1)
+            row1 = np.minimum(row0 + 1, ds.height - 1)
+            col1 = np.minimum(col0 + 1, ds.width - 1)
+
+            corners = [
+                (self._pixels(level, row0, col0), (1 - dr) * (1 - dc)),
+                (self._pixels(level, row0, col1), (1 - dr) * dc),
+                (self._pixels(level, row1, col0), dr * (1 - dc)),
+                (self._pixels(level, row1, col1), dr * dc),
+            ]
+
+        total = np.zeros(lats.shape, dtype='float64')
+        weight = np.zeros(lats.shape, dtype='float64')
+        for values, w in corners:
+            valid = ~np.isnan(values)
+            total += np.where(valid, values * w, 0.0)
+            weight += np.where(valid, w, 0.0)
+        result = np.where(weight > 0, total / np.maximum(weight, 1e-12), np.nan)
+
+        # Points outside the raster have no elevation
+        outside = (rows_f < 0) | (rows_f >= ds.height) | (cols_f < 0) | (cols_f >= ds.width)
+        result[outside] = np.nan
+        return result.astype('float32')
+
+
+_reader = None
+_reader_lock = threading.Lock()
+
+
+def get_dem_reader() -> DemReader | None:
+    """Shared reader for DEM_COG_PATH, reopened (and the old one closed) when the file is replaced"""
+    global _reader
+    if not DEM_COG_PATH.exists():
+        return None
+    with _reader_lock:
+        if _reader is None or _reader.version != file_version(DEM_COG_PATH):
+            try:
+                reader = DemReader(DEM_COG_PATH)
+            except ImportError:
+                print("⚠️ rasterio is not installed; DEM lookups disabled")
+                return None
+            if _reader is not None:
+                _reader.close()
+            _reader = reader
+        return _reader
+
+
+def dem_version() -> str:
+    """Version of the DEM COG for ETags of responses that include elevations"""
+    return file_version(DEM_COG_PATH)
+
+
+def elevation_values(lats, lons, method: str = 'bilinear', scale: float | None = None) -> list:
+    """Elevations in meters (rounded, None for nodata) or all None without a DEM"""
+    while True:
+        reader = get_dem_reader()
+        if reader is None:
+            return [None] * len(np.atleast_1d(lats))
+        try:
+            values = reader.sample(lats, lons, method=method, scale=scale)
+            break
+        except ReaderClosedError:
+            # The COG was replaced between getting the reader and sampling
+            continue
+    return [None if np.isnan(v) else round(float(v), 2) for v in values]
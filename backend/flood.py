@@ -0,0 +1,206 @@
+"""
+Bathtub flood engine for sea-level-rise scenarios
+A tile's base layer is its freeboard: DEM elevation minus the current sea level
+(mean SLA of the last 12 ingested months, carried onto land from the nearest
+ocean cell). It does not depend on the scenario, so it is built once per tile
+and cached; any scenario is then a single threshold, freeboard < scenario.
+Pixels with no DEM data or at/below 0 m are treated as open water.
+"""
+
+import os
+import threading
+import warnings
+from collections import OrderedDict
+
+import numpy as np
+
+from elevation import ReaderClosedError, get_dem_reader
+from ocean_snap import MAX_SNAP_KM, get_ocean_index, haversine_km
+from sla_store import get_store
+from tiles import TILE_SIZE, EARTH_RADIUS_M, tile_lonlat, tile_range, pixel_size_m
+
+# Number of cached base tiles (256x256 float32 tiles are 256 KB each)
+FLOOD_BASE_CACHE_SIZE = int(os.environ.get('FLOOD_BASE_CACHE_SIZE', 512))
+
+# Upper bound on the tiles read for one scenario sweep; larger regions are
+# swept at a coarser zoom
+MAX_SWEEP_TILES = int(os.environ.get('MAX_SWEEP_TILES', 64))
+
+# Months averaged into the current sea level
+REFERENCE_MONTHS = 12
+
+
+class FloodEngine:
+    """Cache of per-tile freeboard layers, invalidated when the DEM or SLA data change"""
+
+    def __init__(self, cache_size: int = FLOOD_BASE_CACHE_SIZE):
+        self._lock = threading.RLock()
+        self._tiles = OrderedDict()
+        self._cache_size = cache_size
+        self._version = None
+        self._reference = None
+        self._reference_version = -1
+        self.reference_months = []
+
+    def _check_version(self, reader, store):
+        """Drop cached layers when the DEM file or the SLA store changed"""
+        version = (reader.version, store.data_version if store is not None else None)
+        if version != self._version:
+            self._tiles.clear()
+            self._version = version
+
+    def reference_sla(self, store) -> np.ndarray | None:
+        """Current sea level grid for the store's data version (built once per version)"""
+        version = store.data_version if store is not None else None
+        with self._lock:
+            if version != self._reference_version:
+                self._reference = self._build_reference(store)
+                self._reference_version = version
+            return self._reference
+
+    def _build_reference(self, store) -> np.ndarray | None:
+        """Current sea level (m) on the SLA grid, land cells filled from the nearest ocean cell"""
+        if store is None or not store.months:
+            self.reference_months = []
+            return None
+        self.reference_months = store.months[-REFERENCE_MONTHS:]
+        frames = store.cube[len(store.months) - len(self.reference_months):]
+        with warnings.catch_warnings():
+            # Land cells are NaN in every month
+            warnings.simplefilter('ignore', RuntimeWarning)
+            reference = np.nanmean(frames, axis=0)
+
+        index = get_ocean_index()
+        if index is not None:
+            filled = reference[index.nearest_row, index.nearest_col]
+            distance = haversine_km(
+                index.latitude[:, None], index.longitude[None, :],
+                index.latitude[index.nearest_row], index.longitude[index.nearest_col]
+            )
+            reference = np.where(distance <= MAX_SNAP_KM, filled, np.nan)
+        # No nearby ocean cell: fall back to the DEM's own datum
+        return np.nan_to_num(reference, nan=0.0).astype('float32')
+
+    def _dem_scale(self, reader, z: int) -> float:
+        """Tile pixel size in the DEM's CRS units, to pick the matching overview"""
+        size_m = 2 * np.pi * EARTH_RADIUS_M / (TILE_SIZE * 2 ** z)
+        if reader.crs is not None and reader.crs.is_geographic:
+            return size_m / 111320.0
+        return size_m
+
+    def base_tile(self, z: int, x: int, y: int) -> np.ndarray | None:
+        """
+        Freeboard (m) of every land pixel of a tile, NaN over water and nodata
+        None without a DEM
+        """
+        key = (z, x, y)
+        lons, lats = tile_lonlat(z, x, y)
+        while True:
+            reader = get_dem_reader()
+            if reader is None:
+                return None
+            store = get_store()
+
+            with self._lock:
+                self._check_version(reader, store)
+                base = self._tiles.get(key)
+                if base is not None:
+                    self._tiles.move_to_end(key)
+                    return base
+                reference = self.reference_sla(store)
+
+            try:
+                elevation = reader.sample(
+                    lats.ravel(), lons.ravel(), method='nearest', scale=self._dem_scale(reader, z)
+                ).reshape(lats.shape)
+                break
+            except ReaderClosedError:
+                # The COG was replaced between getting the reader and sampling
+                continue
+        sea_level = 0.0
+        if reference is not None:
+            rows, cols = store.cells(lats, lons)
+            sea_level = reference[rows, cols]
+        base = np.where(elevation > 0, elevation - sea_level, np.nan).astype('float32')
+
+        with self._lock:
+            self._tiles[key] = base
+            if len(self._tiles) > self._cache_size:
+                self._tiles.popitem(last=False)
+        return base
+
+    def depth_tile(self, z: int, x: int, y: int, scenario: float) -> np.ndarray | None:
+        """Flood depth (m) for a scenario, NaN where dry"""
+        base = self.base_tile(z, x, y)
+        if base is None:
+            return None
+        with np.errstate(invalid='ignore'):
+            return np.where(base < scenario, scenario - base, np.nan)
+
+    def sweep_zoom(self, bounds: tuple) -> int:
+        """Finest zoom not beyond the DEM resolution that covers bounds in MAX_SWEEP_TILES tiles"""
+        reader = get_dem_reader()
+        resolution_m = reader.resolution * (111320.0 if reader.crs.is_geographic else 1.0)
+        z = int(np.clip(np.floor(np.log2(2 * np.pi * EARTH_RADIUS_M / (TILE_SIZE * resolution_m))), 0, 20))
+        while z > 0:
+            (x0, x1), (y0, y1) = tile_range(bounds, z)
+            if (x1 - x0 + 1) * (y1 - y0 + 1) <= MAX_SWEEP_TILES:
+                break
+            z -= 1
+        return z
+
+    def sweep(self, bounds: tuple, scenarios) -> dict | None:
+        """
+        Inundated land area and exposed pixel counts for many scenarios at once
+        The region's freeboards are sorted once; each scenario is a binary search.
+        """
+        if get_dem_reader() is None:
+            return None
+        min_lon, min_lat, max_lon, max_lat = bounds
+        z = self.sweep_zoom(bounds)
+        (x0, x1), (y0, y1) = tile_range(bounds, z)
+
+        freeboards = []
+        areas = []
+        for x in range(x0, x1 + 1):
+            for y in range(y0, y1 + 1):
+                base = self.base_tile(z, x, y)
+                lons, lats = tile_lonlat(z, x, y)
+                inside = (
+                    (lons >= min_lon) & (lons <= max_lon) & (lats >= min_lat) & (lats <= max_lat)
+                    & ~np.isnan(base)
+                )
+                freeboards.append(base[inside])
+                areas.append(pixel_size_m(z, lats[inside]) ** 2)
+
+        freeboard = np.concatenate(freeboards)
+        order = np.argsort(freeboard)
+        freeboard = freeboard[order]
+        cumulative_area = np.concatenate([[0.0], np.cumsum(np.concatenate(areas)[order])])
+
+        scenarios = np.asarray(scenarios, dtype='float64')
+        counts = np.searchsorted(freeboard, scenarios, side='left')
+        land_area = cumulative_area[-1]
+        return {
+            'zoom': z,
+            'pixelSizeM': round(float(pixel_size_m(z, np.array((min_lat + max_lat) / 2))), 1),
+            'landCells': int(freeboard.size),
+            'landAreaKm2': round(land_area / 1e6, 3),
+            'referenceMonths': [self.reference_months[0], self.reference_months[-1]] if self.reference_months else None,
+            'scenarios': [
+                {
+                    'scenario': round(float(scenario), 3),
+                    'inundatedAreaKm2': round(float(cumulative_area[count]) / 1e6, 3),
+                    'exposedCells': int(count),
+                    'fraction': round(float(cumulative_area[count] / land_area), 4) if land_area > 0 else 0.0
+                }
+                for scenario, count in zip(scenarios, counts)
+            ]
+        }
+
+
+_engine = FloodEngine()
+
+
+def get_flood_engine() -> FloodEngine:
+    return _engine
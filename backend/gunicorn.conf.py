@@ -0,0 +1,24 @@
+"""
+Gunicorn settings for production
+The app and its read-only SLA data are loaded once in the master and shared by
+all forked workers (see shared_data.py), so workers can scale to the core count
+without multiplying memory. Run with: gunicorn -c gunicorn.conf.py app:app
+"""
+
+import gc
+import multiprocessing
+import os
+
+bind = os.environ.get('BIND', f"0.0.0.0:{os.environ.get('PORT', 5000)}")
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count()))
+preload_app = True
+
+
+def when_ready(server):
+    """Runs in the master after the app is loaded and before workers are forked"""
+    from shared_data import preload_shared_data
+
+    preload_shared_data()
+    # Keep the garbage collector from touching (and so copying) objects
+    # created before the fork
+    gc.freeze()
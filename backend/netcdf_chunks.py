@@ -0,0 +1,182 @@
+"""
+Chunk-aligned reads from the monthly SLA NetCDF files
+HDF5 decompresses a whole chunk to return a single value, so reads here always
+fetch whole chunks and keep them, decoded to float32 meters, in a size-bounded
+LRU keyed by (file, chunk index). Neighbouring points and tile pixels in the
+same chunk are then served from memory, and per-request counters report how
+much was actually decompressed.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+import numpy as np
+
+# Memory for decoded chunks
+NETCDF_CHUNK_CACHE_MB = float(os.environ.get('NETCDF_CHUNK_CACHE_MB', 256))
+
+# Open file handles kept between requests
+NETCDF_OPEN_FILES = int(os.environ.get('NETCDF_OPEN_FILES', 64))
+
+# Read unit for variables stored contiguously (no HDF5 chunks)
+CONTIGUOUS_BLOCK = (1, 64, 64)
+
+
+class SlaFile:
+    """An open NetCDF file with its grid and the chunk layout of 'sla'"""
+
+    def __init__(self, path: Path):
+        import netCDF4
+
+        self.path = Path(path)
+        self.mtime = self.path.stat().st_mtime
+        self.dataset = netCDF4.Dataset(self.path)
+        self.variable = self.dataset['sla']
+        self.variable.set_auto_maskandscale(True)
+
+        latitude = self.dataset['latitude'][:]
+        longitude = self.dataset['longitude'][:]
+        self.n_lat, self.n_lon = len(latitude), len(longitude)
+        self.lat0 = float(latitude[0])
+        self.dlat = float(latitude[1] - latitude[0])
+        self.lon0 = float(longitude[0])
+        self.dlon = float(longitude[1] - longitude[0])
+
+        # Chunks are addressed by (row, col) within the first time step
+        chunking = self.variable.chunking()
+        self.chunk_shape = tuple(CONTIGUOUS_BLOCK if chunking == 'contiguous' else chunking)[-2:]
+        self.has_time = self.variable.ndim == 3
+
+    def cells(self, lats: np.ndarray, lons: np.ndarray) -> tuple:
+        """Nearest grid rows/cols (longitude may be -180/180 or 0/360)"""
+        rows = np.clip(np.rint((lats - self.lat0) / self.dlat), 0, self.n_lat - 1).astype('int64')
+        cols = np.rint((np.mod(lons, 360.0) - self.lon0) / self.dlon).astype('int64') % self.n_lon
+        return rows, cols
+
+    def read_chunk(self, chunk_row: int, chunk_col: int) -> np.ndarray:
+        """Decode one chunk of the first time step to float32 meters, NaN where masked"""
+        ch, cw = self.chunk_shape
+        rows = slice(chunk_row * ch, min((chunk_row + 1) * ch, self.n_lat))
+        cols = slice(chunk_col * cw, min((chunk_col + 1) * cw, self.n_lon))
+        data = self.variable[0, rows, cols] if self.has_time else self.variable[rows, cols]
+        return np.ma.filled(np.ma.asarray(data, dtype='float32'), np.nan)
+
+    def close(self):
+        self.dataset.close()
+
+
+class ChunkCache:
+    """LRU of decoded chunks bounded by total bytes, plus open file handles"""
+
+    def __init__(self, max_bytes: int, max_files: int = NETCDF_OPEN_FILES):
+        self.max_bytes = max_bytes
+        self.max_files = max_files
+        self._chunks = OrderedDict()
+        self._files = OrderedDict()
+        self._bytes = 0
+        # netCDF4/HDF5 calls are not thread-safe
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.bytes_decompressed = 0
+
+    def _file(self, path: Path) -> SlaFile:
+        key = str(path)
+        sla_file = self._files.get(key)
+        if sla_file is not None and sla_file.mtime != path.stat().st_mtime:
+            sla_file.close()
+            del self._files[key]
+            sla_file = None
+        if sla_file is None:
+            sla_file = SlaFile(path)
+            self._files[key] = sla_file
+            if len(self._files) > self.max_files:
+                _, oldest = self._files.popitem(last=False)
+                oldest.close()
+        else:
+            self._files.move_to_end(key)
+        return sla_file
+
+    def _chunk(self, sla_file: SlaFile, chunk_row: int, chunk_col: int) -> np.ndarray:
+        key = (str(sla_file.path), sla_file.mtime, chunk_row, chunk_col)
+        chunk = self._chunks.get(key)
+        if chunk is not None:
+            self._chunks.move_to_end(key)
+            self.hits += 1
+            _request_stats()['chunkHits'] += 1
+            return chunk
+
+        chunk = sla_file.read_chunk(chunk_row, chunk_col)
+        self.misses += 1
+        self.bytes_decompressed += chunk.nbytes
+        stats = _request_stats()
+        stats['chunksDecompressed'] += 1
+        stats['bytesDecompressed'] += chunk.nbytes
+
+        self._chunks[key] = chunk
+        self._bytes += chunk.nbytes
+        while self._bytes > self.max_bytes and len(self._chunks) > 1:
+            _, evicted = self._chunks.popitem(last=False)
+            self._bytes -= evicted.nbytes
+        return chunk
+
+    def read_points(self, path: Path, lats, lons) -> np.ndarray:
+        """SLA in meters at many points of one file, each chunk decoded at most once"""
+        lats = np.atleast_1d(np.asarray(lats, dtype='float64'))
+        lons = np.atleast_1d(np.asarray(lons, dtype='float64'))
+        values = np.full(lats.shape, np.nan, dtype='float32')
+        with self._lock:
+            sla_file = self._file(Path(path))
+            rows, cols = sla_file.cells(lats, lons)
+            ch, cw = sla_file.chunk_shape
+            chunk_ids = (rows // ch) * 1_000_000 + cols // cw
+            for chunk_id in np.unique(chunk_ids):
+                chunk_row, chunk_col = divmod(int(chunk_id), 1_000_000)
+                chunk = self._chunk(sla_file, chunk_row, chunk_col)
+                mask = chunk_ids == chunk_id
+                values[mask] = chunk[rows[mask] - chunk_row * ch, cols[mask] - chunk_col * cw]
+        return values
+
+    def info(self) -> dict:
+        return {
+            'chunks': len(self._chunks),
+            'bytes': self._bytes,
+            'maxBytes': self.max_bytes,
+            'openFiles': len(self._files),
+            'hits': self.hits,
+            'misses': self.misses,
+            'bytesDecompressed': self.bytes_decompressed
+        }
+
+
+_cache = ChunkCache(int(NETCDF_CHUNK_CACHE_MB * 1024 * 1024))
+_local = threading.local()
+
+
+def _request_stats() -> dict:
+    stats = getattr(_local, 'stats', None)
+    if stats is None:
+        stats = reset_read_stats()
+    return stats
+
+
+def reset_read_stats() -> dict:
+    """Start counting decompression for the current request (thread)"""
+    _local.stats = {'chunksDecompressed': 0, 'bytesDecompressed': 0, 'chunkHits': 0}
+    return _local.stats
+
+
+def read_stats() -> dict:
+    """Chunks and bytes decompressed, and cache hits, since the last reset on this thread"""
+    return dict(_request_stats())
+
+
+def get_chunk_cache() -> ChunkCache:
+    return _cache
+
+
+def read_sla_points(path: Path, lats, lons) -> np.ndarray:
+    """SLA in meters at points of one monthly file (NaN over land)"""
+    return _cache.read_points(path, lats, lons)
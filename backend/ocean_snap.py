@@ -0,0 +1,117 @@
+"""
+Nearest-ocean-cell snapping for SLA point queries
+Uses the index precomputed by data_pipeline/ocean_index.py so a coastal point on
+a land (NaN) cell resolves to the nearest valid ocean cell with one array lookup.
+"""
+
+import os
+import threading
+from pathlib import Path
+
+import numpy as np
+
+from sla_store import file_version
+
+BACKEND_DIR = Path(__file__).parent
+
+OCEAN_INDEX_PATH = Path(os.environ.get(
+    'OCEAN_INDEX_PATH',
+    BACKEND_DIR.parent / "data_pipeline" / "jiayou_sat_data" / "nearest_ocean.npz"
+))
+
+# Points further than this from any ocean cell are treated as inland. Same
+# setting and distance as data_pipeline/ocean_index.py, which the exports use;
+# the backend does not import the pipeline, so it keeps its own copy.
+MAX_SNAP_KM = float(os.environ.get('MAX_SNAP_KM', 100.0))
+
+EARTH_RADIUS_KM = 6371.0
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """Great-circle distance in kilometers"""
+    lat1, lon1, lat2, lon2 = map(np.radians, (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+class NearestOceanIndex:
+    """Regular-grid lookup of the nearest ocean cell for any coordinate"""
+
+    def __init__(self, path: Path):
+        self.version = file_version(path)
+        with np.load(path) as data:
+            self.latitude = data['latitude']
+            self.longitude = data['longitude']
+            self.nearest_row = data['nearest_row']
+            self.nearest_col = data['nearest_col']
+        self.lat0 = float(self.latitude[0])
+        self.dlat = float(self.latitude[1] - self.latitude[0])
+        self.lon0 = float(self.longitude[0])
+        self.dlon = float(self.longitude[1] - self.longitude[0])
+
+    def cell(self, lat: float, lon: float) -> tuple:
+        """Grid row/col containing a point (longitude may be -180/180 or 0/360)"""
+        lon_360 = lon % 360.0
+        row = int(np.clip(np.rint((lat - self.lat0) / self.dlat), 0, len(self.latitude) - 1))
+        col = int(np.rint((lon_360 - self.lon0) / self.dlon)) % len(self.longitude)
+        return row, col
+
+    def snap(self, lat: float, lon: float) -> dict:
+        """Nearest ocean cell for a point, with the snap distance in km"""
+        row, col = self.cell(lat, lon)
+        ocean_row = int(self.nearest_row[row, col])
+        ocean_col = int(self.nearest_col[row, col])
+        cell_lat = float(self.latitude[ocean_row])
+        cell_lon = float(self.longitude[ocean_col])
+        return {
+            'row': ocean_row,
+            'col': ocean_col,
+            'lat': cell_lat,
+            'lon': cell_lon,
+            'snapped': (ocean_row, ocean_col) != (row, col),
+            'distanceKm': float(haversine_km(lat, lon % 360.0, cell_lat, cell_lon))
+        }
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_ocean_index() -> NearestOceanIndex | None:
+    """Shared index, loaded on first use and reloaded when the file is replaced (None if it has not been built)"""
+    global _index
+    version = file_version(OCEAN_INDEX_PATH)
+    if version == "none":
+        return None
+    if _index is None or _index.version != version:
+        with _index_lock:
+            if _index is None or _index.version != version:
+                _index = NearestOceanIndex(OCEAN_INDEX_PATH)
+    return _index
+
+
+def ocean_index_version() -> str:
+    """Version of the loaded ocean index for ETags of responses that snap points"""
+    index = get_ocean_index()
+    return index.version if index is not None else "none"
+
+
+def snap_to_ocean(lat: float, lon: float):
+    """
+    Coordinates to read SLA at, plus snap info for the response
+    Returns (lat, lon, None) unchanged when no index is available or the
+    nearest ocean cell is further than MAX_SNAP_KM.
+    """
+    index = get_ocean_index()
+    if index is None:
+        return lat, lon, None
+    snap = index.snap(lat, lon)
+    if snap['distanceKm'] > MAX_SNAP_KM:
+        return lat, lon, None
+    cell_lon = snap['lon'] if snap['lon'] <= 180 else snap['lon'] - 360
+    return snap['lat'], cell_lon, {
+        'lat': snap['lat'],
+        'lon': cell_lon,
+        'snapped': snap['snapped'],
+        'distanceKm': round(snap['distanceKm'], 2)
+    }
@@ -0,0 +1,162 @@
+"""
+Opt-in request profiling and slow-request capture
+With PROFILING=1, selected requests run under a sampling profiler that reads the
+request thread's stack every few milliseconds from a background thread, and
+their folded stacks (flamegraph.pl / speedscope format) are written to
+PROFILE_DIR. Every request slower than PROFILE_SLOW_MS is logged with its
+parameters. When PROFILING is unset no hooks are registered at all.
+"""
+
+import json
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from pathlib import Path
+
+from flask import g, request
+
+BACKEND_DIR = Path(__file__).parent
+
+PROFILING = os.environ.get('PROFILING', '') not in ('', '0', 'false')
+
+PROFILE_DIR = Path(os.environ.get('PROFILE_DIR', BACKEND_DIR / "profiles"))
+
+# Fraction of requests profiled; requests can also ask with the header or flag below
+PROFILE_SAMPLE_RATE = float(os.environ.get('PROFILE_SAMPLE_RATE', 0.0))
+PROFILE_HEADER = 'X-Profile'
+PROFILE_FLAG = '_profile'
+
+# Requests slower than this are logged, and their profile kept if they were sampled
+PROFILE_SLOW_MS = float(os.environ.get('PROFILE_SLOW_MS', 1000.0))
+
+# Stack sampling interval
+PROFILE_INTERVAL_MS = float(os.environ.get('PROFILE_INTERVAL_MS', 5.0))
+
+
+class StackSampler:
+    """
+    Background thread sampling the stacks of the threads being profiled
+    Sleeps on an event while nothing is profiled.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._targets = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+
+    def start(self, thread_id: int) -> Counter:
+        counts = Counter()
+        with self._lock:
+            self._targets[thread_id] = counts
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='stack-sampler', daemon=True)
+                self._thread.start()
+        self._wakeup.set()
+        return counts
+
+    def stop(self, thread_id: int) -> Counter:
+        with self._lock:
+            counts = self._targets.pop(thread_id, Counter())
+            if not self._targets:
+                self._wakeup.clear()
+        return counts
+
+    def _run(self):
+        me = threading.get_ident()
+        while True:
+            self._wakeup.wait()
+            time.sleep(self.interval)
+            with self._lock:
+                targets = list(self._targets.items())
+            frames = sys._current_frames()
+            for thread_id, counts in targets:
+                frame = frames.get(thread_id)
+                if frame is not None and thread_id != me:
+                    counts[folded_stack(frame)] += 1
+
+
+def folded_stack(frame) -> str:
+    """Root-to-leaf 'function (file:line);...' stack, one line of a folded profile"""
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+        frame = frame.f_back
+    return ';'.join(reversed(names))
+
+
+_sampler = StackSampler(PROFILE_INTERVAL_MS / 1000.0)
+_log_lock = threading.Lock()
+
+
+def _start_request():
+    g.profile_start = time.perf_counter()
+    g.profile_explicit = bool(request.headers.get(PROFILE_HEADER) or request.args.get(PROFILE_FLAG))
+    sampled = PROFILE_SAMPLE_RATE > 0 and random.random() < PROFILE_SAMPLE_RATE
+    g.profile_counts = _sampler.start(threading.get_ident()) if g.profile_explicit or sampled else None
+
+
+def _finish_request(response):
+    start = g.pop('profile_start', None)
+    if start is None:
+        return response
+    duration_ms = (time.perf_counter() - start) * 1000.0
+    counts = g.pop('profile_counts', None)
+    if counts is not None:
+        counts = _sampler.stop(threading.get_ident())
+
+    slow = duration_ms >= PROFILE_SLOW_MS
+    if not slow and not g.profile_explicit:
+        return response
+
+    record = {
+        'time': datetime.now(timezone.utc).isoformat(),
+        'method': request.method,
+        'path': request.path,
+        'endpoint': request.endpoint,
+        'args': request.args.to_dict(flat=False),
+        'status': response.status_code,
+        'durationMs': round(duration_ms, 1),
+        'slow': slow,
+        'profile': None
+    }
+    if request.is_json:
+        record['body'] = request.get_json(silent=True)
+
+    PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+    if counts:
+        stamp = datetime.now(timezone.utc).strftime('%Y%m%d-%H%M%S-%f')
+        name = f"{stamp}-{request.endpoint or 'unknown'}-{int(duration_ms)}ms.folded"
+        with open(PROFILE_DIR / name, 'w') as f:
+            for stack, count in counts.most_common():
+                f.write(f"{stack} {count}\n")
+        record['profile'] = name
+        response.headers['X-Profile-File'] = name
+
+    with _log_lock, open(PROFILE_DIR / "requests.jsonl", 'a') as f:
+        f.write(json.dumps(record) + "\n")
+    if slow:
+        print(f"🐢 Slow request ({duration_ms:.0f} ms): {request.full_path}")
+    return response
+
+
+def _teardown_request(exc):
+    # Requests that raised never reach after_request
+    if g.pop('profile_counts', None) is not None:
+        _sampler.stop(threading.get_ident())
+
+
+def init_profiling(app):
+    """Register the profiling hooks on the app if PROFILING is enabled"""
+    if not PROFILING:
+        return
+    app.before_request(_start_request)
+    app.after_request(_finish_request)
+    app.teardown_request(_teardown_request)
+    print(f"🔬 Profiling enabled: sample rate {PROFILE_SAMPLE_RATE}, slow threshold {PROFILE_SLOW_MS:.0f} ms, output {PROFILE_DIR}")
@@ -0,0 +1,65 @@
+"""
+Shared read-only data plane for multi-worker deployments
+gunicorn.conf.py calls preload_shared_data() in the master process after the
+app is imported and before workers fork. Workers inherit everything opened here:
+- store products (stats, climatology, return levels) are file memmaps, read
+  once here so their pages are resident before traffic arrives
+- the cube (about 1.5 GB) is mapped but not read: its pages load on demand
+  into the page cache every worker shares, unless it is copied to RAM below
+- the nearest ocean index and the flood engine's reference sea level grid are
+  built here once and shared copy-on-write (nothing writes to them)
+- with SLA_SHARED_CUBE_DIR set (e.g. /dev/shm), the cube is copied to that
+  RAM-backed filesystem, if it has room, and every worker maps the copy; after
+  an ingest the first worker to see the new version copies it again
+Nothing here opens rasterio or netCDF4 handles, which must not cross a fork.
+"""
+
+import time
+
+import numpy as np
+
+from flood import get_flood_engine
+from ocean_snap import get_ocean_index
+from sla_store import get_store, share_cube
+
+# Precomputed grids read by the serving path
+SHARED_PRODUCTS = (
+    'stats_count', 'stats_mean', 'stats_min', 'stats_max', 'stats_trend',
+    'clim_mean', 'clim_std', 'anomaly_trend', 'gev_params', 'return_levels'
+)
+
+
+def _warm(array: np.ndarray) -> int:
+    """Read a memmapped array once so its pages are in the page cache"""
+    for i in range(array.shape[0]):
+        np.asarray(array[i]).min()
+    return array.nbytes
+
+
+def preload_shared_data() -> dict:
+    """Load and warm the hot read-only SLA data in this process, to be inherited by forked workers"""
+    start = time.perf_counter()
+    summary = {'store': False, 'sharedCube': False, 'productBytes': 0, 'oceanIndex': False}
+
+    # Copied synchronously here, not in a background thread before the fork
+    store = get_store(share=False)
+    if store is not None:
+        summary['store'] = True
+        if share_cube(store) is not None:
+            store = get_store(reload=True, share=False)
+            summary['sharedCube'] = store.shared
+        for name in SHARED_PRODUCTS:
+            array = store.product(name)
+            if array is not None:
+                summary['productBytes'] += _warm(array)
+
+    summary['oceanIndex'] = get_ocean_index() is not None
+    get_flood_engine().reference_sla(store)
+
+    summary['seconds'] = round(time.perf_counter() - start, 2)
+    print(
+        f"📦 Shared data ready in {summary['seconds']}s: store={summary['store']}, "
+        f"shared cube={summary['sharedCube']}, products={summary['productBytes'] / 1e6:.0f} MB, "
+        f"ocean index={summary['oceanIndex']}"
+    )
+    return summary
@@ -0,0 +1,388 @@
+"""
+Read access to the consolidated SLA store
+The store is written by data_pipeline/sla_ingest.py; this module only needs NumPy.
+The manifest's data_version and the product files' mtimes key the backend caches and ETags.
+"""
+
+import hashlib
+import json
+import os
+import re
+import shutil
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+BACKEND_DIR = Path(__file__).parent
+
+SLA_STORE_DIR = Path(os.environ.get(
+    'SLA_STORE_DIR',
+    BACKEND_DIR.parent / "data_pipeline" / "jiayou_sat_data" / "store"
+))
+
+SLA_FILE_PATTERN = re.compile(r"dt_global_twosat_phy_l4_(\d{4})(\d{2})_.*\.nc$")
+
+# RAM-backed directory (e.g. /dev/shm) for a copy of the cube that every worker
+# maps; written before forking by shared_data.py and again by a worker when the
+# ingest publishes a new version, unused when unset
+SLA_SHARED_CUBE_DIR = os.environ.get('SLA_SHARED_CUBE_DIR', '')
+
+# Seconds between attempts to create a missing shared copy (e.g. while old
+# versions still hold the space)
+SHARED_CUBE_RETRY_S = 60.0
+
+# Files written by climatology.py and extremes.py, which can be rebuilt without
+# an ingest (e.g. extremes.py --distribution gumbel) and so without a new data_version
+PRODUCT_FILES = (
+    'clim_mean.npy', 'clim_std.npy', 'anomaly_trend.npy', 'climatology.json',
+    'gev_params.npy', 'gumbel_params.npy', 'return_levels.npy', 'extremes.json'
+)
+
+
+def _file_key(path: Path) -> tuple | None:
+    """(mtime_ns, size) of a file, None if missing"""
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def file_version(path: Path) -> str:
+    """Short fingerprint of a file's inode, mtime and size ('none' if missing), changed by any replacement"""
+    try:
+        stat = Path(path).stat()
+    except FileNotFoundError:
+        return "none"
+    return hashlib.sha1(f"{stat.st_ino}:{stat.st_mtime_ns}:{stat.st_size}".encode()).hexdigest()[:8]
+
+
+def shared_cube_path(store_dir: Path, version: int) -> Path | None:
+    """Location of the shared copy of a store version's cube, None if disabled"""
+    if not SLA_SHARED_CUBE_DIR:
+        return None
+    store_key = hashlib.sha1(str(Path(store_dir).resolve()).encode()).hexdigest()[:8]
+    return Path(SLA_SHARED_CUBE_DIR) / f"sla_cube_{store_key}_v{version}.f32"
+
+
+def _copy_cube(store: 'SlaStore', target: Path) -> Path | None:
+    nbytes = store.cube.nbytes
+    if target.exists() and target.stat().st_size == nbytes:
+        return target
+
+    # Workers still mapping an old version keep it until they reopen the store
+    prefix = target.name.rsplit('_v', 1)[0]
+    for old in target.parent.glob(f"{prefix}_v*.f32*"):
+        if old != target:
+            old.unlink(missing_ok=True)
+
+    free = shutil.disk_usage(target.parent).free
+    if free < nbytes:
+        print(f"⚠️  {target.parent} has {free / 1e6:.0f} MB free, the cube needs {nbytes / 1e6:.0f} MB; using the disk cube")
+        return None
+    tmp_path = target.with_suffix(".f32.tmp")
+    try:
+        shutil.copyfile(store.store_dir / "sla_cube.f32", tmp_path)
+        tmp_path.replace(target)
+    except OSError as e:
+        tmp_path.unlink(missing_ok=True)
+        print(f"⚠️  Could not copy the cube to {target.parent} ({e}); using the disk cube")
+        return None
+    return target
+
+
+def share_cube(store: 'SlaStore', wait: bool = True) -> Path | None:
+    """
+    Copy a store's cube to SLA_SHARED_CUBE_DIR, dropping copies of other versions
+    One process copies at a time; with wait=False, returns None at once if
+    another one is. Returns the copy, or None if sharing is disabled or the
+    directory lacks room (the disk cube is used then).
+    """
+    import fcntl
+
+    target = shared_cube_path(store.store_dir, store.data_version)
+    if target is None:
+        return None
+    try:
+        target.parent.mkdir(parents=True, exist_ok=True)
+        with open(target.parent / ".sla_cube.lock", 'w') as lock:
+            try:
+                fcntl.flock(lock, fcntl.LOCK_EX if wait else fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                return None
+            return _copy_cube(store, target)
+    except OSError as e:
+        print(f"⚠️  Could not share the cube ({e}); using the disk cube")
+        return None
+
+
+def _share_in_background(store: 'SlaStore'):
+    if share_cube(store, wait=False) is not None:
+        print(f"📦 Shared cube for store version {store.data_version} ready")
+
+
+class SlaStore:
+    """Memory-mapped (month, lat, lon) SLA cube plus its manifest"""
+
+    def __init__(self, store_dir: Path):
+        self.store_dir = Path(store_dir)
+        manifest_path = self.store_dir / "manifest.json"
+        self.mtime = manifest_path.stat().st_mtime
+        with open(manifest_path) as f:
+            self.manifest = json.load(f)
+
+        self.months = self.manifest['months']
+        self.data_version = self.manifest['data_version']
+        self.month_index = {key: i for i, key in enumerate(self.months)}
+        n_lat, n_lon = self.manifest['shape']
+        shape = (len(self.months), n_lat, n_lon)
+        self.cube_path = self.store_dir / "sla_cube.f32"
+        shared = shared_cube_path(self.store_dir, self.data_version)
+        if shared is not None and shared.exists() and shared.stat().st_size == int(np.prod(shape)) * 4:
+            self.cube_path = shared
+        self.shared = self.cube_path != self.store_dir / "sla_cube.f32"
+        self.cube = np.memmap(self.cube_path, dtype='float32', mode='r', shape=shape)
+        self.latitude = np.load(self.store_dir / "latitude.npy")
+        self.longitude = np.load(self.store_dir / "longitude.npy")
+        self.lat0 = float(self.latitude[0])
+        self.dlat = float(self.latitude[1] - self.latitude[0])
+        self.lon0 = float(self.longitude[0])
+        self.dlon = float(self.longitude[1] - self.longitude[0])
+        self._products = {}
+        self._metadata = {}
+
+    def product(self, name: str) -> np.ndarray | None:
+        """Memory-mapped precomputed grid (e.g. clim_mean), None if not built; reopened when the file is replaced"""
+        path = self.store_dir / f"{name}.npy"
+        key = _file_key(path)
+        if key is None:
+            return None
+        cached = self._products.get(name)
+        if cached is None or cached[0] != key:
+            cached = (key, np.load(path, mmap_mode='r'))
+            self._products[name] = cached
+        return cached[1]
+
+    def metadata(self, name: str) -> dict | None:
+        """Metadata written next to a product (e.g. extremes.json), None if not built; reread when the file is replaced"""
+        path = self.store_dir / f"{name}.json"
+        key = _file_key(path)
+        if key is None:
+            return None
+        cached = self._metadata.get(name)
+        if cached is None or cached[0] != key:
+            with open(path) as f:
+                cached = (key, json.load(f))
+            self._metadata[name] = cached
+        return cached[1]
+
+    def products_version(self) -> str:
+        """Fingerprint of the product files' mtimes and sizes"""
+        digest = hashlib.sha1()
+        for name in PRODUCT_FILES:
+            digest.update(f"{name}:{_file_key(self.store_dir / name)}".encode())
+        return digest.hexdigest()[:8]
+
+    @property
+    def years(self) -> list:
+        return sorted({int(key[:4]) for key in self.months})
+
+    def has_month(self, year: int, month: int) -> bool:
+        return f"{year}-{month:02d}" in self.month_index
+
+    def cell(self, lat: float, lon: float) -> tuple:
+        """Nearest grid row/col (longitude may be -180/180 or 0/360)"""
+        row = int(np.clip(np.rint((lat - self.lat0) / self.dlat), 0, len(self.latitude) - 1))
+        col = int(np.rint((lon % 360.0 - self.lon0) / self.dlon)) % len(self.longitude)
+        return row, col
+
+    def cells(self, lats: np.ndarray, lons: np.ndarray) -> tuple:
+        """Vectorized nearest grid rows/cols for arrays of points"""
+        rows = np.clip(np.rint((lats - self.lat0) / self.dlat), 0, len(self.latitude) - 1).astype('int64')
+        cols = np.rint((np.mod(lons, 360.0) - self.lon0) / self.dlon).astype('int64') % len(self.longitude)
+        return rows, cols
+
+    def climatology(self, lat: float, lon: float, month: int) -> dict | None:
+        """Monthly climatology (mm) and deseasonalized trend (mm/yr) at the nearest cell"""
+        clim_mean = self.product('clim_mean')
+        clim_std = self.product('clim_std')
+        trend = self.product('anomaly_trend')
+        if clim_mean is None or clim_std is None or trend is None:
+            return None
+        row, col = self.cell(lat, lon)
+        values = {
+            'mean': float(clim_mean[month - 1, row, col]),
+            'std': float(clim_std[month - 1, row, col]),
+            'deseasonalizedTrend': float(trend[row, col]),
+        }
+        return {key: None if np.isnan(v) else round(v, 2) for key, v in values.items()}
+
+    def return_levels(self, lat: float, lon: float) -> dict | None:
+        """Return levels (mm) and GEV parameters fitted to annual maxima at the nearest cell"""
+        levels = self.product('return_levels')
+        gev = self.product('gev_params')
+        meta = self.metadata('extremes')
+        if levels is None or gev is None or meta is None:
+            return None
+        row, col = self.cell(lat, lon)
+
+        def rounded(value, digits=2):
+            value = float(value)
+            return None if np.isnan(value) else round(value, digits)
+
+        return {
+            'returnLevels': {
+                str(period): rounded(levels[i, row, col])
+                for i, period in enumerate(meta['return_periods'])
+            },
+            'distribution': meta['distribution'],
+            'gev': {
+                'location': rounded(gev[0, row, col]),
+                'scale': rounded(gev[1, row, col]),
+                'shape': rounded(gev[2, row, col], 4),
+            },
+            'years': len(meta['years']),
+        }
+
+    def _window_cells(self, bbox: tuple | None, stride: int) -> tuple:
+        """North-to-south rows and west-to-east columns of every stride-th cell in bbox"""
+        n_lat, n_lon = len(self.latitude), len(self.longitude)
+        min_lon, min_lat, max_lon, max_lat = bbox if bbox is not None else (-180.0, -90.0, 180.0, 90.0)
+        row0, col0 = self.cell(min_lat, min_lon)
+        row1, col1 = self.cell(max_lat, max_lon)
+        if max_lon - min_lon >= 360.0:
+            col1 = col0 + n_lon - 1
+        elif col1 < col0:
+            col1 += n_lon
+        rows = np.arange(row1, row0 - 1, -stride)
+        cols = np.arange(col0, col1 + 1, stride) % n_lon
+        return rows, cols
+
+    def window_shape(self, bbox: tuple | None = None, stride: int = 1) -> tuple:
+        """(rows, cols) window_mm returns for bbox and stride, without reading anything"""
+        rows, cols = self._window_cells(bbox, stride)
+        return len(rows), len(cols)
+
+    def window_mm(self, year: int, month: int, bbox: tuple | None = None, stride: int = 1) -> tuple | None:
+        """
+        Every stride-th cell of a month inside bbox (min_lon, min_lat, max_lon, max_lat),
+        the whole globe from -180 to 180 by default
+        Returns (values in mm, north-up, NaN over land; row latitudes; column longitudes
+        in -180..180) or None if the month is missing. Longitudes wrap across the antimeridian.
+        """
+        index = self.month_index.get(f"{year}-{month:02d}")
+        if index is None:
+            return None
+        rows, cols = self._window_cells(bbox, stride)
+
+        # Contiguous row band from the memmap, then the strided cells
+        band = self.cube[index, rows.min():rows.max() + 1]
+        values = band[rows - rows.min()][:, cols] * 1000.0
+        longitude = self.longitude[cols]
+        return values, self.latitude[rows], np.where(longitude > 180.0, longitude - 360.0, longitude)
+
+    def value_mm(self, year: int, month: int, lat: float, lon: float) -> float | None:
+        """SLA in millimeters at the nearest cell, None over land or if missing"""
+        index = self.month_index.get(f"{year}-{month:02d}")
+        if index is None:
+            return None
+        row, col = self.cell(lat, lon)
+        value = float(self.cube[index, row, col])
+        return None if np.isnan(value) else value * 1000.0
+
+    def month_series_mm(self, lat: float, lon: float, month: int) -> list:
+        """(year, value in mm or None) for every ingested year of a calendar month"""
+        row, col = self.cell(lat, lon)
+        keys = [key for key in self.months if int(key[5:7]) == month]
+        values = self.cube[[self.month_index[key] for key in keys], row, col]
+        return [
+            (int(key[:4]), None if np.isnan(value) else float(value) * 1000.0)
+            for key, value in zip(keys, values)
+        ]
+
+
+_store = None
+_store_lock = threading.Lock()
+_next_share_attempt = 0.0
+
+
+def get_store(reload: bool = False, share: bool = True) -> SlaStore | None:
+    """
+    Shared store, reopened when the ingest rewrites the manifest
+    With SLA_SHARED_CUBE_DIR set and share, a store reading the disk cube
+    starts a background copy of it and switches to the copy once it exists.
+    """
+    global _store, _next_share_attempt
+    manifest_path = SLA_STORE_DIR / "manifest.json"
+    if not manifest_path.exists():
+        return None
+    mtime = manifest_path.stat().st_mtime
+    if reload or _store is None or _store.mtime != mtime:
+        with _store_lock:
+            if reload or _store is None or _store.mtime != mtime:
+                _store = SlaStore(SLA_STORE_DIR)
+
+    store = _store
+    if share and SLA_SHARED_CUBE_DIR and not store.shared:
+        shared = shared_cube_path(store.store_dir, store.data_version)
+        if shared.exists() and shared.stat().st_size == store.cube.nbytes:
+            with _store_lock:
+                if _store is store:
+                    _store = SlaStore(SLA_STORE_DIR)
+            return _store
+        now = time.monotonic()
+        if now >= _next_share_attempt:
+            _next_share_attempt = now + SHARED_CUBE_RETRY_S
+            threading.Thread(target=_share_in_background, args=(store,), name='share-cube', daemon=True).start()
+    return store
+
+
+_raw_scans = {}
+
+
+def _scan_raw_files(data_dir: Path) -> tuple:
+    """
+    (years, fingerprint) of the raw NetCDF files
+    The listing is cached on the directory's mtime, which changes when files are
+    added, removed or atomically replaced; the fingerprint covers every file's
+    mtime and size, so a file rewritten in place changes it too.
+    """
+    if not data_dir.exists():
+        return [], "raw-0-0"
+    dir_mtime = data_dir.stat().st_mtime_ns
+    cached = _raw_scans.get(data_dir)
+    if cached is None or cached[0] != dir_mtime:
+        files = sorted(data_dir.glob("*.nc"))
+        years = set()
+        for path in files:
+            match = SLA_FILE_PATTERN.match(path.name)
+            if match:
+                years.add(int(match.group(1)))
+        cached = (dir_mtime, files, sorted(years))
+        _raw_scans[data_dir] = cached
+
+    _, files, years = cached
+    digest = hashlib.sha1()
+    for path in files:
+        digest.update(f"{path.name}:{_file_key(path)}".encode())
+    return years, f"raw-{len(files)}-{digest.hexdigest()[:8]}"
+
+
+def scan_years(data_dir: Path) -> list:
+    """Years present among the raw monthly NetCDF files"""
+    return _scan_raw_files(data_dir)[0]
+
+
+def data_version(data_dir: Path) -> str:
+    """
+    Version string for caches and ETags
+    The store's data_version plus a fingerprint of its product files (rebuilt
+    climatology or extremes change it too), or a fingerprint of the raw files
+    without a store.
+    """
+    store = get_store()
+    if store is not None:
+        return f"v{store.data_version}-{store.products_version()}"
+    return _scan_raw_files(data_dir)[1]
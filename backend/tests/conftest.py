@@ -0,0 +1,35 @@
+"""Fixtures for the backend tests"""
+
+import numpy as np
+import pytest
+
+import ocean_snap
+import sla_store
+from synthetic_store import LATITUDE, LONGITUDE, MONTHS, write_manifest
+
+
+@pytest.fixture
+def store_dir(tmp_path, monkeypatch):
+    path = tmp_path / "store"
+    path.mkdir()
+    grid = (LONGITUDE[None, :] * 1000 + LATITUDE[:, None] + 90) / 1000.0
+    cube = np.repeat(grid[None], len(MONTHS), axis=0).astype('float32')
+    cube.tofile(path / "sla_cube.f32")
+    np.save(path / "latitude.npy", LATITUDE)
+    np.save(path / "longitude.npy", LONGITUDE)
+    np.save(path / "clim_mean.npy", np.zeros((12,) + grid.shape, dtype='float32'))
+    write_manifest(path, 1)
+
+    monkeypatch.setattr(sla_store, 'SLA_STORE_DIR', path)
+    monkeypatch.setattr(sla_store, 'SLA_SHARED_CUBE_DIR', '')
+    monkeypatch.setattr(sla_store, '_store', None)
+    # The repo's ocean index is for the 0.25 degree grid
+    monkeypatch.setattr(ocean_snap, 'OCEAN_INDEX_PATH', tmp_path / "nearest_ocean.npz")
+    monkeypatch.setattr(ocean_snap, '_index', None)
+    return path
+
+
+@pytest.fixture
+def client(store_dir):
+    from app import app
+    return app.test_client()
@@ -0,0 +1,60 @@
+"""
+Synthetic consolidated store and DEM for the backend tests
+A synthetic 10 degree store whose values encode their own cell: a cell at
+longitude lon (0..360) and latitude lat holds lon * 1000 + lat + 90 mm.
+The DEM is a small tiled GeoTIFF in EPSG:4326 with 0.01 degree pixels.
+"""
+
+import json
+import os
+
+import numpy as np
+
+LATITUDE = np.arange(-85.0, 90.0, 10.0)
+LONGITUDE = np.arange(5.0, 360.0, 10.0)
+MONTHS = ['2020-01', '2020-02', '2020-03']
+
+
+def decode_cells(values_mm: np.ndarray) -> tuple:
+    """(lon in 0..360, lat) of the cells synthetic values came from"""
+    code = np.rint(values_mm)
+    return code // 1000, code % 1000 - 90
+
+
+def write_manifest(store_dir, data_version: int):
+    manifest = {
+        'months': MONTHS, 'files': {}, 'shape': [len(LATITUDE), len(LONGITUDE)],
+        'dtype': 'float32', 'units': 'm', 'data_version': data_version
+    }
+    with open(store_dir / "manifest.json", 'w') as f:
+        json.dump(manifest, f)
+
+
+def bump_mtime(path, seconds: float = 10.0):
+    """Move a file's mtime forward so stat-based checks see a rewrite"""
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + int(seconds * 1e9)))
+
+
+# DEM pixels of 0.01 degree from (DEM_WEST, DEM_NORTH)
+DEM_SHAPE = (64, 64)
+DEM_WEST, DEM_NORTH = -74.32, 40.96
+
+
+def write_dem(path, data: np.ndarray):
+    """Tiled float32 GeoTIFF (16x16 blocks, nodata -9999) of a DEM_SHAPE array"""
+    import rasterio
+    from rasterio.transform import from_origin
+
+    with rasterio.open(
+        path, 'w', driver='GTiff', height=data.shape[0], width=data.shape[1], count=1, dtype='float32',
+        crs='EPSG:4326', transform=from_origin(DEM_WEST, DEM_NORTH, 0.01, 0.01), nodata=-9999.0,
+        tiled=True, blockxsize=16, blockysize=16
+    ) as dst:
+        dst.write(data.astype('float32'), 1)
+    return path
+
+
+def pixel_centre(row: float, col: float) -> tuple:
+    """(lat, lon) of a DEM pixel centre"""
+    return DEM_NORTH - (row + 0.5) * 0.01, DEM_WEST + (col + 0.5) * 0.01
@@ -0,0 +1,46 @@
+import json
+import os
+import subprocess
+import sys
+
+import sla_store
+from benchmark_startup import BACKEND_DIR, HEAVY_MODULES, PROBE
+from synthetic_store import bump_mtime
+
+
+def test_serving_from_the_store_loads_no_heavy_library(store_dir, tmp_path):
+    env = dict(os.environ, SLA_STORE_DIR=str(store_dir), OCEAN_INDEX_PATH=str(tmp_path / "nearest_ocean.npz"))
+    output = subprocess.run(
+        [sys.executable, '-c', PROBE.format(year=2020, heavy=HEAVY_MODULES)],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True
+    ).stdout
+    probe = json.loads(output.strip().splitlines()[-1])
+
+    assert probe['store'] and probe['status'] == 200
+    assert probe['heavy'] == []
+
+
+def test_raw_listing_follows_added_files(tmp_path):
+    (tmp_path / "dt_global_twosat_phy_l4_202001_vDT2021-M01.nc").write_bytes(b'a')
+    years, before = sla_store._scan_raw_files(tmp_path)
+
+    (tmp_path / "dt_global_twosat_phy_l4_202101_vDT2021-M01.nc").write_bytes(b'a')
+    bump_mtime(tmp_path)
+    years_after, after = sla_store._scan_raw_files(tmp_path)
+
+    assert years == [2020] and years_after == [2020, 2021]
+    assert before.startswith('raw-1-') and after.startswith('raw-2-')
+
+
+def test_raw_fingerprint_sees_files_rewritten_in_place(tmp_path):
+    path = tmp_path / "dt_global_twosat_phy_l4_202001_vDT2021-M01.nc"
+    path.write_bytes(b'a' * 16)
+    years, before = sla_store._scan_raw_files(tmp_path)
+
+    with open(path, 'r+b') as f:
+        f.write(b'b' * 32)
+    bump_mtime(path)
+    _, after = sla_store._scan_raw_files(tmp_path)
+
+    assert years == [2020]
+    assert after != before
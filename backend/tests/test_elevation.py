@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+rasterio = pytest.importorskip("rasterio")
+import elevation
+from synthetic_store import DEM_SHAPE, pixel_centre
+from synthetic_store import write_dem as write_raster
+
+
+def write_dem(path, offset=0.0):
+    """Pixel (row, col) holds row * 100 + col + offset, (0, 0) is nodata"""
+    rows, cols = np.indices(DEM_SHAPE)
+    data = rows * 100 + cols + offset
+    data[0, 0] = -9999.0
+    return write_raster(path, data)
+
+
+@pytest.fixture
+def dem_path(tmp_path, monkeypatch):
+    path = write_dem(tmp_path / "coastal_dem.tif")
+    monkeypatch.setattr(elevation, 'DEM_COG_PATH', path)
+    monkeypatch.setattr(elevation, '_reader', None)
+    return path
+
+
+def test_nearest_and_bilinear_samples(dem_path):
+    lat, lon = pixel_centre(10, 20)
+    lat2, lon2 = pixel_centre(30.5, 40.5)
+
+    assert elevation.elevation_values([lat], [lon], method='nearest') == [1020.0]
+    assert elevation.elevation_values([lat], [lon]) == [1020.0]
+    assert elevation.elevation_values([lat2], [lon2]) == [3090.5]
+
+
+def test_nodata_and_outside_points_are_none(dem_path):
+    lat, lon = pixel_centre(0, 0)
+
+    assert elevation.elevation_values([lat, 0.0], [lon, 0.0], method='nearest') == [None, None]
+
+
+def test_unknown_method_is_rejected(dem_path):
+    with pytest.raises(ValueError):
+        elevation.get_dem_reader().sample([40.5], [-74.0], method='cubic')
+
+
+def test_replaced_dem_is_reopened_and_the_old_one_closed(dem_path, tmp_path):
+    old = elevation.get_dem_reader()
+    lat, lon = pixel_centre(10, 20)
+    assert elevation.elevation_values([lat], [lon], method='nearest') == [1020.0]
+
+    write_dem(tmp_path / "new.tif", offset=0.5).replace(dem_path)
+    new = elevation.get_dem_reader()
+
+    assert new is not old and old.closed and not new.closed
+    with pytest.raises(elevation.ReaderClosedError):
+        old.sample([lat], [lon])
+    assert elevation.elevation_values([lat], [lon], method='nearest') == [1020.5]
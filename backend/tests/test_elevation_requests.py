@@ -0,0 +1,61 @@
+import pytest
+
+from app import app
+
+
+@pytest.fixture
+def client():
+    return app.test_client()
+
+
+@pytest.mark.parametrize("body", [
+    {'points': [{'lat': 40.7, 'lon': -74.0}, {'lat': 40.7}]},
+    {'points': [{'lat': 40.7, 'lon': 'east'}]},
+    {'points': [[40.7, -74.0]]},
+    {'points': {'lat': 40.7, 'lon': -74.0}},
+    {'points': [{'lat': 40.7, 'lon': -74.0}], 'method': 'cubic'},
+    {'points': [{'lat': 40.7, 'lon': -74.0}], 'scale': 'fine'},
+    {'points': [{'lat': 40.7, 'lon': -74.0}], 'scale': True},
+    {'points': [{'lat': 40.7, 'lon': -74.0}], 'scale': float('inf')},
+    {'points': [{'lat': 40.7, 'lon': 'nan'}]},
+    {'points': [{'lat': 'inf', 'lon': -74.0}]},
+    {'points': [{'lat': None, 'lon': -74.0}]},
+    [{'lat': 40.7, 'lon': -74.0}],
+])
+def test_batch_rejects_malformed_requests(client, body):
+    response = client.post('/api/elevation/batch', json=body)
+
+    assert response.status_code == 400
+    assert 'error' in response.get_json()
+
+
+@pytest.mark.parametrize("data", [b'{"points": [', b'not json', b''])
+def test_batch_rejects_bodies_that_are_not_json(client, data):
+    response = client.post('/api/elevation/batch', data=data, content_type='application/json')
+
+    assert response.status_code == 400
+    assert response.get_json()['error'] == 'Invalid body'
+
+
+def test_batch_names_the_bad_point(client):
+    response = client.post('/api/elevation/batch', json={'points': [{'lat': 1, 'lon': 2}, {'lon': 3}]})
+
+    assert 'Point 1' in response.get_json()['message']
+
+
+@pytest.mark.parametrize("query", [
+    'lat=40.7&lon=-74&method=cubic', 'lat=nan&lon=-74', 'lat=40.7&lon=inf', 'lon=-74',
+    'lat=40.7&lon=-74&scale=coarse', 'lat=40.7&lon=-74&scale=nan'
+])
+def test_point_rejects_malformed_requests(client, query):
+    assert client.get(f'/api/elevation?{query}').status_code == 400
+
+
+def test_valid_batch_without_a_dem_returns_nulls(client, tmp_path, monkeypatch):
+    import elevation
+    monkeypatch.setattr(elevation, 'DEM_COG_PATH', tmp_path / "missing.tif")
+
+    response = client.post('/api/elevation/batch', json={'points': [{'lat': 40.7, 'lon': -74.0}], 'method': 'nearest'})
+
+    assert response.status_code == 200
+    assert response.get_json()['points'] == [{'lat': 40.7, 'lon': -74.0, 'elevation': None}]
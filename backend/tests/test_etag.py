@@ -0,0 +1,99 @@
+import numpy as np
+
+import sla_store
+from synthetic_store import bump_mtime, write_manifest
+
+SEA_LEVEL_URL = '/api/sea-level?lat=15&lon=-175&year=2020&month=2'
+
+
+def test_matching_etag_gets_304(client):
+    first = client.get(SEA_LEVEL_URL)
+    etag = first.headers['ETag']
+
+    repeat = client.get(SEA_LEVEL_URL, headers={'If-None-Match': etag})
+
+    assert first.status_code == 200 and etag.startswith('W/"v1-')
+    assert round(first.get_json()['seaLevel']) == 185105
+    assert repeat.status_code == 304
+    assert repeat.headers['ETag'] == etag
+    assert repeat.data == b''
+
+
+def test_etag_depends_on_the_url(client):
+    etag = client.get(SEA_LEVEL_URL).headers['ETag']
+
+    response = client.get(SEA_LEVEL_URL.replace('month=2', 'month=3'), headers={'If-None-Match': etag})
+
+    assert response.status_code == 200
+    assert response.headers['ETag'] != etag
+
+
+def test_new_data_version_invalidates_etag(client, store_dir):
+    etag = client.get(SEA_LEVEL_URL).headers['ETag']
+
+    write_manifest(store_dir, 2)
+    bump_mtime(store_dir / "manifest.json")
+    response = client.get(SEA_LEVEL_URL, headers={'If-None-Match': etag})
+
+    assert response.status_code == 200
+    assert response.headers['ETag'].startswith('W/"v2-')
+
+
+def test_rebuilt_product_invalidates_etag(client, store_dir):
+    etag = client.get(SEA_LEVEL_URL).headers['ETag']
+    store = sla_store.get_store()
+    assert store.product('clim_mean')[0, 0, 0] == 0.0
+
+    path = store_dir / "clim_mean.npy"
+    np.save(path, np.ones((12, 18, 36), dtype='float32'))
+    bump_mtime(path)
+    response = client.get(SEA_LEVEL_URL, headers={'If-None-Match': etag})
+
+    assert response.status_code == 200
+    assert response.headers['ETag'] != etag
+    assert sla_store.get_store() is store
+    assert store.product('clim_mean')[0, 0, 0] == 1.0
+
+
+def test_point_analytics_etag_follows_the_dem(client, tmp_path, monkeypatch):
+    import app as backend_app
+    import elevation
+
+    dem_path = tmp_path / "coastal_dem.tif"
+    dem_path.write_bytes(b'old')
+    monkeypatch.setattr(elevation, 'DEM_COG_PATH', dem_path)
+    monkeypatch.setattr(backend_app, 'elevation_values', lambda lats, lons, **kwargs: [None] * len(lats))
+    url = '/api/point-analytics?lat=15&lon=-175&year=2020&month=2'
+    etag = client.get(url).headers['ETag']
+    assert client.get(url, headers={'If-None-Match': etag}).status_code == 304
+
+    # Replaced atomically, as dem_processing.py does
+    new_path = tmp_path / "coastal_dem.tif.tmp"
+    new_path.write_bytes(b'new')
+    new_path.replace(dem_path)
+
+    assert client.get(url, headers={'If-None-Match': etag}).status_code == 200
+    assert client.get(SEA_LEVEL_URL).headers['ETag'].count('-') == etag.count('-') - 1
+
+
+def test_replaced_ocean_index_invalidates_etag(client, monkeypatch):
+    import ocean_snap
+    from synthetic_store import LATITUDE, LONGITUDE
+
+    def write_index(offset):
+        rows, cols = np.meshgrid(np.arange(len(LATITUDE)), np.arange(len(LONGITUDE)), indexing='ij')
+        np.savez(
+            ocean_snap.OCEAN_INDEX_PATH, latitude=LATITUDE, longitude=LONGITUDE,
+            nearest_row=rows, nearest_col=(cols + offset) % len(LONGITUDE)
+        )
+
+    # Cells are 10 degrees apart, further than the default snap limit
+    monkeypatch.setattr(ocean_snap, 'MAX_SNAP_KM', 5000.0)
+    write_index(0)
+    first = client.get(SEA_LEVEL_URL)
+    write_index(1)
+    bump_mtime(ocean_snap.OCEAN_INDEX_PATH)
+    second = client.get(SEA_LEVEL_URL, headers={'If-None-Match': first.headers['ETag']})
+
+    assert second.status_code == 200
+    assert second.get_json()['gridCell']['lon'] == first.get_json()['gridCell']['lon'] + 10
@@ -0,0 +1,121 @@
+import json
+import os
+
+import numpy as np
+import pytest
+
+rasterio = pytest.importorskip("rasterio")
+import elevation
+import flood
+import sla_store
+from synthetic_store import DEM_NORTH, DEM_SHAPE, DEM_WEST, write_dem
+
+# Inside the synthetic DEM: minLon,minLat,maxLon,maxLat
+BBOX = f"{DEM_WEST + 0.02},{DEM_NORTH - 0.62},{DEM_WEST + 0.62},{DEM_NORTH - 0.02}"
+
+
+@pytest.fixture
+def flood_client(tmp_path, monkeypatch):
+    """DEM rising 0.05 m per column from the water in column 0, no SLA store (datum = sea level)"""
+    cols = np.indices(DEM_SHAPE)[1]
+    path = write_dem(tmp_path / "coastal_dem.tif", cols * 0.05)
+    monkeypatch.setattr(elevation, 'DEM_COG_PATH', path)
+    monkeypatch.setattr(elevation, '_reader', None)
+    monkeypatch.setattr(sla_store, 'SLA_STORE_DIR', tmp_path / "no_store")
+    monkeypatch.setattr(sla_store, '_store', None)
+    monkeypatch.setattr(flood, '_engine', flood.FloodEngine())
+
+    from app import app
+    return app.test_client()
+
+
+def centre_tile(z: int) -> tuple:
+    """(z, x, y) of the web mercator tile holding the centre of the DEM"""
+    lat, lon = DEM_NORTH - 0.3, DEM_WEST + 0.3
+    n = 2 ** z
+    return z, int((lon + 180) / 360 * n), int((1 - np.arcsinh(np.tan(np.radians(lat))) / np.pi) / 2 * n)
+
+
+def strict_json(response):
+    """Response body parsed without accepting NaN or Infinity"""
+    def reject(constant):
+        raise ValueError(constant)
+    return json.loads(response.get_data(as_text=True), parse_constant=reject)
+
+
+@pytest.mark.parametrize('query', [
+    'scenarios=nan',
+    'scenarios=0,1,inf',
+    'scenarios=-inf',
+    'scenarios=0,abc',
+    f'bbox=nan,{BBOX.split(",", 1)[1]}',
+    'bbox=-74.3,40.4,inf,40.9',
+])
+def test_scenarios_reject_non_finite_values(flood_client, query):
+    if not query.startswith('bbox='):
+        query = f'bbox={BBOX}&{query}'
+
+    response = flood_client.get(f'/api/flood-scenarios?{query}')
+
+    assert response.status_code == 400
+    assert strict_json(response)['error'] == 'Invalid parameters'
+
+
+@pytest.mark.parametrize('query', ['bbox=1,2,3', 'bbox=-74,40.9,-74.3,40.4', f'bbox={BBOX}&scenarios=,'])
+def test_scenarios_reject_malformed_regions_and_lists(flood_client, query):
+    response = flood_client.get(f'/api/flood-scenarios?{query}')
+
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize('slr', ['nan', 'inf', '-inf', 'abc'])
+def test_depth_tiles_reject_non_finite_slr(flood_client, slr):
+    response = flood_client.get(f'/api/flood-dem-tiles/7/37/48.png?slr={slr}')
+
+    assert response.status_code == 400
+    assert 'finite' in strict_json(response)['message']
+
+
+def test_default_scenarios_sweep_the_ramp(flood_client):
+    response = flood_client.get(f'/api/flood-scenarios?bbox={BBOX}')
+
+    assert response.status_code == 200
+    body = strict_json(response)
+    levels = [s['scenario'] for s in body['scenarios']]
+    exposed = [s['exposedCells'] for s in body['scenarios']]
+    assert levels == [round(0.1 * i, 1) for i in range(51)]
+    assert exposed == sorted(exposed)
+    assert exposed[0] == 0
+    assert body['scenarios'][-1]['fraction'] == 1.0
+    # Columns 2..62 span 0.1..3.1 m, so 1.6 m covers about half of the land
+    assert body['scenarios'][16]['fraction'] == pytest.approx(0.5, abs=0.1)
+
+
+def test_depth_tile_thresholds_the_freeboard(flood_client):
+    engine = flood.get_flood_engine()
+    z, x, y = centre_tile(9)
+
+    base = engine.base_tile(z, x, y)
+    depth = engine.depth_tile(z, x, y, 1.0)
+
+    flooded = base < 1.0
+    assert flooded.any() and (~flooded & ~np.isnan(base)).any()
+    np.testing.assert_allclose(depth[flooded], 1.0 - base[flooded])
+    assert np.isnan(depth[~flooded]).all()
+    assert flood_client.get(f'/api/flood-dem-tiles/{z}/{x}/{y}.png?slr=1').status_code == 200
+
+
+def test_base_tile_retries_when_the_dem_is_swapped(flood_client, tmp_path, monkeypatch):
+    stale = elevation.get_dem_reader()
+    cols = np.indices(DEM_SHAPE)[1]
+    os.replace(write_dem(tmp_path / "new_dem.tif", cols * 0.05 + 1.0), elevation.DEM_COG_PATH)
+    fresh = elevation.get_dem_reader()
+    assert stale.closed and fresh is not stale
+
+    # The first lookup hands out the reader the swap has just closed
+    readers = iter([stale])
+    monkeypatch.setattr(flood, 'get_dem_reader', lambda: next(readers, None) or elevation.get_dem_reader())
+    base = flood.get_flood_engine().base_tile(*centre_tile(9))
+
+    np.testing.assert_array_equal(base, flood.FloodEngine().base_tile(*centre_tile(9)))
+    assert np.nanmin(base) >= 1.0
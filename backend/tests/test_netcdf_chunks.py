@@ -0,0 +1,116 @@
+import os
+
+import numpy as np
+import pytest
+
+netCDF4 = pytest.importorskip("netCDF4")
+from netcdf_chunks import CONTIGUOUS_BLOCK, ChunkCache, read_stats, reset_read_stats
+from synthetic_store import LATITUDE, LONGITUDE, bump_mtime
+
+# A chunk of the synthetic files: 8 x 8 cells of 4 bytes once decoded
+CHUNK_BYTES = 8 * 8 * 4
+
+
+def write_sla(path, offset: float = 0.0, chunked: bool = True):
+    """Packed int16 SLA like the CMEMS files, cell (lat, lon) = lat/100 + lon/1000 m, land at lon 105"""
+    grid = LATITUDE[:, None] / 100.0 + LONGITUDE[None, :] / 1000.0 + offset
+    with netCDF4.Dataset(path, 'w') as ds:
+        ds.createDimension('time', 1)
+        ds.createDimension('latitude', len(LATITUDE))
+        ds.createDimension('longitude', len(LONGITUDE))
+        ds.createVariable('latitude', 'f4', ('latitude',))[:] = LATITUDE
+        ds.createVariable('longitude', 'f4', ('longitude',))[:] = LONGITUDE
+        sla = ds.createVariable(
+            'sla', 'i2', ('time', 'latitude', 'longitude'), fill_value=-2147,
+            zlib=chunked, chunksizes=(1, 8, 8) if chunked else None, contiguous=not chunked
+        )
+        sla.scale_factor = 0.0001
+        sla[0] = np.ma.masked_where(np.broadcast_to(LONGITUDE == 105.0, grid.shape), grid)
+    return path
+
+
+def expected(lat, lon, offset=0.0):
+    return lat / 100.0 + np.mod(lon, 360.0) / 1000.0 + offset
+
+
+def test_points_are_decoded_from_cached_chunks(tmp_path):
+    path = write_sla(tmp_path / "sla.nc")
+    cache = ChunkCache(max_bytes=1 << 20)
+    lats, lons = np.array([-85.0, -75.0, 45.0, 5.0]), np.array([5.0, -345.0, 255.0, 105.0])
+
+    reset_read_stats()
+    values = cache.read_points(path, lats, lons)
+
+    np.testing.assert_allclose(values[:3], expected(lats[:3], lons[:3]), atol=1e-4)
+    assert np.isnan(values[3])
+    # The first two points share a chunk
+    assert read_stats()['chunksDecompressed'] == 3
+    assert read_stats()['bytesDecompressed'] == 3 * CHUNK_BYTES
+
+    reset_read_stats()
+    np.testing.assert_array_equal(cache.read_points(path, lats, lons), values)
+    assert read_stats() == {'chunksDecompressed': 0, 'bytesDecompressed': 0, 'chunkHits': 3}
+    assert cache.info()['hits'] == 3 and cache.info()['misses'] == 3
+
+
+def test_decoded_chunks_stay_within_the_byte_budget(tmp_path):
+    path = write_sla(tmp_path / "sla.nc")
+    cache = ChunkCache(max_bytes=2 * CHUNK_BYTES)
+
+    for lon in (5.0, 85.0, 165.0, 245.0):
+        cache.read_points(path, [-85.0], [lon])
+
+    assert cache.info()['chunks'] == 2
+    assert cache.info()['bytes'] <= 2 * CHUNK_BYTES
+    # The oldest chunk was evicted, the newest is still cached
+    reset_read_stats()
+    cache.read_points(path, [-85.0, -85.0], [245.0, 5.0])
+    assert read_stats()['chunkHits'] == 1 and read_stats()['chunksDecompressed'] == 1
+
+
+def test_rewritten_file_is_reopened(tmp_path):
+    path = write_sla(tmp_path / "sla.nc")
+    cache = ChunkCache(max_bytes=1 << 20)
+    cache.read_points(path, [15.0], [25.0])
+
+    # Downloads replace the file; HDF5 refuses to rewrite one that is open
+    os.replace(write_sla(tmp_path / "new.nc", offset=0.5), path)
+    bump_mtime(path)
+    value = cache.read_points(path, [15.0], [25.0])
+
+    np.testing.assert_allclose(value, expected(15.0, 25.0, 0.5), atol=1e-4)
+    assert cache.info()['openFiles'] == 1
+
+
+def test_contiguous_variables_are_read_in_blocks(tmp_path):
+    path = write_sla(tmp_path / "sla.nc", chunked=False)
+    cache = ChunkCache(max_bytes=1 << 20)
+
+    reset_read_stats()
+    values = cache.read_points(path, [-85.0, 85.0], [5.0, 355.0])
+
+    np.testing.assert_allclose(values, expected(np.array([-85.0, 85.0]), np.array([5.0, 355.0])), atol=1e-4)
+    # The whole 18 x 36 grid fits in one CONTIGUOUS_BLOCK
+    assert CONTIGUOUS_BLOCK[1] >= len(LATITUDE) and CONTIGUOUS_BLOCK[2] >= len(LONGITUDE)
+    assert read_stats()['chunksDecompressed'] == 1
+
+
+def test_tiles_for_months_outside_the_store_read_the_chunks(client, tmp_path, monkeypatch):
+    import app as backend_app
+
+    monkeypatch.setattr(backend_app, 'DATA_DIR', tmp_path)
+    write_sla(tmp_path / "dt_global_twosat_phy_l4_201905_vDT2021-M01.nc")
+
+    reset_read_stats()
+    response = client.get('/api/slr-tiles/1/0/0.png?year=2019&month=5')
+
+    assert response.status_code == 200 and response.mimetype == 'image/png'
+    assert read_stats()['chunksDecompressed'] > 0
+
+
+@pytest.mark.parametrize('query', ['year=abc', 'month=1.5', 'vmin=low', 'vmax='])
+def test_malformed_tile_parameters_return_400(client, query):
+    response = client.get(f'/api/slr-tiles/1/0/0.png?{query}')
+
+    assert response.status_code == 400
+    assert response.get_json()['error'] == 'Invalid parameters'
@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+
+import ocean_snap
+from synthetic_store import LATITUDE, LONGITUDE
+
+
+@pytest.fixture
+def ocean_index(store_dir, monkeypatch):
+    """Land at longitudes 35, 45 and 185: snapping west, east and west across 180"""
+    rows, cols = np.indices((len(LATITUDE), len(LONGITUDE)))
+    cols[:, 3], cols[:, 4], cols[:, 18] = 2, 5, 17
+    np.savez(
+        ocean_snap.OCEAN_INDEX_PATH, latitude=LATITUDE, longitude=LONGITUDE,
+        nearest_row=rows.astype('int16'), nearest_col=cols.astype('int16')
+    )
+    # Cells are 10 degrees apart, further than the default snap limit
+    monkeypatch.setattr(ocean_snap, 'MAX_SNAP_KM', 2000.0)
+    return ocean_snap.get_ocean_index()
+
+
+def test_ocean_points_are_read_where_they_are(ocean_index):
+    lat, lon, cell = ocean_snap.snap_to_ocean(5.0, 25.5)
+
+    assert (lat, lon) == (5.0, 25.0)
+    assert not cell['snapped'] and cell['distanceKm'] == pytest.approx(55.4, abs=0.1)
+
+
+@pytest.mark.parametrize('lon, cell_lon', [(36.0, 25.0), (44.0, 55.0), (-174.0, 175.0), (186.0, 175.0)])
+def test_land_points_snap_to_the_nearest_ocean_cell(ocean_index, lon, cell_lon):
+    lat, read_lon, cell = ocean_snap.snap_to_ocean(5.0, lon)
+
+    assert (lat, read_lon) == (5.0, cell_lon)
+    assert cell['snapped']
+    assert cell['distanceKm'] == pytest.approx(ocean_snap.haversine_km(5.0, lon, 5.0, cell_lon), abs=0.01)
+
+
+def test_points_beyond_the_snap_limit_stay_put(ocean_index, monkeypatch):
+    monkeypatch.setattr(ocean_snap, 'MAX_SNAP_KM', 100.0)
+
+    assert ocean_snap.snap_to_ocean(5.0, 36.0) == (5.0, 36.0, None)
+
+
+def test_missing_index_disables_snapping(store_dir):
+    assert ocean_snap.get_ocean_index() is None
+    assert ocean_snap.snap_to_ocean(5.0, 36.0) == (5.0, 36.0, None)
+    assert ocean_snap.ocean_index_version() == "none"
+
+
+def test_sea_level_is_read_at_the_snapped_cell(client, ocean_index):
+    body = client.get('/api/sea-level?lat=5&lon=36&year=2020&month=2').get_json()
+
+    # The synthetic cell at longitude 25, latitude 5 holds 25 * 1000 + 5 + 90 mm
+    assert round(body['seaLevel']) == 25095
+    assert body['gridCell']['snapped'] and body['gridCell']['lon'] == 25.0
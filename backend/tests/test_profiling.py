@@ -0,0 +1,71 @@
+import json
+import time
+
+import pytest
+from flask import Flask
+
+import profiling
+
+
+@pytest.fixture
+def profiled_app(tmp_path, monkeypatch):
+    monkeypatch.setattr(profiling, 'PROFILING', True)
+    monkeypatch.setattr(profiling, 'PROFILE_DIR', tmp_path / "profiles")
+    monkeypatch.setattr(profiling, 'PROFILE_SAMPLE_RATE', 0.0)
+    monkeypatch.setattr(profiling, 'PROFILE_SLOW_MS', 10000.0)
+
+    app = Flask(__name__)
+
+    @app.route('/busy')
+    def busy_endpoint():
+        end = time.perf_counter() + 0.1
+        while time.perf_counter() < end:
+            pass
+        return 'done'
+
+    profiling.init_profiling(app)
+    return app
+
+
+def logged(tmp_path) -> list:
+    path = tmp_path / "profiles" / "requests.jsonl"
+    return [json.loads(line) for line in path.read_text().splitlines()] if path.exists() else []
+
+
+def test_disabled_profiling_registers_no_hooks(monkeypatch):
+    monkeypatch.setattr(profiling, 'PROFILING', False)
+    app = Flask(__name__)
+
+    profiling.init_profiling(app)
+
+    assert not app.before_request_funcs and not app.after_request_funcs
+
+
+def test_requested_profile_is_written_as_folded_stacks(profiled_app, tmp_path):
+    response = profiled_app.test_client().get('/busy?x=1', headers={profiling.PROFILE_HEADER: '1'})
+
+    name = response.headers['X-Profile-File']
+    stacks = (tmp_path / "profiles" / name).read_text().splitlines()
+    assert any('busy_endpoint' in line.rsplit(' ', 1)[0] for line in stacks)
+    assert all(int(line.rsplit(' ', 1)[1]) > 0 for line in stacks)
+    [record] = logged(tmp_path)
+    assert record['profile'] == name and record['args'] == {'x': ['1']} and not record['slow']
+
+
+def test_slow_requests_are_logged_without_a_profile(profiled_app, tmp_path, monkeypatch):
+    monkeypatch.setattr(profiling, 'PROFILE_SLOW_MS', 50.0)
+
+    response = profiled_app.test_client().get('/busy')
+
+    assert 'X-Profile-File' not in response.headers
+    [record] = logged(tmp_path)
+    assert record['slow'] and record['profile'] is None and record['durationMs'] >= 50.0
+    assert record['endpoint'] == 'busy_endpoint' and record['status'] == 200
+
+
+def test_fast_unprofiled_requests_leave_no_trace(profiled_app, tmp_path):
+    response = profiled_app.test_client().get('/busy')
+
+    assert response.status_code == 200
+    assert logged(tmp_path) == []
+    assert not (tmp_path / "profiles").exists()
@@ -0,0 +1,51 @@
+from collections import namedtuple
+
+import numpy as np
+import pytest
+
+import flood
+import sla_store
+from shared_data import preload_shared_data
+
+DiskUsage = namedtuple('DiskUsage', 'total used free')
+
+
+@pytest.fixture(autouse=True)
+def flood_engine(monkeypatch):
+    # The preload builds the engine's reference grid for this store
+    monkeypatch.setattr(flood, '_engine', flood.FloodEngine())
+
+
+def test_preload_warms_the_products_without_sharing(store_dir):
+    summary = preload_shared_data()
+
+    assert summary['store'] and not summary['sharedCube']
+    # Only clim_mean exists in the synthetic store
+    assert summary['productBytes'] == np.load(store_dir / "clim_mean.npy").nbytes
+    assert not summary['oceanIndex']
+
+
+def test_preload_maps_the_shared_copy(store_dir, tmp_path, monkeypatch):
+    shm = tmp_path / "shm"
+    monkeypatch.setattr(sla_store, 'SLA_SHARED_CUBE_DIR', str(shm))
+
+    summary = preload_shared_data()
+    store = sla_store.get_store(share=False)
+
+    assert summary['sharedCube'] and store.shared
+    copy = sla_store.shared_cube_path(store_dir, store.data_version)
+    assert copy.read_bytes() == (store_dir / "sla_cube.f32").read_bytes()
+    assert store.cube_path == copy
+    assert round(store.value_mm(2020, 2, 15, -175)) == 185105
+
+
+def test_preload_falls_back_to_the_disk_cube_without_room(store_dir, tmp_path, monkeypatch):
+    shm = tmp_path / "shm"
+    monkeypatch.setattr(sla_store, 'SLA_SHARED_CUBE_DIR', str(shm))
+    monkeypatch.setattr(sla_store.shutil, 'disk_usage', lambda path: DiskUsage(1024, 1024, 0))
+
+    summary = preload_shared_data()
+
+    assert summary['store'] and not summary['sharedCube']
+    assert not list(shm.glob("*.f32"))
+    assert sla_store.get_store(share=False).cube_path == store_dir / "sla_cube.f32"
@@ -0,0 +1,103 @@
+import json
+
+import numpy as np
+import pytest
+
+import app as backend_app
+import sla_store
+from synthetic_store import LATITUDE, LONGITUDE, decode_cells
+
+
+def get_grid(client, **params):
+    params = {'year': 2020, 'month': 1, **params}
+    response = client.get('/api/sla-grid', query_string=params)
+    assert response.status_code == 200, response.get_json()
+    info = json.loads(response.headers['X-Grid-Info'])
+    values = np.frombuffer(response.data, dtype='<f4').reshape(info['shape'])
+    lats = info['lat'][0] + info['lat'][1] * np.arange(info['shape'][0])
+    lons = info['lon'][0] + info['lon'][1] * np.arange(info['shape'][1])
+    return values, lats, lons
+
+
+def test_globe_is_returned_from_minus_180_north_up(client):
+    values, lats, lons = get_grid(client)
+
+    assert values.shape == (len(LATITUDE), len(LONGITUDE))
+    assert lons[0] == -175.0 and lons[-1] == 175.0
+    assert lats[0] == 85.0 and lats[-1] == -85.0
+    cell_lons, cell_lats = decode_cells(values)
+    np.testing.assert_array_equal(cell_lons[0], np.mod(lons, 360.0))
+    np.testing.assert_array_equal(cell_lats[:, 0], lats)
+
+
+def test_bbox_wraps_across_the_antimeridian(client):
+    values, lats, lons = get_grid(client, bbox='162,-18,-162,18')
+
+    np.testing.assert_array_equal(lons, [165.0, 175.0, 185.0, 195.0])
+    cell_lons, cell_lats = decode_cells(values)
+    np.testing.assert_array_equal(cell_lons[0], [165.0, 175.0, 185.0, 195.0])
+    np.testing.assert_array_equal(cell_lats[:, 0], [15.0, 5.0, -5.0, -15.0])
+    np.testing.assert_array_equal(cell_lats[:, 0], lats)
+
+
+def test_stride_keeps_every_nth_cell(client):
+    values, lats, lons = get_grid(client, stride=3)
+
+    assert values.shape == (6, 12)
+    cell_lons, cell_lats = decode_cells(values)
+    np.testing.assert_array_equal(cell_lons[0], np.mod(lons, 360.0))
+    np.testing.assert_array_equal(cell_lats[:, 0], lats)
+
+
+def test_uint8_quantization_round_trips(client):
+    response = client.get('/api/sla-grid', query_string={'year': 2020, 'month': 1, 'dtype': 'uint8'})
+    info = json.loads(response.headers['X-Grid-Info'])
+    raw = np.frombuffer(response.data, dtype='uint8').reshape(info['shape'])
+    values, _, _ = get_grid(client)
+
+    decoded = raw * info['scale'] + info['offset']
+    assert np.abs(decoded - values).max() <= info['scale']
+
+
+@pytest.mark.parametrize("params", [
+    {'year': 'abc'}, {'stride': 'x'}, {'vmin': 'low'}, {'bbox': '1,2,3'}, {'bbox': 'a,b,c,d'},
+    {'bbox': '0,10,10,0'}, {'dtype': 'int64'}, {'stride': 0}, {'stride': -2}, {'stride': 100000}
+])
+def test_malformed_parameters_return_400(client, params):
+    response = client.get('/api/sla-grid', query_string={'year': 2020, 'month': 1, **params})
+
+    assert response.status_code == 400
+    assert 'error' in response.get_json()
+
+
+def test_stride_up_to_the_smaller_grid_dimension(client):
+    values, _, _ = get_grid(client, stride=len(LATITUDE))
+    response = client.get('/api/sla-grid', query_string={'year': 2020, 'month': 1, 'stride': len(LATITUDE) + 1})
+
+    assert values.shape == (1, 2)
+    assert response.status_code == 400
+    assert response.get_json()['error'] == 'Invalid stride'
+
+
+def test_too_many_cells_is_rejected_before_reading(client, monkeypatch):
+    def no_read(*args, **kwargs):
+        raise AssertionError("window_mm read a slab over the cap")
+
+    monkeypatch.setattr(backend_app, 'MAX_GRID_CELLS', 100)
+    monkeypatch.setattr(sla_store.SlaStore, 'window_mm', no_read)
+    response = client.get('/api/sla-grid?year=2020&month=1')
+
+    assert response.status_code == 400
+    assert response.get_json()['error'] == 'Grid too large'
+
+
+def test_stride_brings_a_grid_under_the_cap(client, monkeypatch):
+    monkeypatch.setattr(backend_app, 'MAX_GRID_CELLS', 100)
+
+    values, _, _ = get_grid(client, stride=4)
+
+    assert values.size <= 100
+
+
+def test_missing_month_is_404(client):
+    assert client.get('/api/sla-grid?year=1990&month=1').status_code == 404
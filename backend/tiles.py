@@ -0,0 +1,109 @@
+"""
+Raster tile helpers for the grid-backed tile endpoints
+Web Mercator tile geometry, colour ramps and a NumPy/zlib PNG encoder, so tiles
+can be rendered from the memory-mapped store without an imaging library.
+"""
+
+import struct
+import zlib
+
+import numpy as np
+
+TILE_SIZE = 256
+
+EARTH_RADIUS_M = 6378137.0
+
+# Diverging ramp for signed fields (blue below zero, red above)
+DIVERGING_STOPS = [
+    (-1.0, (5, 48, 97)),
+    (-0.5, (67, 147, 195)),
+    (0.0, (247, 247, 247)),
+    (0.5, (214, 96, 77)),
+    (1.0, (103, 0, 31)),
+]
+
+# Sequential ramp for magnitudes
+SEQUENTIAL_STOPS = [
+    (0.0, (255, 255, 204)),
+    (0.25, (161, 218, 180)),
+    (0.5, (65, 182, 196)),
+    (0.75, (44, 127, 184)),
+    (1.0, (37, 52, 148)),
+]
+
+# Ramp for flood depth (light to dark red)
+FLOOD_STOPS = [
+    (0.0, (254, 224, 210)),
+    (0.5, (251, 106, 74)),
+    (1.0, (165, 15, 21)),
+]
+
+
+def tile_lonlat(z: int, x: int, y: int, size: int = TILE_SIZE) -> tuple:
+    """Longitude and latitude of every pixel centre of an XYZ tile, as (size, size) arrays"""
+    n = 2 ** z
+    pixels = (np.arange(size) + 0.5) / size
+    lon = (x + pixels) / n * 360.0 - 180.0
+    merc_y = np.pi * (1 - 2 * (y + pixels) / n)
+    lat = np.degrees(np.arctan(np.sinh(merc_y)))
+    lons, lats = np.meshgrid(lon, lat)
+    return lons, lats
+
+
+def tile_range(bounds: tuple, z: int) -> tuple:
+    """Inclusive x and y tile ranges covering (min_lon, min_lat, max_lon, max_lat)"""
+    min_lon, min_lat, max_lon, max_lat = bounds
+    n = 2 ** z
+
+    def tile_x(lon):
+        return int(np.clip((lon + 180.0) / 360.0 * n, 0, n - 1))
+
+    def tile_y(lat):
+        lat = np.radians(np.clip(lat, -85.0511, 85.0511))
+        return int(np.clip((1 - np.log(np.tan(lat) + 1 / np.cos(lat)) / np.pi) / 2 * n, 0, n - 1))
+
+    return (tile_x(min_lon), tile_x(max_lon)), (tile_y(max_lat), tile_y(min_lat))
+
+
+def pixel_size_m(z: int, lats: np.ndarray, size: int = TILE_SIZE) -> np.ndarray:
+    """Ground size in meters of a tile pixel at the given latitudes"""
+    return 2 * np.pi * EARTH_RADIUS_M / (size * 2 ** z) * np.cos(np.radians(lats))
+
+
+def colorize(values: np.ndarray, vmin: float, vmax: float, stops=DIVERGING_STOPS, alpha: int = 200) -> np.ndarray:
+    """
+    Map values to RGBA through a colour ramp
+    Stops are given on a -1..1 (diverging) or 0..1 (sequential) scale spanning vmin..vmax.
+    NaN becomes transparent.
+    """
+    positions = np.array([p for p, _ in stops], dtype='float64')
+    colors = np.array([c for _, c in stops], dtype='float64')
+    lo, hi = positions[0], positions[-1]
+    scaled = lo + (np.asarray(values, dtype='float64') - vmin) / (vmax - vmin) * (hi - lo)
+    valid = np.isfinite(scaled)
+    scaled = np.where(valid, np.clip(scaled, lo, hi), lo)
+
+    rgba = np.zeros(scaled.shape + (4,), dtype='uint8')
+    for channel in range(3):
+        rgba[..., channel] = np.interp(scaled, positions, colors[:, channel]).astype('uint8')
+    rgba[..., 3] = np.where(valid, alpha, 0)
+    return rgba
+
+
+def encode_png(rgba: np.ndarray) -> bytes:
+    """Encode an (h, w, 4) uint8 array as a PNG"""
+    height, width = rgba.shape[:2]
+    # Filter type 0 (none) in front of every scanline
+    raw = np.zeros((height, width * 4 + 1), dtype='uint8')
+    raw[:, 1:] = rgba.reshape(height, width * 4)
+
+    def chunk(tag: bytes, data: bytes) -> bytes:
+        return struct.pack('>I', len(data)) + tag + data + struct.pack('>I', zlib.crc32(tag + data) & 0xFFFFFFFF)
+
+    header = struct.pack('>IIBBBBB', width, height, 8, 6, 0, 0, 0)
+    return (
+        b'\x89PNG\r\n\x1a\n'
+        + chunk(b'IHDR', header)
+        + chunk(b'IDAT', zlib.compress(raw.tobytes(), 6))
+        + chunk(b'IEND', b'')
+    )
@@ -0,0 +1,199 @@
+"""
+Seasonal Climatology and Anomaly Decomposition
+
+This module derives, for every SLA grid cell, the monthly climatology (mean
+and standard deviation per calendar month) and the deseasonalized long-term
+trend across the whole archive.
+
+The archive is streamed one month at a time through per-calendar-month
+Welford accumulators of (time, SLA): count, means, M2 of SLA, M2 of time and
+their co-moment. The climatology is the per-month mean, and the
+deseasonalized trend is the pooled within-month slope
+
+    trend = sum_m C_ty[m] / sum_m M2_t[m]
+
+which is the least-squares slope of the anomalies after removing each
+calendar month's mean. Only one calendar month's accumulators (six grids)
+are touched per input month, and new months can be folded into the saved
+accumulators without re-reading the archive.
+
+Outputs are written into the consolidated store next to the cube:
+- clim_state.npy: accumulators (12, 6, lat, lon) float64
+- clim_mean.npy / clim_std.npy: (12, lat, lon) float32 in millimeters
+- anomaly_trend.npy: (lat, lon) float32 deseasonalized trend in mm/year
+- climatology.json: months folded into the accumulators (with their source
+  file signatures) and the data version
+"""
+
+import argparse
+import json
+import logging
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+
+from sla_ingest import DEFAULT_STORE_DIR, _save_atomic, load_manifest, open_cube
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Accumulator layout along axis 1 of clim_state.npy
+COUNT, MEAN_T, MEAN_Y, M2_Y, M2_T, C_TY = range(6)
+
+def decimal_year(month_key: str) -> float:
+    """Mid-month time of a 'YYYY-MM' key in years."""
+    year, month = int(month_key[:4]), int(month_key[5:7])
+    return year + (month - 0.5) / 12.0
+
+def welford_update(state: np.ndarray, t: float, y: np.ndarray) -> None:
+    """
+    Fold one month of values into a calendar month's accumulators in place.
+
+    Args:
+        state: (6, lat, lon) accumulators for one calendar month
+        t: Time of the month in decimal years
+        y: (lat, lon) SLA values in millimeters, NaN where missing
+    """
+    valid = ~np.isnan(y)
+    count = state[COUNT]
+    count[valid] += 1.0
+    n = np.where(valid, count, 1.0)
+
+    dt = np.where(valid, t - state[MEAN_T], 0.0)
+    dy = np.where(valid, y - state[MEAN_Y], 0.0)
+    state[MEAN_T] += dt / n
+    state[MEAN_Y] += dy / n
+    # Second moments use the pre- and post-update deviations
+    state[M2_Y] += dy * np.where(valid, y - state[MEAN_Y], 0.0)
+    state[M2_T] += dt * np.where(valid, t - state[MEAN_T], 0.0)
+    state[C_TY] += dt * np.where(valid, y - state[MEAN_Y], 0.0)
+
+def derive_products(state: np.ndarray) -> tuple:
+    """
+    Climatology and deseasonalized trend from the accumulators.
+
+    Reads one calendar month of accumulators at a time, so memory stays at a
+    few grids even when state is a memory-mapped file.
+
+    Args:
+        state: (12, 6, lat, lon) accumulators
+
+    Returns:
+        Tuple of (clim_mean, clim_std, anomaly_trend) float32 arrays
+    """
+    shape = state.shape[2:]
+    clim_mean = np.full((12,) + shape, np.nan, dtype='float32')
+    clim_std = np.full((12,) + shape, np.nan, dtype='float32')
+    sxy = np.zeros(shape)
+    sxx = np.zeros(shape)
+    for month in range(12):
+        month_state = np.asarray(state[month])
+        count = month_state[COUNT]
+        clim_mean[month] = np.where(count > 0, month_state[MEAN_Y], np.nan)
+        clim_std[month] = np.where(
+            count > 1, np.sqrt(month_state[M2_Y] / np.maximum(count - 1, 1)), np.nan
+        )
+        sxy += month_state[C_TY]
+        sxx += month_state[M2_T]
+    trend = np.where(sxx > 0, sxy / np.where(sxx > 0, sxx, 1.0), np.nan)
+    return clim_mean, clim_std, trend.astype('float32')
+
+def update_climatology(
+    store_dir: Path = DEFAULT_STORE_DIR,
+    rebuild: bool = False,
+    manifest: Optional[dict] = None
+) -> Optional[dict]:
+    """
+    Bring the climatology products up to date with the consolidated store.
+
+    Months already folded into the saved accumulators are skipped. If any of
+    them were replaced in the store since, the accumulators are rebuilt.
+
+    Args:
+        store_dir: Consolidated store written by sla_ingest.py
+        rebuild: Recompute from scratch
+        manifest: Store manifest to use instead of the one on disk (lets the
+            ingest update products before publishing a new manifest)
+
+    Returns:
+        The climatology metadata, or None without a store
+    """
+    store_dir = Path(store_dir)
+    if manifest is None:
+        manifest = load_manifest(store_dir)
+    if manifest is None:
+        logger.warning(f"No consolidated store in {store_dir}; run sla_ingest.py first")
+        return None
+
+    meta_path = store_dir / "climatology.json"
+    state_path = store_dir / "clim_state.npy"
+    meta = None
+    if not rebuild and meta_path.exists() and state_path.exists():
+        with open(meta_path) as f:
+            meta = json.load(f)
+        # Accumulators cannot drop a month, so replaced source files force a rebuild
+        replaced = [
+            key for key, signature in meta['months'].items()
+            if manifest['files'].get(key) != signature
+        ]
+        if replaced:
+            logger.info("Months already in the climatology changed, rebuilding it")
+            meta = None
+
+    shape = tuple(manifest['shape'])
+    if meta is None:
+        state = np.lib.format.open_memmap(state_path, mode='w+', dtype='float64', shape=(12, 6) + shape)
+        state[:] = 0.0
+        meta = {'months': {}}
+    else:
+        state = np.load(state_path, mmap_mode='r+')
+
+    folded = set(meta['months'])
+    pending: List[str] = [key for key in manifest['months'] if key not in folded]
+    if not pending and meta.get('data_version') == manifest['data_version']:
+        logger.info("Climatology is up to date")
+        return meta
+
+    cube = open_cube(store_dir, manifest)
+    month_index = {key: i for i, key in enumerate(manifest['months'])}
+
+    # One calendar month's accumulators in memory at a time
+    for calendar_month in range(1, 13):
+        keys = [key for key in pending if int(key[5:7]) == calendar_month]
+        if not keys:
+            continue
+        month_state = np.array(state[calendar_month - 1])
+        for key in keys:
+            values = np.asarray(cube[month_index[key]], dtype='float64') * 1000.0
+            welford_update(month_state, decimal_year(key), values)
+        state[calendar_month - 1] = month_state
+    state.flush()
+    logger.info(f"Folded {len(pending)} months into the climatology")
+
+    clim_mean, clim_std, trend = derive_products(state)
+    _save_atomic(store_dir / "clim_mean.npy", clim_mean)
+    _save_atomic(store_dir / "clim_std.npy", clim_std)
+    _save_atomic(store_dir / "anomaly_trend.npy", trend)
+
+    meta = {
+        'months': {key: manifest['files'][key] for key in sorted(folded | set(pending))},
+        'data_version': manifest['data_version'],
+        'units': {'clim_mean': 'mm', 'clim_std': 'mm', 'anomaly_trend': 'mm/year'}
+    }
+    with open(meta_path, 'w') as f:
+        json.dump(meta, f)
+    return meta
+
+def main():
+    """Main processing function."""
+    parser = argparse.ArgumentParser(description="Precompute SLA monthly climatology and deseasonalized trend.")
+    parser.add_argument('--store-dir', default=str(DEFAULT_STORE_DIR), help='Consolidated store directory')
+    parser.add_argument('--rebuild', action='store_true', help='Recompute from scratch')
+    args = parser.parse_args()
+
+    update_climatology(Path(args.store_dir), rebuild=args.rebuild)
+
+if __name__ == "__main__":
+    main()
@@ -4,26 +4,282 @@ Digital Elevation Model (DEM) Processing
 This module handles the processing of coastal elevation data for the Coastal Flood Viewer.
 It converts DEM data from Google Earth Engine assets into web-optimized formats.
 
-TODO: Implement actual DEM processing pipeline
+Local DEM GeoTIFFs are reprojected and resampled in block windows across a
+process pool and written as tiled, overviewed, compressed Cloud Optimized
+GeoTIFFs. Peak memory is bounded by the window size, not the DEM size.
+
+Tile pyramids are rendered from the COG at the highest zoom level and
+every lower level is built from the level below.
+
+TODO: Implement remaining DEM processing pipeline
 - Export DEM from GEE asset users/amanaryya1/coastal-dem-files
-- Convert to Cloud Optimized GeoTIFFs (COGs)
-- Generate tile pyramids for web visualization
 - Upload to GCS bucket for CDN distribution
 """
 
 import os
+import argparse
 import logging
-from typing import Optional, Tuple
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from functools import partial
+from typing import Iterator, Optional, Tuple
 from pathlib import Path
 
+import numpy as np
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Nodata value written to processed DEMs
+DEM_NODATA = -9999.0
+
+# Per-process handle on the source DEM, opened once by _init_reproject_worker
+_worker_src = None
+
+def _init_reproject_worker(src_path: str) -> None:
+    """Open the source DEM once per worker process."""
+    global _worker_src
+    import rasterio
+    _worker_src = rasterio.open(src_path)
+
+def _reproject_window(
+    window: Tuple[int, int, int, int],
+    dst_transform,
+    dst_crs: str,
+    resampling: str
+) -> Tuple[Tuple[int, int, int, int], Optional[np.ndarray]]:
+    """
+    Reproject the source pixels covering one output window.
+    
+    Only the source window that overlaps the output window (plus a small
+    resampling margin) is read, so memory stays proportional to the window.
+    
+    Args:
+        window: Output window as (col_off, row_off, width, height)
+        dst_transform: Affine transform of the full output grid
+        dst_crs: Output coordinate reference system
+        resampling: Name of a rasterio Resampling method
+    
+    Returns:
+        The window and its float32 pixels, or None if it has no source data
+    """
+    from rasterio.enums import Resampling
+    from rasterio.warp import reproject, transform_bounds
+    from rasterio.windows import Window, bounds as window_bounds, from_bounds
+    from rasterio.windows import transform as window_transform
+    
+    src = _worker_src
+    col_off, row_off, width, height = window
+    dst_window = Window(col_off, row_off, width, height)
+    
+    # Locate the source pixels under this output window
+    west, south, east, north = transform_bounds(
+        dst_crs, src.crs, *window_bounds(dst_window, dst_transform), densify_pts=21
+    )
+    src_window = from_bounds(west, south, east, north, src.transform)
+    src_window = src_window.round_offsets(op='floor').round_lengths(op='ceil')
+    margin = 2
+    src_window = Window(
+        src_window.col_off - margin, src_window.row_off - margin,
+        src_window.width + 2 * margin, src_window.height + 2 * margin
+    )
+    try:
+        src_window = src_window.intersection(Window(0, 0, src.width, src.height))
+    except Exception:
+        return window, None
+    
+    src_data = src.read(1, window=src_window, masked=True).astype('float32')
+    if src_data.mask.all():
+        return window, None
+    src_data = src_data.filled(DEM_NODATA)
+    
+    dst_data = np.full((height, width), DEM_NODATA, dtype='float32')
+    reproject(
+        source=src_data,
+        destination=dst_data,
+        src_transform=window_transform(src_window, src.transform),
+        src_crs=src.crs,
+        src_nodata=DEM_NODATA,
+        dst_transform=window_transform(dst_window, dst_transform),
+        dst_crs=dst_crs,
+        dst_nodata=DEM_NODATA,
+        resampling=Resampling[resampling]
+    )
+    if (dst_data == DEM_NODATA).all():
+        return window, None
+    return window, dst_data
+
+def _iter_windows(
+    width: int,
+    height: int,
+    window_size: int
+) -> Iterator[Tuple[int, int, int, int]]:
+    """Yield (col_off, row_off, width, height) windows covering a grid."""
+    for row_off in range(0, height, window_size):
+        for col_off in range(0, width, window_size):
+            yield (
+                col_off, row_off,
+                min(window_size, width - col_off),
+                min(window_size, height - row_off)
+            )
+
+def _overview_factors(width: int, height: int, block_size: int) -> list:
+    """Overview decimation factors down to roughly one block."""
+    factors = []
+    factor = 2
+    while max(width, height) / factor >= block_size / 2:
+        factors.append(factor)
+        factor *= 2
+    return factors
+
+def convert_dem_to_cog(
+    src_path: str,
+    output_path: str,
+    dst_crs: str = "EPSG:3857",
+    resolution: Optional[float] = None,
+    region: Optional[Tuple[float, float, float, float]] = None,
+    block_size: int = 512,
+    window_size: int = 2048,
+    workers: Optional[int] = None,
+    resampling: str = "bilinear",
+    compress: str = "DEFLATE"
+) -> str:
+    """
+    Reproject a local DEM GeoTIFF into a Cloud Optimized GeoTIFF.
+    
+    Output windows are reprojected in parallel and written as they complete,
+    with at most two windows per worker in flight. Overviews are then built
+    and the result is copied into COG layout (tiled, compressed, overviews
+    stored after the full-resolution data).
+    
+    Args:
+        src_path: Path to the source DEM GeoTIFF
+        output_path: Path of the COG to write
+        dst_crs: Output coordinate reference system
+        resolution: Output pixel size in dst_crs units (None keeps the source resolution)
+        region: Optional bounding box as (west, south, east, north) in degrees
+        block_size: Internal tile size of the COG
+        window_size: Side length of the windows processed by each worker
+        workers: Number of worker processes (None uses all cores)
+        resampling: Name of a rasterio Resampling method
+        compress: GeoTIFF compression codec
+    
+    Returns:
+        Path to the COG file
+    """
+    import rasterio
+    from rasterio.enums import Resampling
+    from rasterio.shutil import copy as rio_copy
+    from rasterio.transform import from_origin
+    from rasterio.warp import calculate_default_transform, transform_bounds
+    
+    # Keep windows aligned with the internal tiling
+    window_size = max(block_size, window_size // block_size * block_size)
+    
+    with rasterio.open(src_path) as src:
+        dst_transform, width, height = calculate_default_transform(
+            src.crs, dst_crs, src.width, src.height, *src.bounds,
+            resolution=resolution
+        )
+        if region is not None:
+            # Crop the output grid to the requested region
+            west, south, east, north = transform_bounds("EPSG:4326", dst_crs, *region)
+            res_x, res_y = dst_transform.a, -dst_transform.e
+            col_start = max(0, int((west - dst_transform.c) // res_x))
+            row_start = max(0, int((dst_transform.f - north) // res_y))
+            col_stop = min(width, int(np.ceil((east - dst_transform.c) / res_x)))
+            row_stop = min(height, int(np.ceil((dst_transform.f - south) / res_y)))
+            if col_stop <= col_start or row_stop <= row_start:
+                raise ValueError(f"Region {region} does not intersect {src_path}")
+            dst_transform = from_origin(
+                dst_transform.c + col_start * res_x,
+                dst_transform.f - row_start * res_y,
+                res_x, res_y
+            )
+            width, height = col_stop - col_start, row_stop - row_start
+    
+    logger.info(f"Reprojecting {src_path} to {dst_crs} ({width}x{height} pixels)")
+    
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = output_path.with_suffix(".tmp.tif")
+    
+    profile = {
+        'driver': 'GTiff',
+        'dtype': 'float32',
+        'count': 1,
+        'width': width,
+        'height': height,
+        'crs': dst_crs,
+        'transform': dst_transform,
+        'nodata': DEM_NODATA,
+        'tiled': True,
+        'blockxsize': block_size,
+        'blockysize': block_size,
+        'BIGTIFF': 'IF_SAFER'
+    }
+    
+    workers = workers or os.cpu_count() or 1
+    windows = _iter_windows(width, height, window_size)
+    written = 0
+    
+    with rasterio.Env(GDAL_CACHEMAX=256):
+        with rasterio.open(tmp_path, 'w', **profile) as dst:
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_reproject_worker,
+                initargs=(str(src_path),)
+            ) as pool:
+                pending = set()
+                exhausted = False
+                while pending or not exhausted:
+                    # Bound the number of windows held in memory
+                    while not exhausted and len(pending) < 2 * workers:
+                        window = next(windows, None)
+                        if window is None:
+                            exhausted = True
+                            break
+                        pending.add(pool.submit(
+                            _reproject_window, window, dst_transform, dst_crs, resampling
+                        ))
+                    if not pending:
+                        break
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        (col_off, row_off, w, h), data = future.result()
+                        if data is not None:
+                            dst.write(data, 1, window=((row_off, row_off + h), (col_off, col_off + w)))
+                            written += 1
+            
+            logger.info(f"Wrote {written} windows with data, building overviews")
+            factors = _overview_factors(width, height, block_size)
+            if factors:
+                dst.build_overviews(factors, Resampling.average)
+                dst.update_tags(ns='rio_overview', resampling='average')
+        
+        # Copy into COG layout: tiled, compressed, overviews after full resolution
+        rio_copy(
+            str(tmp_path), str(output_path),
+            driver='GTiff',
+            tiled=True,
+            blockxsize=block_size,
+            blockysize=block_size,
+            compress=compress,
+            predictor=3,
+            copy_src_overviews=True,
+            BIGTIFF='IF_SAFER'
+        )
+    
+    tmp_path.unlink()
+    logger.info(f"COG written: {output_path}")
+    return str(output_path)
+
 def process_dem_asset(
     asset_id: str = "users/amanaryya1/coastal-dem-files",
     output_dir: str = "output/dem",
-    region: Optional[Tuple[float, float, float, float]] = None
+    region: Optional[Tuple[float, float, float, float]] = None,
+    source_path: Optional[str] = None,
+    **cog_options
 ) -> str:
     """
     Process DEM asset from Google Earth Engine.
@@ -32,57 +288,404 @@ def process_dem_asset(
         asset_id: GEE asset ID for the DEM data
         output_dir: Directory to save processed files
         region: Bounding box as (west, south, east, north)
+        source_path: Local DEM GeoTIFF to convert instead of the GEE asset
+        **cog_options: Extra arguments passed to convert_dem_to_cog
     
     Returns:
         Path to the processed COG file
     """
+    output_path = Path(output_dir) / "coastal_dem.tif"
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    
+    if source_path is not None:
+        logger.info(f"Processing local DEM: {source_path}")
+        return convert_dem_to_cog(source_path, str(output_path), region=region, **cog_options)
+    
     logger.info(f"Processing DEM asset: {asset_id}")
     
     # TODO: Implement GEE export
     # 1. Initialize GEE client
     # 2. Load asset
     # 3. Export to GeoTIFF
-    # 4. Convert to COG
+    # 4. Convert with convert_dem_to_cog
     # 5. Upload to GCS
-    
-    output_path = Path(output_dir) / "coastal_dem.tif"
-    output_path.parent.mkdir(parents=True, exist_ok=True)
+    logger.warning("GEE export is not implemented yet; pass source_path to convert a local DEM")
     
     logger.info(f"DEM processing completed: {output_path}")
     return str(output_path)
 
+# Web Mercator extent and tile constants
+WEB_MERCATOR_HALF_WORLD = 20037508.342789244
+TILE_SIZE = 256
+
+# Elevation colour ramp (meters, RGB) used when rendering DEM tiles
+DEM_COLOR_STOPS = [
+    (-20.0, (8, 48, 107)),
+    (-2.0, (66, 146, 198)),
+    (0.0, (199, 233, 180)),
+    (2.0, (120, 198, 121)),
+    (10.0, (35, 132, 67)),
+    (50.0, (166, 118, 29)),
+    (200.0, (140, 81, 10)),
+    (1000.0, (255, 255, 255))
+]
+
+# Per-process state for tile rendering, set up by _init_tile_worker
+_tile_cog_path = None
+_tile_datasets = {}
+
+def _init_tile_worker(cog_path: str) -> None:
+    """Remember the COG path; datasets are opened lazily per overview level."""
+    global _tile_cog_path, _tile_datasets
+    _tile_cog_path = cog_path
+    _tile_datasets = {}
+
+def _tile_dataset(overview_level: Optional[int]):
+    """Open (once per worker) the COG at full resolution or at an overview level."""
+    import rasterio
+    if overview_level not in _tile_datasets:
+        kwargs = {} if overview_level is None else {'overview_level': overview_level}
+        _tile_datasets[overview_level] = rasterio.open(_tile_cog_path, **kwargs)
+    return _tile_datasets[overview_level]
+
+def tile_bounds(z: int, x: int, y: int) -> Tuple[float, float, float, float]:
+    """Web Mercator bounds (west, south, east, north) of an XYZ tile."""
+    size = 2 * WEB_MERCATOR_HALF_WORLD / (1 << z)
+    west = -WEB_MERCATOR_HALF_WORLD + x * size
+    north = WEB_MERCATOR_HALF_WORLD - y * size
+    return west, north - size, west + size, north
+
+def _tile_range(
+    bounds: Tuple[float, float, float, float],
+    z: int
+) -> Tuple[int, int, int, int]:
+    """Inclusive (x_min, y_min, x_max, y_max) of tiles touching Web Mercator bounds."""
+    n = 1 << z
+    size = 2 * WEB_MERCATOR_HALF_WORLD / n
+    west, south, east, north = bounds
+    x_min = int((west + WEB_MERCATOR_HALF_WORLD) // size)
+    x_max = int((east + WEB_MERCATOR_HALF_WORLD) // size)
+    y_min = int((WEB_MERCATOR_HALF_WORLD - north) // size)
+    y_max = int((WEB_MERCATOR_HALF_WORLD - south) // size)
+    clip = lambda v: min(max(v, 0), n - 1)
+    return clip(x_min), clip(y_min), clip(x_max), clip(y_max)
+
+def _tile_path(output_dir: str, z: int, x: int, y: int, tile_format: str) -> Path:
+    return Path(output_dir) / str(z) / str(x) / f"{y}.{tile_format}"
+
+def colorize_elevation(elevation: np.ndarray) -> np.ndarray:
+    """Map elevations (NaN for nodata) to an RGBA uint8 image."""
+    stops = np.array([stop for stop, _ in DEM_COLOR_STOPS])
+    colors = np.array([color for _, color in DEM_COLOR_STOPS], dtype='float32')
+    valid = ~np.isnan(elevation)
+    values = np.where(valid, elevation, 0.0)
+    rgba = np.zeros(elevation.shape + (4,), dtype='uint8')
+    for channel in range(3):
+        rgba[..., channel] = np.interp(values, stops, colors[:, channel]).astype('uint8')
+    rgba[..., 3] = np.where(valid, 255, 0)
+    return rgba
+
+def _write_tile(rgba: np.ndarray, path: Path, tile_format: str) -> None:
+    from PIL import Image
+    path.parent.mkdir(parents=True, exist_ok=True)
+    image = Image.fromarray(rgba, 'RGBA')
+    if tile_format == 'webp':
+        image.save(path, format='WEBP', lossless=True)
+    else:
+        image.save(path, format='PNG', optimize=False)
+
+def _remove_tile(path: Path) -> None:
+    """Drop a tile that no longer has data (dirty-region rebuilds)."""
+    if path.exists():
+        path.unlink()
+
+def _overview_for_resolution(
+    base_resolution: float,
+    overview_factors: list,
+    target_resolution: float
+) -> Optional[int]:
+    """Index of the coarsest overview that is still at least as fine as the target."""
+    level = None
+    for index, factor in enumerate(overview_factors):
+        if base_resolution * factor <= target_resolution:
+            level = index
+    return level
+
+def _render_source_tiles(
+    z: int,
+    tiles: list,
+    output_dir: str,
+    tile_format: str,
+    overview_level: Optional[int]
+) -> int:
+    """
+    Render the highest zoom level straight from the COG.
+    
+    Each tile is warped from the overview closest to its resolution, so only
+    the COG blocks under the tile are decoded.
+    
+    Returns:
+        Number of tiles written
+    """
+    import rasterio
+    from rasterio.enums import Resampling
+    from rasterio.transform import from_bounds
+    from rasterio.warp import reproject
+    
+    src = _tile_dataset(overview_level)
+    written = 0
+    for x, y in tiles:
+        path = _tile_path(output_dir, z, x, y, tile_format)
+        elevation = np.full((TILE_SIZE, TILE_SIZE), np.nan, dtype='float32')
+        reproject(
+            source=rasterio.band(src, 1),
+            destination=elevation,
+            src_nodata=src.nodata,
+            dst_transform=from_bounds(*tile_bounds(z, x, y), TILE_SIZE, TILE_SIZE),
+            dst_crs="EPSG:3857",
+            dst_nodata=np.nan,
+            resampling=Resampling.bilinear
+        )
+        if np.isnan(elevation).all():
+            _remove_tile(path)
+            continue
+        _write_tile(colorize_elevation(elevation), path, tile_format)
+        written += 1
+    return written
+
+def _render_parent_tiles(
+    z: int,
+    tiles: list,
+    output_dir: str,
+    tile_format: str
+) -> int:
+    """
+    Build tiles at zoom z by downsampling their four children at z + 1.
+    
+    Returns:
+        Number of tiles written
+    """
+    from PIL import Image
+    
+    written = 0
+    for x, y in tiles:
+        path = _tile_path(output_dir, z, x, y, tile_format)
+        mosaic = np.zeros((2 * TILE_SIZE, 2 * TILE_SIZE, 4), dtype='float32')
+        found = False
+        for dx in (0, 1):
+            for dy in (0, 1):
+                child = _tile_path(output_dir, z + 1, 2 * x + dx, 2 * y + dy, tile_format)
+                if not child.exists():
+                    continue
+                with Image.open(child) as image:
+                    pixels = np.asarray(image.convert('RGBA'), dtype='float32')
+                mosaic[dy * TILE_SIZE:(dy + 1) * TILE_SIZE, dx * TILE_SIZE:(dx + 1) * TILE_SIZE] = pixels
+                found = True
+        if not found:
+            _remove_tile(path)
+            continue
+        
+        # Alpha-weighted 2x2 average so nodata does not darken the edges
+        blocks = mosaic.reshape(TILE_SIZE, 2, TILE_SIZE, 2, 4)
+        alpha = blocks[..., 3:4]
+        alpha_sum = alpha.sum(axis=(1, 3))
+        rgb = (blocks[..., :3] * alpha).sum(axis=(1, 3)) / np.maximum(alpha_sum, 1.0)
+        rgba = np.concatenate([rgb, alpha_sum / 4.0], axis=-1)
+        if not rgba[..., 3].any():
+            _remove_tile(path)
+            continue
+        _write_tile(np.round(rgba).astype('uint8'), path, tile_format)
+        written += 1
+    return written
+
+def _source_tiles(
+    cog_path: str,
+    z: int,
+    dirty_bounds: Optional[list] = None
+) -> Tuple[list, list]:
+    """
+    Find the tiles at zoom z that can contain data.
+    
+    Coverage comes from the coarsest overview, so tiles over empty or
+    all-nodata regions are skipped without touching full-resolution pixels.
+    
+    Args:
+        cog_path: Path to the Cloud Optimized GeoTIFF
+        z: Zoom level
+        dirty_bounds: Optional (west, south, east, north) boxes in degrees;
+            only tiles touching them are returned
+    
+    Returns:
+        Tiles with data, and tiles in the dirty region without data
+    """
+    import rasterio
+    from rasterio.warp import transform, transform_bounds
+    
+    with rasterio.open(cog_path) as src:
+        overviews = src.overviews(1)
+        kwargs = {'overview_level': len(overviews) - 1} if overviews else {}
+    with rasterio.open(cog_path, **kwargs) as coarse:
+        valid = coarse.read_masks(1) > 0
+        rows, cols = np.nonzero(valid)
+        # Corners of each valid coarse pixel in Web Mercator
+        xs, ys = [], []
+        for dr, dc in ((0, 0), (0, 1), (1, 0), (1, 1)):
+            cx, cy = coarse.transform * (cols + dc, rows + dr)
+            xs.append(np.asarray(cx))
+            ys.append(np.asarray(cy))
+        xs = np.concatenate(xs)
+        ys = np.concatenate(ys)
+        if coarse.crs.to_string() != "EPSG:3857" and len(xs):
+            xs, ys = transform(coarse.crs, "EPSG:3857", xs, ys)
+        xs = np.asarray(xs).reshape(4, -1)
+        ys = np.asarray(ys).reshape(4, -1)
+    
+    covered = set()
+    for west, south, east, north in zip(xs.min(0), ys.min(0), xs.max(0), ys.max(0)):
+        x_min, y_min, x_max, y_max = _tile_range((west, south, east, north), z)
+        for x in range(x_min, x_max + 1):
+            for y in range(y_min, y_max + 1):
+                covered.add((x, y))
+    
+    if dirty_bounds is None:
+        return sorted(covered), []
+    
+    dirty = set()
+    for region in dirty_bounds:
+        x_min, y_min, x_max, y_max = _tile_range(
+            transform_bounds("EPSG:4326", "EPSG:3857", *region), z
+        )
+        for x in range(x_min, x_max + 1):
+            for y in range(y_min, y_max + 1):
+                dirty.add((x, y))
+    return sorted(covered & dirty), sorted(dirty - covered)
+
+def _chunks(items: list, size: int) -> Iterator[list]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
 def generate_dem_tiles(
     cog_path: str,
     output_dir: str = "output/tiles/dem",
-    zoom_levels: range = range(0, 12)
+    zoom_levels: range = range(0, 12),
+    tile_format: str = "png",
+    workers: Optional[int] = None,
+    dirty_bounds: Optional[list] = None,
+    chunk_size: int = 64
 ) -> None:
     """
     Generate tile pyramid from COG for web visualization.
     
+    The highest zoom level is rendered from the COG; every lower level is
+    built from the four child tiles of the level below instead of re-reading
+    source pixels. Tiles are distributed across worker processes and empty or
+    all-nodata tiles are skipped. With dirty_bounds only the tiles whose
+    source window intersects those boxes (and their ancestors) are rebuilt.
+    
     Args:
         cog_path: Path to the Cloud Optimized GeoTIFF
         output_dir: Directory to save tiles
         zoom_levels: Range of zoom levels to generate
+        tile_format: 'png' or 'webp'
+        workers: Number of worker processes (None uses all cores)
+        dirty_bounds: Optional list of (west, south, east, north) boxes in
+            degrees whose source data changed
+        chunk_size: Number of tiles handed to a worker per task
     """
+    import rasterio
+    from rasterio.warp import transform_bounds
+    
+    if tile_format not in ('png', 'webp'):
+        raise ValueError(f"Unsupported tile format: {tile_format}")
+    if not Path(cog_path).exists():
+        logger.warning(f"COG not found, skipping tile generation: {cog_path}")
+        return
+    
     logger.info(f"Generating DEM tiles from: {cog_path}")
     
-    # TODO: Implement tile generation
-    # 1. Load COG with rasterio
-    # 2. Generate tiles for each zoom level
-    # 3. Save as PNG files in {z}/{x}/{y}.png structure
-    # 4. Upload to GCS bucket
+    max_zoom = max(zoom_levels)
+    min_zoom = min(zoom_levels)
+    
+    with rasterio.open(cog_path) as src:
+        overview_factors = src.overviews(1)
+        west, south, east, north = transform_bounds(src.crs, "EPSG:3857", *src.bounds)
+        base_resolution = min((east - west) / src.width, (north - south) / src.height)
+    tile_resolution = 2 * WEB_MERCATOR_HALF_WORLD / (TILE_SIZE * (1 << max_zoom))
+    overview_level = _overview_for_resolution(base_resolution, overview_factors, tile_resolution)
+    
+    tiles, stale = _source_tiles(cog_path, max_zoom, dirty_bounds)
+    for x, y in stale:
+        _remove_tile(_tile_path(output_dir, max_zoom, x, y, tile_format))
+    
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_tile_worker,
+        initargs=(str(cog_path),)
+    ) as pool:
+        render = partial(
+            _render_source_tiles, max_zoom,
+            output_dir=output_dir, tile_format=tile_format, overview_level=overview_level
+        )
+        written = sum(pool.map(render, _chunks(tiles, chunk_size)))
+        logger.info(f"Zoom {max_zoom}: {written} tiles rendered from source")
+        
+        # Build each lower level from the one below
+        level_tiles = sorted(set(tiles) | set(stale))
+        for z in range(max_zoom - 1, min_zoom - 1, -1):
+            level_tiles = sorted({(x // 2, y // 2) for x, y in level_tiles})
+            render = partial(_render_parent_tiles, z, output_dir=output_dir, tile_format=tile_format)
+            written = sum(pool.map(render, _chunks(level_tiles, chunk_size)))
+            logger.info(f"Zoom {z}: {written} tiles built from zoom {z + 1}")
     
     logger.info(f"DEM tiles generated in: {output_dir}")
 
 def main():
     """Main processing function."""
+    parser = argparse.ArgumentParser(description="Convert coastal DEMs into COGs and web tiles.")
+    parser.add_argument('--asset', default="users/amanaryya1/coastal-dem-files", help='GEE asset ID for the DEM data')
+    parser.add_argument('--source', help='Local DEM GeoTIFF to convert instead of the GEE asset')
+    parser.add_argument('--output-dir', default="output/dem", help='Directory to save processed files')
+    parser.add_argument('--region', type=float, nargs=4, metavar=('WEST', 'SOUTH', 'EAST', 'NORTH'), help='Bounding box in degrees')
+    parser.add_argument('--dst-crs', default="EPSG:3857", help='Output coordinate reference system')
+    parser.add_argument('--resolution', type=float, help='Output pixel size in dst-crs units')
+    parser.add_argument('--window-size', type=int, default=2048, help='Window side length processed per task')
+    parser.add_argument('--workers', type=int, help='Number of worker processes')
+    parser.add_argument('--tiles-dir', default="output/tiles/dem", help='Directory to save tiles')
+    parser.add_argument('--max-zoom', type=int, default=11, help='Highest zoom level to render')
+    parser.add_argument('--tile-format', choices=['png', 'webp'], default='png', help='Tile image format')
+    parser.add_argument('--dirty', type=float, nargs=4, action='append', metavar=('WEST', 'SOUTH', 'EAST', 'NORTH'),
+                        help='Only rebuild tiles touching this box (repeatable)')
+    args = parser.parse_args()
+    
     logger.info("Starting DEM processing pipeline")
     
     # Process DEM asset
-    cog_path = process_dem_asset()
+    cog_options = {}
+    if args.source:
+        cog_options = {
+            'dst_crs': args.dst_crs,
+            'resolution': args.resolution,
+            'window_size': args.window_size,
+            'workers': args.workers
+        }
+    cog_path = process_dem_asset(
+        asset_id=args.asset,
+        output_dir=args.output_dir,
+        region=tuple(args.region) if args.region else None,
+        source_path=args.source,
+        **cog_options
+    )
     
     # Generate tiles
-    generate_dem_tiles(cog_path)
+    generate_dem_tiles(
+        cog_path,
+        output_dir=args.tiles_dir,
+        zoom_levels=range(0, args.max_zoom + 1),
+        tile_format=args.tile_format,
+        workers=args.workers,
+        dirty_bounds=[tuple(box) for box in args.dirty] if args.dirty else None
+    )
     
     logger.info("DEM processing pipeline completed")
 
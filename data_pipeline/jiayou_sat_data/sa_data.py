@@ -1,8 +1,5 @@
-import xarray as xr
-import pandas as pd
 import os
 import glob
-from tqdm import tqdm
 from datetime import datetime
 import numpy as np
 
@@ -10,7 +7,8 @@ import sys
 import pathlib
 sys.path.append(os.path.join(pathlib.Path(__file__).parent.resolve()))
 
-import ar6
+# xarray, pandas, tqdm, ar6 and series_dataset are imported where they are used, so importing
+# this module (e.g. for list_files) stays fast
 
 def list_files(folder_path, extension='*', recursive=False, full_path=True, **kwargs):
     if extension == '*':
@@ -40,6 +38,8 @@ def read_one_satellite_data(file_path, lat, lon):
     After locating the lon and lat, it will return the sla variable.
     data['sla'].shape data['sla'].shape
     """
+    import xarray as xr
+
     data = xr.open_dataset(file_path)
     lon_bnds = data['lon_bnds']
     lat_bnds = data['lat_bnds']
@@ -54,6 +54,9 @@ def read_one_satellite_data(file_path, lat, lon):
 
 def read_satellite_data(lat, lon, return_dataframe=True,
                         save_path=None):
+    import pandas as pd
+    from tqdm import tqdm
+
     files = list_satellite_files()
     dates = []
     data = []
@@ -71,7 +74,10 @@ def read_satellite_data(lat, lon, return_dataframe=True,
             result.to_csv(save_path, index=False)
     return result
 
-def read_satellite_data_station(station_name: int|str, save_dir="data/satellite/processed", from_file: bool = True, **kwargs):
+def resolve_station(station_name: int|str):
+    """Station ID and location (lat, lon) for an AR6 station ID or name."""
+    import ar6
+
     try:
         station_id = int(station_name)
     except ValueError:
@@ -79,15 +85,51 @@ def read_satellite_data_station(station_name: int|str, save_dir="data/satellite/
             station_id = ar6.station_loc_id_map[station_name]
         else:
             station_id = ar6.get_ar6_station_id(station_name)
-            
-    save_path = os.path.join(save_dir, f"{station_id}.csv")
-    os.makedirs(save_dir, exist_ok=True)
-
-    if from_file and os.path.exists(save_path):
-        return pd.read_csv(save_path)
     latlon = ar6.station2lonlat(station_id)
-    lat, lon = latlon['lat'], latlon['lon']
-    return read_satellite_data(lat=lat, lon=lon, save_path=save_path, **kwargs)
+    return station_id, latlon['lat'], latlon['lon']
+
+def _station_frame(frame):
+    """(date, sla) frame with the same dtypes whether read from the dataset or the NetCDF files."""
+    import pandas as pd
+
+    return pd.DataFrame({
+        'date': pd.to_datetime(frame['date']).astype('datetime64[ns]').to_numpy(),
+        'sla': frame['sla'].astype('float32').to_numpy()
+    })
+
+def read_satellite_data_station(station_name: int|str, save_dir=None, from_file: bool = True, dataset_dir=None, **kwargs):
+    """
+    Monthly SLA series of a station as a (date: datetime64[ns], sla: float32 meters) frame.
+    Series are kept in the Parquet dataset of series_dataset.py; a missing
+    station (or with from_file=False, months newer than the dataset) is read
+    from the NetCDF files and appended to it.
+    save_dir is deprecated: per-station CSVs are no longer written, and the
+    dataset goes to save_dir/sla_series instead.
+    """
+    import warnings
+    from series_dataset import DEFAULT_DATASET_DIR, append_series, load_series
+
+    if save_dir is not None:
+        warnings.warn(
+            "save_dir is deprecated; station series are stored in a Parquet dataset, pass dataset_dir",
+            DeprecationWarning, stacklevel=2
+        )
+        if dataset_dir is None:
+            dataset_dir = os.path.join(save_dir, "sla_series")
+    dataset_dir = dataset_dir or DEFAULT_DATASET_DIR
+    station_id, lat, lon = resolve_station(station_name)
+
+    if from_file and os.path.exists(dataset_dir):
+        series = load_series(dataset_dir, [station_id])
+        if len(series):
+            return _station_frame(series)
+
+    result = _station_frame(read_satellite_data(lat=lat, lon=lon, **kwargs))
+    append_series(result.assign(
+        series_id=str(station_id), station_id=station_id, name=str(station_name),
+        lat=lat, lon=lon, cell_lat=None, cell_lon=None, snap_km=None
+    ), dataset_dir)
+    return result
 
 if __name__ == '__main__':
     # ar6list = ar6.read_ar6_location_list().iloc[:1050]
@@ -98,7 +140,7 @@ if __name__ == '__main__':
     #     read_satellite_data_station(station_id, from_file=True)
     import argparse
     parser = argparse.ArgumentParser()
-    parser.description = "This script reads and processes satellite data and save them to 'data/satellite/processed'."
+    parser.description = "This script reads and processes satellite data and appends them to the series dataset in 'sla_series/' next to this script. For many stations, series_export.py reads them from the store in one pass."
     parser.add_argument('station_ids', type=str, nargs='+', help='One or more station IDs for sea level analysis')
     parser.add_argument('-u', '--update', action='store_true', help='Update the files.')
     args = parser.parse_args()
@@ -0,0 +1,177 @@
+"""
+Partitioned Parquet dataset of monthly SLA series
+
+Written by ../series_export.py (many points at once, from the store) and by
+sa_data.read_satellite_data_station (single stations, from the NetCDF files).
+
+Layout (sla_series/ next to this module by default):
+- year={year}/part-{batch}.parquet: hive partitions by calendar year. Every
+  append writes at most one new file per year and never rewrites existing
+  files, so appends are cheap and readers never see a half-written file.
+  Single-station appends would leave thousands of tiny files, so a year with
+  more than COMPACT_FILES files is merged into one file (sorted by series
+  and date) by the append that crosses the limit.
+
+Columns (one row per series and month, sorted by series then date):
+- series_id: station ID, or "{lat}_{lon}" for points
+- station_id (int32, null for points), name: station metadata
+- lat, lon: requested location; cell_lat, cell_lon: grid cell the series was
+  read from (the nearest ocean cell for coastal points on land); snap_km
+- date (date32, mid-month as in the source files), sla (float32, meters, NaN
+  where there is no data)
+"""
+
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+DEFAULT_DATASET_DIR = Path(__file__).parent / "sla_series"
+
+# Files a year partition may hold before an append compacts it
+COMPACT_FILES = 16
+
+SERIES_SCHEMA = pa.schema([
+    ('series_id', pa.string()),
+    ('station_id', pa.int32()),
+    ('name', pa.string()),
+    ('lat', pa.float32()),
+    ('lon', pa.float32()),
+    ('cell_lat', pa.float32()),
+    ('cell_lon', pa.float32()),
+    ('snap_km', pa.float32()),
+    ('date', pa.date32()),
+    ('sla', pa.float32())
+])
+
+def _year_dirs(dataset_dir: Path) -> list:
+    """Year partitions, newest first."""
+    return sorted(dataset_dir.glob("year=*"), key=lambda path: int(path.name[5:]), reverse=True)
+
+def _parts(year_dir: Path) -> list:
+    return sorted(str(path) for path in year_dir.glob("part-*.parquet"))
+
+def last_exported(
+    dataset_dir: Path = DEFAULT_DATASET_DIR,
+    series_ids: Optional[Iterable[str]] = None
+) -> Dict[str, pd.Timestamp]:
+    """
+    Date of the latest exported month of every series in the dataset.
+
+    With series_ids, year partitions are read newest first and only until all
+    of them are found, so a lookup for series already in the dataset reads
+    one year instead of the whole dataset.
+    """
+    dataset_dir = Path(dataset_dir)
+    if not dataset_dir.exists():
+        return {}
+    if series_ids is None:
+        return _latest_dates(ds.dataset(dataset_dir, format='parquet', partitioning='hive'), None)
+
+    pending = {str(s) for s in series_ids}
+    latest = {}
+    for year_dir in _year_dirs(dataset_dir):
+        if not pending:
+            break
+        parts = _parts(year_dir)
+        if not parts:
+            continue
+        found = _latest_dates(ds.dataset(parts, format='parquet'), pending)
+        latest.update(found)
+        pending -= set(found)
+    return latest
+
+def _latest_dates(dataset: ds.Dataset, series_ids: Optional[set]) -> Dict[str, pd.Timestamp]:
+    row_filter = None if series_ids is None else ds.field('series_id').isin(sorted(series_ids))
+    table = dataset.to_table(columns=['series_id', 'date'], filter=row_filter)
+    if table.num_rows == 0:
+        return {}
+    latest = table.group_by('series_id').aggregate([('date', 'max')])
+    return dict(zip(latest['series_id'].to_pylist(), pd.to_datetime(latest['date_max'].to_pylist())))
+
+def _write_part(table: pa.Table, path: Path) -> None:
+    # Dot-prefixed files are ignored by dataset readers until renamed
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    pq.write_table(table, tmp_path, compression='zstd')
+    tmp_path.replace(path)
+
+def compact_year(year_dir: Path) -> int:
+    """
+    Merge a year partition's files into one, sorted by series and date.
+
+    The merged file is renamed into place before the old files are deleted,
+    so a reader listing the partition in between can see rows twice;
+    load_series drops such duplicates.
+
+    Returns:
+        Number of files merged
+    """
+    parts = _parts(Path(year_dir))
+    if len(parts) < 2:
+        return 0
+    table = ds.dataset(parts, format='parquet', schema=SERIES_SCHEMA).to_table()
+    table = table.sort_by([('series_id', 'ascending'), ('date', 'ascending')])
+    batch = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%S%f')
+    _write_part(table, Path(year_dir) / f"part-{batch}-compact.parquet")
+    for part in parts:
+        Path(part).unlink()
+    return len(parts)
+
+def compact_series(dataset_dir: Path = DEFAULT_DATASET_DIR, max_files: int = 1) -> int:
+    """Compact every year partition holding more than max_files files; returns the files merged."""
+    return sum(
+        compact_year(year_dir) for year_dir in _year_dirs(Path(dataset_dir))
+        if len(_parts(year_dir)) > max_files
+    )
+
+def append_series(frame: pd.DataFrame, dataset_dir: Path = DEFAULT_DATASET_DIR) -> int:
+    """
+    Append series rows to the dataset without touching existing files.
+
+    Rows at or before the last exported month of their series are dropped, so
+    appending the same series twice writes nothing. One file is written per
+    calendar year, oldest first, so an interrupted append resumes cleanly; a
+    year left with more than COMPACT_FILES files is compacted.
+
+    Args:
+        frame: Rows with the SERIES_SCHEMA columns
+        dataset_dir: Partitioned Parquet dataset
+
+    Returns:
+        Number of rows written
+    """
+    dataset_dir = Path(dataset_dir)
+    frame = frame.assign(date=pd.to_datetime(frame['date']))
+    exported = last_exported(dataset_dir, frame['series_id'].unique())
+    if exported:
+        cutoff = frame['series_id'].map(exported)
+        frame = frame[cutoff.isna() | (frame['date'] > cutoff)]
+    if frame.empty:
+        return 0
+
+    frame = frame.sort_values(['series_id', 'date'])
+    batch = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%S%f')
+    for year, rows in frame.groupby(frame['date'].dt.year, sort=True):
+        table = pa.Table.from_pandas(rows, schema=SERIES_SCHEMA, preserve_index=False)
+        path = dataset_dir / f"year={year}" / f"part-{batch}.parquet"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        _write_part(table, path)
+        if len(_parts(path.parent)) > COMPACT_FILES:
+            compact_year(path.parent)
+    return len(frame)
+
+def load_series(dataset_dir: Path = DEFAULT_DATASET_DIR, series_ids: Optional[Iterable[str]] = None) -> pd.DataFrame:
+    """Read the dataset (or some series of it) into one DataFrame sorted by series and date."""
+    dataset = ds.dataset(Path(dataset_dir), format='parquet', partitioning='hive')
+    row_filter = None if series_ids is None else ds.field('series_id').isin([str(s) for s in series_ids])
+    table = dataset.to_table(columns=SERIES_SCHEMA.names, filter=row_filter)
+    frame = table.to_pandas()
+    frame['station_id'] = frame['station_id'].astype('Int32')
+    frame['date'] = pd.to_datetime(frame['date'])
+    # Rows seen twice while a compaction swaps files
+    frame = frame.drop_duplicates(['series_id', 'date'])
+    return frame.sort_values(['series_id', 'date'], ignore_index=True)
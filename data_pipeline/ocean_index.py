@@ -0,0 +1,135 @@
+"""
+Nearest Ocean Cell Index
+
+This module precomputes, for every cell of the SLA grid, the nearest cell that
+holds valid (ocean) data. Coastal clicks that land on a NaN land cell can then
+be snapped to the nearest ocean cell by the backend with a single array lookup.
+
+The index is built once from the land mask of one monthly SLA file using a
+Euclidean distance transform, with the grid padded across the antimeridian so
+that snapping wraps in longitude.
+"""
+
+import argparse
+import logging
+import os
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+SLA_DATA_DIR = Path(__file__).parent / "jiayou_sat_data" / "monthly_raw"
+DEFAULT_INDEX_PATH = Path(__file__).parent / "jiayou_sat_data" / "nearest_ocean.npz"
+
+# Land cells further than this from any ocean cell are treated as inland. The
+# backend reads the same MAX_SNAP_KM setting (backend/ocean_snap.py).
+MAX_SNAP_KM = float(os.environ.get('MAX_SNAP_KM', 100.0))
+
+EARTH_RADIUS_KM = 6371.0
+
+def haversine_km(lat1, lon1, lat2, lon2) -> np.ndarray:
+    """Great-circle distance in kilometers."""
+    lat1, lon1, lat2, lon2 = map(np.radians, (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+def load_land_mask(nc_path: str):
+    """
+    Read the land mask (cells where SLA is NaN) from one monthly SLA file.
+
+    Args:
+        nc_path: Path to a dt_global_twosat_phy_l4_*.nc file
+
+    Returns:
+        Tuple of (land mask, latitudes, longitudes)
+    """
+    import xarray as xr
+
+    with xr.open_dataset(nc_path) as ds:
+        sla = ds['sla']
+        if 'time' in sla.dims:
+            sla = sla.isel(time=0)
+        land = np.isnan(sla.values)
+        latitude = ds['latitude'].values.astype('float64')
+        longitude = ds['longitude'].values.astype('float64')
+    return land, latitude, longitude
+
+def compute_nearest_ocean(land: np.ndarray, wrap: bool = True) -> tuple:
+    """
+    Row and column of the nearest ocean cell for every grid cell.
+
+    Ocean cells map to themselves. Distances are measured in grid cells, so the
+    result is the nearest cell on the lat/lon grid; the backend reports the
+    true great-circle snap distance.
+
+    Args:
+        land: Boolean (lat, lon) array, True on land
+        wrap: Pad across the antimeridian so snapping wraps in longitude
+
+    Returns:
+        Tuple of (nearest_row, nearest_col) int16 arrays
+    """
+    from scipy.ndimage import distance_transform_edt
+
+    n_lon = land.shape[1]
+    pad = n_lon // 4 if wrap else 0
+    padded = np.concatenate([land[:, n_lon - pad:], land, land[:, :pad]], axis=1) if pad else land
+
+    # Indices of the nearest zero (ocean) element for every cell
+    _, (rows, cols) = distance_transform_edt(padded, return_distances=True, return_indices=True)
+    rows = rows[:, pad:pad + n_lon]
+    cols = (cols[:, pad:pad + n_lon] - pad) % n_lon
+    return rows.astype('int16'), cols.astype('int16')
+
+def build_nearest_ocean_index(
+    nc_path: Optional[str] = None,
+    output_path: str = str(DEFAULT_INDEX_PATH)
+) -> str:
+    """
+    Build and save the nearest-ocean-cell index.
+
+    Args:
+        nc_path: SLA file providing the land mask (None uses the first file in monthly_raw)
+        output_path: Where to write the .npz index
+
+    Returns:
+        Path to the index file
+    """
+    if nc_path is None:
+        files = sorted(SLA_DATA_DIR.glob("dt_global_twosat_phy_l4_*.nc"))
+        if not files:
+            raise FileNotFoundError(f"No SLA files found in {SLA_DATA_DIR}")
+        nc_path = str(files[0])
+
+    logger.info(f"Building nearest ocean index from: {nc_path}")
+    land, latitude, longitude = load_land_mask(nc_path)
+    nearest_row, nearest_col = compute_nearest_ocean(land)
+
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    np.savez_compressed(
+        output_path,
+        latitude=latitude,
+        longitude=longitude,
+        land=land,
+        nearest_row=nearest_row,
+        nearest_col=nearest_col
+    )
+    logger.info(f"Nearest ocean index written: {output_path} ({land.mean():.1%} land cells)")
+    return str(output_path)
+
+def main():
+    """Main processing function."""
+    parser = argparse.ArgumentParser(description="Precompute the nearest ocean cell for every SLA grid cell.")
+    parser.add_argument('--source', help='SLA NetCDF file providing the land mask')
+    parser.add_argument('--output', default=str(DEFAULT_INDEX_PATH), help='Output .npz path')
+    args = parser.parse_args()
+
+    build_nearest_ocean_index(args.source, args.output)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,240 @@
+"""
+Bulk SLA Series Export
+
+This module writes the monthly SLA series of many tide gauge stations or
+arbitrary points into one Parquet dataset, read from the consolidated store,
+so notebooks load a thousand series with a single read instead of opening one
+CSV per station. The dataset layout and columns are described in
+jiayou_sat_data/series_dataset.py.
+
+Appends only add months later than the last one exported for each series,
+so re-running an export after sla_ingest.py picks up new months and new
+series. Months re-processed in place need --rebuild.
+"""
+
+import argparse
+import logging
+import shutil
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from jiayou_sat_data.series_dataset import DEFAULT_DATASET_DIR, append_series, compact_series, last_exported
+from ocean_index import DEFAULT_INDEX_PATH, MAX_SNAP_KM, haversine_km
+from sla_ingest import DEFAULT_STORE_DIR, load_manifest, open_cube
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Day of month the monthly files are stamped with
+SERIES_DAY = 15
+
+def point_series_id(lat: float, lon: float) -> str:
+    return f"{lat:.4f}_{lon:.4f}"
+
+def station_points(stations: Iterable) -> List[dict]:
+    """Resolve station IDs or names to points with station metadata (needs ar6)."""
+    from jiayou_sat_data.sa_data import resolve_station
+
+    points = []
+    for station in stations:
+        station_id, lat, lon = resolve_station(station)
+        points.append({
+            'series_id': str(station_id), 'station_id': station_id,
+            'name': str(station), 'lat': lat, 'lon': lon
+        })
+    return points
+
+def load_points_file(path: Path) -> List[dict]:
+    """
+    Read points from a CSV with lat and lon columns.
+
+    Optional station_id and name columns are kept as station metadata; rows
+    with a station_id are keyed by it.
+    """
+    table = pd.read_csv(path)
+    points = []
+    for row in table.itertuples(index=False):
+        row = row._asdict()
+        station_id = row.get('station_id')
+        has_station = station_id is not None and pd.notna(station_id)
+        lat, lon = float(row['lat']), float(row['lon'])
+        points.append({
+            'series_id': str(int(station_id)) if has_station else point_series_id(lat, lon),
+            'station_id': int(station_id) if has_station else None,
+            'name': str(row['name']) if pd.notna(row.get('name')) else None,
+            'lat': lat, 'lon': lon
+        })
+    return points
+
+def store_series(
+    points: List[dict],
+    months: Optional[Dict[str, List[str]]] = None,
+    store_dir: Path = DEFAULT_STORE_DIR,
+    index_path: Optional[Path] = DEFAULT_INDEX_PATH,
+    max_snap_km: float = MAX_SNAP_KM
+) -> pd.DataFrame:
+    """
+    Read the monthly series of many points from the consolidated store.
+
+    All points are gathered in one pass over the memory-mapped cube. Points on
+    land cells are read from the nearest ocean cell within max_snap_km.
+
+    Args:
+        points: Dicts with series_id, lat, lon and optional station_id, name
+        months: Months (YYYY-MM) to read per series_id (None reads every month)
+        store_dir: Consolidated store written by sla_ingest.py
+        index_path: Nearest ocean index from ocean_index.py (None disables snapping)
+        max_snap_km: Largest snap distance for coastal points
+
+    Returns:
+        Long DataFrame with the series_dataset.SERIES_SCHEMA columns
+    """
+    store_dir = Path(store_dir)
+    manifest = load_manifest(store_dir)
+    if manifest is None:
+        raise FileNotFoundError(f"No consolidated store in {store_dir}; run sla_ingest.py first")
+
+    cube = open_cube(store_dir, manifest)
+    n_months, n_lat, n_lon = cube.shape
+    latitude = np.load(store_dir / "latitude.npy")
+    longitude = np.load(store_dir / "longitude.npy")
+
+    lats = np.array([p['lat'] for p in points], dtype='float64')
+    lons = np.array([p['lon'] for p in points], dtype='float64')
+    rows = np.clip(np.rint((lats - latitude[0]) / (latitude[1] - latitude[0])), 0, n_lat - 1).astype('int64')
+    cols = np.rint((np.mod(lons, 360.0) - longitude[0]) / (longitude[1] - longitude[0])).astype('int64') % n_lon
+
+    snap_km = np.zeros(len(points))
+    if index_path is not None and Path(index_path).exists():
+        with np.load(index_path) as index:
+            on_land = index['land'][rows, cols]
+            near_rows = index['nearest_row'][rows, cols].astype('int64')
+            near_cols = index['nearest_col'][rows, cols].astype('int64')
+        distance = haversine_km(lats, lons, latitude[near_rows], longitude[near_cols])
+        snap = on_land & (distance <= max_snap_km)
+        rows = np.where(snap, near_rows, rows)
+        cols = np.where(snap, near_cols, cols)
+        snap_km = np.where(snap, distance, 0.0)
+
+    # (month, point) in one gather
+    values = np.asarray(cube[:, rows, cols]) if points else np.empty((n_months, 0), dtype='float32')
+    all_months = manifest['months']
+    month_index = {month: i for i, month in enumerate(all_months)}
+    dates = pd.to_datetime([f"{month}-{SERIES_DAY:02d}" for month in all_months])
+
+    # Row i of the output is month month_rows[i] of point point_rows[i]
+    month_rows, point_rows = [], []
+    for i, point in enumerate(points):
+        wanted = all_months if months is None else months.get(point['series_id'], [])
+        month_rows.append(np.array([month_index[month] for month in wanted], dtype='int64'))
+        point_rows.append(np.full(len(wanted), i, dtype='int64'))
+    month_rows = np.concatenate(month_rows) if points else np.empty(0, dtype='int64')
+    point_rows = np.concatenate(point_rows) if points else np.empty(0, dtype='int64')
+
+    def column(key):
+        return np.array([p.get(key) for p in points], dtype=object)[point_rows]
+
+    cell_lon = longitude[cols]
+    return pd.DataFrame({
+        'series_id': column('series_id'),
+        'station_id': pd.array(column('station_id'), dtype='Int32'),
+        'name': column('name'),
+        'lat': lats.astype('float32')[point_rows],
+        'lon': lons.astype('float32')[point_rows],
+        'cell_lat': latitude[rows].astype('float32')[point_rows],
+        'cell_lon': np.where(cell_lon > 180, cell_lon - 360, cell_lon).astype('float32')[point_rows],
+        'snap_km': snap_km.astype('float32')[point_rows],
+        'date': dates[month_rows],
+        'sla': values[month_rows, point_rows]
+    })
+
+def export_series(
+    points: List[dict],
+    store_dir: Path = DEFAULT_STORE_DIR,
+    dataset_dir: Path = DEFAULT_DATASET_DIR,
+    index_path: Optional[Path] = DEFAULT_INDEX_PATH,
+    max_snap_km: float = MAX_SNAP_KM,
+    rebuild: bool = False
+) -> int:
+    """
+    Export (or append) the series of many points into the Parquet dataset.
+
+    Only months after each series' last exported month are read and written.
+
+    Args:
+        points: Dicts with series_id, lat, lon and optional station_id, name
+        store_dir: Consolidated store written by sla_ingest.py
+        dataset_dir: Partitioned Parquet dataset
+        index_path: Nearest ocean index from ocean_index.py (None disables snapping)
+        max_snap_km: Largest snap distance for coastal points
+        rebuild: Delete the dataset and export from scratch
+
+    Returns:
+        Number of rows written
+    """
+    dataset_dir = Path(dataset_dir)
+    if rebuild and dataset_dir.exists():
+        shutil.rmtree(dataset_dir)
+
+    manifest = load_manifest(Path(store_dir))
+    if manifest is None:
+        raise FileNotFoundError(f"No consolidated store in {store_dir}; run sla_ingest.py first")
+
+    # Later duplicates of a series are dropped
+    points = list({p['series_id']: p for p in reversed(points)}.values())[::-1]
+    exported = last_exported(dataset_dir, [p['series_id'] for p in points])
+    months = {}
+    for point in points:
+        last = exported.get(point['series_id'])
+        last_month = last.strftime('%Y-%m') if last is not None else ''
+        months[point['series_id']] = [month for month in manifest['months'] if month > last_month]
+    pending = [p for p in points if months[p['series_id']]]
+    if not pending:
+        logger.info(f"All {len(points)} series are current in {dataset_dir}")
+        return 0
+
+    logger.info(f"Exporting {len(pending)} of {len(points)} series to {dataset_dir}")
+    frame = store_series(pending, months, store_dir, index_path, max_snap_km)
+    written = append_series(frame, dataset_dir)
+    logger.info(f"Series export complete: {written} rows, {len(pending)} series")
+    return written
+
+def main():
+    """Main processing function."""
+    parser = argparse.ArgumentParser(description="Export station or point SLA series from the store into a partitioned Parquet dataset.")
+    parser.add_argument('--stations', nargs='+', default=[], help='Station IDs or names (resolved with ar6)')
+    parser.add_argument('--points', nargs='+', default=[], help='Points as lat,lon')
+    parser.add_argument('--points-file', help='CSV with lat and lon (and optional station_id, name) columns')
+    parser.add_argument('--store-dir', default=str(DEFAULT_STORE_DIR), help='Consolidated store directory')
+    parser.add_argument('--dataset-dir', default=str(DEFAULT_DATASET_DIR), help='Parquet dataset directory')
+    parser.add_argument('--max-snap-km', type=float, default=MAX_SNAP_KM, help='Largest coastal snap distance')
+    parser.add_argument('--rebuild', action='store_true', help='Delete the dataset and export from scratch')
+    parser.add_argument('--compact', action='store_true', help='Merge each year of the dataset into one file')
+    args = parser.parse_args()
+
+    if args.compact:
+        merged = compact_series(Path(args.dataset_dir))
+        logger.info(f"Compacted {merged} files in {args.dataset_dir}")
+        if not (args.stations or args.points or args.points_file):
+            return
+
+    points = station_points(args.stations) if args.stations else []
+    for point in args.points:
+        lat, lon = (float(v) for v in point.split(','))
+        points.append({'series_id': point_series_id(lat, lon), 'station_id': None, 'name': None, 'lat': lat, 'lon': lon})
+    if args.points_file:
+        points.extend(load_points_file(Path(args.points_file)))
+    if not points:
+        parser.error("Give --stations, --points or --points-file")
+
+    export_series(
+        points, Path(args.store_dir), Path(args.dataset_dir),
+        max_snap_km=args.max_snap_km, rebuild=args.rebuild
+    )
+
+if __name__ == "__main__":
+    main()
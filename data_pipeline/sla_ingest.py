@@ -0,0 +1,333 @@
+"""
+Incremental SLA Archive Ingest
+
+This module consolidates the monthly dt_global_twosat_phy_l4_*.nc files into a
+single store that the backend memory-maps, and keeps it current as new months
+arrive.
+
+Store layout (data_pipeline/jiayou_sat_data/store/ by default):
+- sla_cube.f32: raw float32 array (month, latitude, longitude) in meters,
+  NaN over land, months in chronological order so new months are appended
+- latitude.npy / longitude.npy: grid coordinates
+- stats_{count,mean,min,max,trend}.npy: per calendar month (12, lat, lon)
+  statistics in millimeters (trend in mm/year)
+- manifest.json: ingested months and their source files, grid shape, the
+  data_version the backend keys its caches and ETags on, and the months that
+  changed in the last ingest (for downstream tile and export rebuilds)
+
+Only newly added or replaced files are read. Statistics are recomputed only
+for the calendar months that changed, new months are folded into the
+climatology accumulators (see climatology.py) and the extreme value fits are
+refreshed (see extremes.py).
+"""
+
+import argparse
+import json
+import logging
+import re
+import shutil
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from ocean_index import DEFAULT_INDEX_PATH, build_nearest_ocean_index
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+SLA_DATA_DIR = Path(__file__).parent / "jiayou_sat_data" / "monthly_raw"
+DEFAULT_STORE_DIR = Path(__file__).parent / "jiayou_sat_data" / "store"
+
+SLA_FILE_PATTERN = re.compile(r"dt_global_twosat_phy_l4_(\d{4})(\d{2})_.*\.nc$")
+
+CUBE_FILENAME = "sla_cube.f32"
+MANIFEST_FILENAME = "manifest.json"
+STAT_NAMES = ("count", "mean", "min", "max", "trend")
+
+def scan_source_files(data_dir: Path = SLA_DATA_DIR) -> Dict[str, Path]:
+    """
+    Find monthly SLA files keyed by 'YYYY-MM'.
+
+    Args:
+        data_dir: Directory holding the monthly NetCDF files
+
+    Returns:
+        Mapping of month key to file path, in chronological order
+    """
+    files = {}
+    for path in sorted(Path(data_dir).glob("*.nc")):
+        match = SLA_FILE_PATTERN.match(path.name)
+        if match:
+            files[f"{match.group(1)}-{match.group(2)}"] = path
+    return dict(sorted(files.items()))
+
+def _file_signature(path: Path) -> dict:
+    stat = path.stat()
+    return {'name': path.name, 'size': stat.st_size, 'mtime': stat.st_mtime}
+
+def read_sla_grid(path: Path):
+    """
+    Read one monthly SLA grid (meters, NaN over land) and its coordinates.
+
+    Args:
+        path: Path to a monthly NetCDF file
+
+    Returns:
+        Tuple of (float32 grid, latitudes, longitudes)
+    """
+    import xarray as xr
+
+    with xr.open_dataset(path) as ds:
+        sla = ds['sla']
+        if 'time' in sla.dims:
+            sla = sla.isel(time=0)
+        grid = sla.values.astype('float32')
+        latitude = ds['latitude'].values.astype('float64')
+        longitude = ds['longitude'].values.astype('float64')
+    return grid, latitude, longitude
+
+def load_manifest(store_dir: Path) -> Optional[dict]:
+    path = Path(store_dir) / MANIFEST_FILENAME
+    if not path.exists():
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+def _write_manifest(store_dir: Path, manifest: dict) -> None:
+    # Write then rename so readers never see a partial manifest
+    path = Path(store_dir) / MANIFEST_FILENAME
+    tmp_path = path.with_suffix(".json.tmp")
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f, indent=2)
+    tmp_path.replace(path)
+
+def open_cube(store_dir: Path, manifest: dict, mode: str = 'r') -> np.memmap:
+    """Memory-map the consolidated cube described by a manifest."""
+    n_lat, n_lon = manifest['shape']
+    return np.memmap(
+        Path(store_dir) / CUBE_FILENAME, dtype='float32', mode=mode,
+        shape=(len(manifest['months']), n_lat, n_lon)
+    )
+
+def _save_atomic(path: Path, array: np.ndarray) -> None:
+    """Write to a new file and rename, so readers holding a memmap are unaffected."""
+    tmp_path = path.with_suffix(".tmp.npy")
+    np.save(tmp_path, array)
+    tmp_path.replace(path)
+
+def _load_stats(store_dir: Path, shape: tuple, create: bool) -> Dict[str, np.ndarray]:
+    """In-memory copies of the statistics grids, to be saved with _save_atomic."""
+    stats = {}
+    for name in STAT_NAMES:
+        path = Path(store_dir) / f"stats_{name}.npy"
+        if create or not path.exists():
+            stats[name] = np.full((12,) + tuple(shape), np.nan, dtype='float32')
+        else:
+            stats[name] = np.load(path)
+    return stats
+
+def _build_missing_products(store_dir: Path, manifest: dict) -> None:
+    """Build climatology and extremes products a store predating them lacks."""
+    from climatology import update_climatology
+    from extremes import update_extremes
+    if not (store_dir / "climatology.json").exists():
+        update_climatology(store_dir, manifest=manifest)
+    if not (store_dir / "extremes.json").exists():
+        update_extremes(store_dir, manifest=manifest)
+
+def compute_month_stats(cube: np.ndarray, months: List[str], calendar_month: int) -> Dict[str, np.ndarray]:
+    """
+    Per-cell statistics (mm) for one calendar month across all years.
+
+    Args:
+        cube: (month, lat, lon) array in meters
+        months: 'YYYY-MM' keys for the cube's first axis
+        calendar_month: Month of the year (1-12)
+
+    Returns:
+        Grids of count, mean, min, max and least-squares trend (mm/year)
+    """
+    indices = [i for i, key in enumerate(months) if int(key[5:7]) == calendar_month]
+    years = np.array([int(months[i][:4]) for i in indices], dtype='float64')
+    values = np.asarray(cube[indices], dtype='float64') * 1000.0
+
+    valid = ~np.isnan(values)
+    count = valid.sum(axis=0)
+    safe_count = np.maximum(count, 1)
+    filled = np.where(valid, values, 0.0)
+    mean = filled.sum(axis=0) / safe_count
+
+    # Least-squares slope against year, using only each cell's valid years
+    x = np.where(valid, years[:, None, None], 0.0)
+    x_mean = x.sum(axis=0) / safe_count
+    dx = np.where(valid, years[:, None, None] - x_mean, 0.0)
+    sxx = (dx * dx).sum(axis=0)
+    sxy = (dx * (filled - mean)).sum(axis=0)
+    trend = np.where(sxx > 0, sxy / np.where(sxx > 0, sxx, 1.0), 0.0)
+
+    with np.errstate(all='ignore'):
+        minimum = np.where(valid, values, np.inf).min(axis=0)
+        maximum = np.where(valid, values, -np.inf).max(axis=0)
+
+    empty = count == 0
+    return {
+        'count': count.astype('float32'),
+        'mean': np.where(empty, np.nan, mean).astype('float32'),
+        'min': np.where(empty, np.nan, minimum).astype('float32'),
+        'max': np.where(empty, np.nan, maximum).astype('float32'),
+        'trend': np.where(count > 1, trend, np.nan).astype('float32')
+    }
+
+def ingest(
+    data_dir: Path = SLA_DATA_DIR,
+    store_dir: Path = DEFAULT_STORE_DIR,
+    rebuild: bool = False
+) -> dict:
+    """
+    Bring the consolidated store up to date with the monthly files.
+
+    New months later than the last ingested month are appended to the cube,
+    and statistics are recomputed only for the affected calendar months. A
+    back-filled month earlier than the last ingested one triggers a full
+    rebuild. Rebuilds and replaced months are written to a new cube that is
+    renamed over the old one, since the backend keeps the live cube
+    memory-mapped; appends only grow the file past what readers map. The
+    data_version is bumped whenever anything changed.
+
+    Args:
+        data_dir: Directory holding the monthly NetCDF files
+        store_dir: Directory of the consolidated store
+        rebuild: Rebuild the store from scratch
+
+    Returns:
+        The updated manifest
+    """
+    store_dir = Path(store_dir)
+    store_dir.mkdir(parents=True, exist_ok=True)
+    sources = scan_source_files(data_dir)
+    if not sources:
+        raise FileNotFoundError(f"No SLA files found in {data_dir}")
+
+    manifest = None if rebuild else load_manifest(store_dir)
+    if manifest is not None:
+        known = manifest['months']
+        added = [key for key in sources if key not in manifest['files']]
+        if added and known and min(added) < known[-1]:
+            logger.info(f"Back-filled months {added}, rebuilding the store")
+            manifest = None
+
+    if manifest is None:
+        grid, latitude, longitude = read_sla_grid(next(iter(sources.values())))
+        np.save(store_dir / "latitude.npy", latitude)
+        np.save(store_dir / "longitude.npy", longitude)
+        previous_version = (load_manifest(store_dir) or {}).get('data_version', 0)
+        manifest = {
+            'months': [],
+            'files': {},
+            'shape': list(grid.shape),
+            'dtype': 'float32',
+            'units': 'm',
+            'data_version': previous_version,
+            'changed_months': []
+        }
+        fresh = True
+    else:
+        fresh = False
+
+    added = [key for key in sources if key not in manifest['files']]
+    replaced = [
+        key for key in manifest['months']
+        if key in sources and manifest['files'][key] != _file_signature(sources[key])
+    ]
+    if not added and not replaced:
+        logger.info(f"Store is up to date ({len(manifest['months'])} months, version {manifest['data_version']})")
+        _build_missing_products(store_dir, manifest)
+        return manifest
+
+    shape = tuple(manifest['shape'])
+    frame_bytes = int(np.prod(shape)) * 4
+    cube_path = store_dir / CUBE_FILENAME
+    target_path = cube_path
+    if fresh or replaced:
+        # Truncating or rewriting the live cube would fault or tear the
+        # backend's reads, so write a new one and rename it over the old
+        target_path = cube_path.with_suffix(".f32.tmp")
+        if fresh:
+            target_path.write_bytes(b"")
+        else:
+            shutil.copyfile(cube_path, target_path)
+
+    # Rewrite replaced months in the copy
+    if replaced:
+        with open(target_path, 'r+b') as f:
+            f.truncate(len(manifest['months']) * frame_bytes)
+        cube = np.memmap(target_path, dtype='float32', mode='r+', shape=(len(manifest['months']),) + shape)
+        for key in replaced:
+            grid, _, _ = read_sla_grid(sources[key])
+            cube[manifest['months'].index(key)] = grid
+            manifest['files'][key] = _file_signature(sources[key])
+        cube.flush()
+        del cube
+
+    # Append new months one grid at a time, dropping any partial append
+    # left by an interrupted run (past the end readers have mapped)
+    with open(target_path, 'ab') as f:
+        f.truncate(len(manifest['months']) * frame_bytes)
+        for key in added:
+            grid, _, _ = read_sla_grid(sources[key])
+            if grid.shape != shape:
+                raise ValueError(f"{sources[key].name} has grid {grid.shape}, store has {shape}")
+            f.write(np.ascontiguousarray(grid, dtype='float32').tobytes())
+            manifest['months'].append(key)
+            manifest['files'][key] = _file_signature(sources[key])
+    if target_path != cube_path:
+        target_path.replace(cube_path)
+    logger.info(f"Ingested {len(added)} new and {len(replaced)} replaced months")
+
+    # Recompute statistics for the affected calendar months only
+    changed = sorted(set(added) | set(replaced))
+    cube = open_cube(store_dir, manifest)
+    stats = _load_stats(store_dir, shape, create=fresh)
+    for calendar_month in sorted({int(key[5:7]) for key in changed}):
+        month_stats = compute_month_stats(cube, manifest['months'], calendar_month)
+        for name in STAT_NAMES:
+            stats[name][calendar_month - 1] = month_stats[name]
+    for name in STAT_NAMES:
+        _save_atomic(store_dir / f"stats_{name}.npy", stats[name])
+    del cube, stats
+
+    manifest['data_version'] += 1
+    manifest['changed_months'] = changed
+    manifest['updated'] = datetime.now(timezone.utc).isoformat()
+
+    # Fold the changed months into the derived products before publishing
+    # the manifest, which is what readers reload on
+    from climatology import update_climatology
+    from extremes import update_extremes
+    update_climatology(store_dir, manifest=manifest)
+    update_extremes(store_dir, manifest=manifest)
+
+    _write_manifest(store_dir, manifest)
+
+    # The land mask index only needs building once
+    if not DEFAULT_INDEX_PATH.exists():
+        build_nearest_ocean_index(str(sources[manifest['months'][0]]))
+
+    logger.info(f"Store at version {manifest['data_version']}: {manifest['months'][0]} to {manifest['months'][-1]}")
+    return manifest
+
+def main():
+    """Main processing function."""
+    parser = argparse.ArgumentParser(description="Ingest new monthly SLA files into the consolidated store.")
+    parser.add_argument('--data-dir', default=str(SLA_DATA_DIR), help='Directory holding the monthly NetCDF files')
+    parser.add_argument('--store-dir', default=str(DEFAULT_STORE_DIR), help='Consolidated store directory')
+    parser.add_argument('--rebuild', action='store_true', help='Rebuild the store from scratch')
+    args = parser.parse_args()
+
+    ingest(Path(args.data_dir), Path(args.store_dir), rebuild=args.rebuild)
+
+if __name__ == "__main__":
+    main()
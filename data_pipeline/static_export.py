@@ -0,0 +1,257 @@
+"""
+Static SLA Data Bundle
+
+This module pre-renders the consolidated SLA store into static files that a
+CDN or GitHub Pages can serve, so the static frontend can read point histories
+without the Flask backend.
+
+Bundle layout (output/static/sla/ by default):
+- index.json: grid, months, encoding and the current versioned directory;
+  the only file that changes in place (serve it with a short cache lifetime)
+- v{data_version}/shards/{shard_row}/{shard_col}.bin: one file per block of
+  SHARD_SIZE x SHARD_SIZE grid cells that holds any data. Each cell is a
+  fixed-size little-endian record: int16 row and column of the grid cell the
+  series was read from (the nearest ocean cell for coastal land cells, -1 when
+  there is none), float32 offset and scale (mm), then one uint8 code per month
+  (value = offset + code * scale, 255 = nodata). The byte offset of a cell is
+  computable from its coordinates, so one ranged GET returns its whole history.
+- v{data_version}/stats/{name}.i16: per calendar month statistics grids,
+  (12, lat, lon) int16 with a per-product scale and -32768 as nodata, one
+  contiguous grid per month
+
+Each cell's series is quantized to 255 levels over its own range, so the error
+is at most half a step (well under 1 mm for typical 20-40 cm ranges, below
+the altimetry's own accuracy); this halves the bundle against int16 records.
+Versioned directories are immutable and can be cached forever. A bundle is
+about 470 MB per version, so only the current one is kept by default (GitHub
+Pages sites are limited to 1 GB); keep the previous one as well only when
+hosting on a CDN or object store.
+"""
+
+import argparse
+import json
+import logging
+import shutil
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from ocean_index import DEFAULT_INDEX_PATH, MAX_SNAP_KM, haversine_km
+from sla_ingest import DEFAULT_STORE_DIR, STAT_NAMES, load_manifest, open_cube
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DEFAULT_OUTPUT_DIR = Path("output/static/sla")
+
+SHARD_SIZE = 16
+NODATA = -32768
+
+# Series codes per month; the top code marks missing months
+SERIES_LEVELS = 255
+SERIES_NODATA = 255
+SERIES_HEADER_BYTES = 12
+
+# Stored stats value = round(physical value / scale)
+STAT_SCALES = {'count': 1.0, 'mean': 0.1, 'min': 0.1, 'max': 0.1, 'trend': 0.01}
+
+def _quantize(values: np.ndarray, scale: float) -> np.ndarray:
+    """Scale to int16, NaN and out-of-range values become NODATA."""
+    scaled = np.round(values / scale)
+    valid = np.isfinite(scaled) & (np.abs(scaled) < 32767)
+    return np.where(valid, scaled, NODATA).astype('<i2')
+
+def _encode_series(series: np.ndarray) -> tuple:
+    """
+    Quantize (cell, month) series in mm to uint8 over each cell's own range.
+    Returns (offset, scale, codes) with value = offset + code * scale.
+    """
+    valid = np.isfinite(series)
+    with np.errstate(invalid='ignore'):
+        low = np.where(valid, series, np.inf).min(axis=1)
+        high = np.where(valid, series, -np.inf).max(axis=1)
+    low = np.where(np.isfinite(low), low, 0.0)
+    span = np.where(np.isfinite(high), high - low, 0.0)
+    scale = np.where(span > 0, span / (SERIES_LEVELS - 1), 1.0)
+    codes = np.rint((np.where(valid, series, low[:, None]) - low[:, None]) / scale[:, None])
+    codes = np.where(valid, np.clip(codes, 0, SERIES_LEVELS - 1), SERIES_NODATA).astype('u1')
+    return low.astype('<f4'), scale.astype('<f4'), codes
+
+def _snap_sources(
+    land: np.ndarray,
+    nearest_row: np.ndarray,
+    nearest_col: np.ndarray,
+    latitude: np.ndarray,
+    longitude: np.ndarray,
+    max_snap_km: float
+) -> tuple:
+    """Source row/col for every cell: itself over ocean, the nearest ocean cell near the coast."""
+    distance_km = haversine_km(
+        latitude[:, None], longitude[None, :], latitude[nearest_row], longitude[nearest_col]
+    )
+
+    keep = ~land | (distance_km <= max_snap_km)
+    src_row = np.where(keep, nearest_row, -1).astype('<i2')
+    src_col = np.where(keep, nearest_col, -1).astype('<i2')
+    return src_row, src_col
+
+def export_static_bundle(
+    store_dir: Path = DEFAULT_STORE_DIR,
+    output_dir: Path = DEFAULT_OUTPUT_DIR,
+    index_path: Optional[Path] = DEFAULT_INDEX_PATH,
+    max_snap_km: float = MAX_SNAP_KM,
+    force: bool = False,
+    keep_previous: bool = False
+) -> str:
+    """
+    Export the consolidated store as a static, range-request friendly bundle.
+
+    Shards are built one band of SHARD_SIZE grid rows at a time, so memory
+    stays at one band of the cube.
+
+    Args:
+        store_dir: Consolidated store written by sla_ingest.py
+        output_dir: Bundle directory
+        index_path: Nearest ocean index from ocean_index.py (None disables snapping)
+        max_snap_km: Largest snap distance for coastal land cells
+        force: Re-export even if the bundle already matches the store version
+        keep_previous: Also keep the previous version for clients still holding
+            the old index (doubles the hosted size)
+
+    Returns:
+        Path to the bundle's index.json
+    """
+    store_dir = Path(store_dir)
+    output_dir = Path(output_dir)
+    manifest = load_manifest(store_dir)
+    if manifest is None:
+        raise FileNotFoundError(f"No consolidated store in {store_dir}; run sla_ingest.py first")
+
+    index_file = output_dir / "index.json"
+    version = manifest['data_version']
+    if index_file.exists() and not force:
+        with open(index_file) as f:
+            if json.load(f).get('dataVersion') == version:
+                logger.info(f"Static bundle already at data version {version}")
+                return str(index_file)
+
+    cube = open_cube(store_dir, manifest)
+    n_months, n_lat, n_lon = cube.shape
+    latitude = np.load(store_dir / "latitude.npy")
+    longitude = np.load(store_dir / "longitude.npy")
+
+    if index_path is not None and Path(index_path).exists():
+        with np.load(index_path) as index:
+            src_row, src_col = _snap_sources(
+                index['land'], index['nearest_row'], index['nearest_col'],
+                latitude, longitude, max_snap_km
+            )
+    else:
+        rows, cols = np.indices((n_lat, n_lon))
+        src_row, src_col = rows.astype('<i2'), cols.astype('<i2')
+
+    version_dir = output_dir / f"v{version}"
+    if version_dir.exists():
+        shutil.rmtree(version_dir)
+    logger.info(f"Exporting {n_months} months on a {n_lat}x{n_lon} grid to {version_dir}")
+
+    record_bytes = SERIES_HEADER_BYTES + n_months
+    shards_written = 0
+    for row0 in range(0, n_lat, SHARD_SIZE):
+        row1 = min(row0 + SHARD_SIZE, n_lat)
+        band_row = src_row[row0:row1]
+        band_col = src_col[row0:row1]
+        has_source = band_row >= 0
+
+        # Gather every source series for this band in one pass over the cube
+        records = np.zeros((row1 - row0, n_lon, record_bytes), dtype='u1')
+        records[..., SERIES_HEADER_BYTES:] = SERIES_NODATA
+        records[..., 0:2] = band_row.astype('<i2')[..., None].view('u1')
+        records[..., 2:4] = band_col.astype('<i2')[..., None].view('u1')
+        series = np.asarray(cube[:, band_row[has_source], band_col[has_source]]).T * 1000.0
+        offset, scale, codes = _encode_series(series)
+        records[has_source, 4:8] = offset[:, None].view('u1')
+        records[has_source, 8:12] = scale[:, None].view('u1')
+        records[has_source, SERIES_HEADER_BYTES:] = codes
+
+        for col0 in range(0, n_lon, SHARD_SIZE):
+            col1 = min(col0 + SHARD_SIZE, n_lon)
+            shard = records[:, col0:col1]
+            if np.all(shard[..., SERIES_HEADER_BYTES:] == SERIES_NODATA):
+                continue
+            # Pad edge shards to the full size so offsets stay fixed
+            padded = np.zeros((SHARD_SIZE, SHARD_SIZE, record_bytes), dtype='u1')
+            padded[..., 0:4] = np.full(2, -1, dtype='<i2').view('u1')
+            padded[..., SERIES_HEADER_BYTES:] = SERIES_NODATA
+            padded[:shard.shape[0], :shard.shape[1]] = shard
+            path = version_dir / "shards" / str(row0 // SHARD_SIZE) / f"{col0 // SHARD_SIZE}.bin"
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(padded.tobytes())
+            shards_written += 1
+
+    # Statistics grids, one contiguous (lat, lon) grid per calendar month
+    stats_dir = version_dir / "stats"
+    stats_dir.mkdir(parents=True, exist_ok=True)
+    for name in STAT_NAMES:
+        stats = np.load(store_dir / f"stats_{name}.npy", mmap_mode='r')
+        with open(stats_dir / f"{name}.i16", 'wb') as f:
+            for month in range(12):
+                f.write(_quantize(np.asarray(stats[month]), STAT_SCALES[name]).tobytes())
+
+    index = {
+        'formatVersion': 2,
+        'dataVersion': version,
+        'months': manifest['months'],
+        'grid': {
+            'lat0': float(latitude[0]),
+            'dlat': float(latitude[1] - latitude[0]),
+            'nlat': n_lat,
+            'lon0': float(longitude[0]),
+            'dlon': float(longitude[1] - longitude[0]),
+            'nlon': n_lon
+        },
+        'shardSize': SHARD_SIZE,
+        'shardPath': f"v{version}/shards/{{shardRow}}/{{shardCol}}.bin",
+        'recordBytes': record_bytes,
+        'series': {'unit': 'mm', 'dtype': 'uint8', 'headerBytes': SERIES_HEADER_BYTES, 'nodata': SERIES_NODATA},
+        'stats': {
+            'path': f"v{version}/stats/{{name}}.i16",
+            'unit': 'mm',
+            'dtype': 'int16',
+            'nodata': NODATA,
+            'scales': STAT_SCALES
+        }
+    }
+    tmp_file = index_file.with_suffix(".json.tmp")
+    with open(tmp_file, 'w') as f:
+        json.dump(index, f, separators=(',', ':'))
+    tmp_file.replace(index_file)
+
+    # Clients holding an old index refetch it when its shards are gone
+    keep = {f"v{version}", f"v{version - 1}"} if keep_previous else {f"v{version}"}
+    for old_dir in output_dir.glob("v*"):
+        if old_dir.is_dir() and old_dir.name not in keep:
+            shutil.rmtree(old_dir)
+
+    logger.info(f"Static bundle written: {shards_written} shards, data version {version}")
+    return str(index_file)
+
+def main():
+    """Main processing function."""
+    parser = argparse.ArgumentParser(description="Export the SLA store as a static bundle for the static frontend.")
+    parser.add_argument('--store-dir', default=str(DEFAULT_STORE_DIR), help='Consolidated store directory')
+    parser.add_argument('--output-dir', default=str(DEFAULT_OUTPUT_DIR), help='Bundle directory')
+    parser.add_argument('--max-snap-km', type=float, default=MAX_SNAP_KM, help='Largest coastal snap distance')
+    parser.add_argument('--force', action='store_true', help='Re-export even if the bundle is current')
+    parser.add_argument('--keep-previous', action='store_true', help='Keep the previous version too (CDN/object store hosting)')
+    args = parser.parse_args()
+
+    export_static_bundle(
+        Path(args.store_dir), Path(args.output_dir),
+        max_snap_km=args.max_snap_km, force=args.force, keep_previous=args.keep_previous
+    )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,22 @@
+"""Fixtures for the pipeline tests"""
+
+import pytest
+
+import sla_ingest
+
+
+@pytest.fixture
+def raw_dir(tmp_path):
+    path = tmp_path / "raw"
+    path.mkdir()
+    return path
+
+
+@pytest.fixture
+def store_dir(tmp_path, monkeypatch):
+    # The ingest builds the repo's nearest ocean index when it is missing
+    index_path = tmp_path / "nearest_ocean.npz"
+    index_path.touch()
+    monkeypatch.setattr(sla_ingest, 'DEFAULT_INDEX_PATH', index_path)
+    return tmp_path / "store"
+
@@ -0,0 +1,32 @@
+"""
+Synthetic DEM GeoTIFFs for the DEM processing tests
+A 0.005 degree ramp around New York harbour, small enough to convert and tile
+in well under a second.
+"""
+
+import numpy as np
+import rasterio
+from rasterio.transform import from_origin
+
+DEM_WEST, DEM_NORTH, DEM_RES = -74.3, 40.9, 0.005
+DEM_SHAPE = (120, 160)
+NODATA = -9999.0
+
+
+def ramp(shape=DEM_SHAPE) -> np.ndarray:
+    """Elevation rising 0.1 m per column and 0.05 m per row, nodata in the top-left corner"""
+    rows, cols = np.indices(shape)
+    data = (cols * 0.1 + rows * 0.05 - 2.0).astype('float32')
+    data[:10, :10] = NODATA
+    return data
+
+
+def write_geotiff(path, data: np.ndarray = None, west: float = DEM_WEST, north: float = DEM_NORTH):
+    """Striped (untiled) EPSG:4326 GeoTIFF, like most downloaded DEMs"""
+    data = ramp() if data is None else data
+    with rasterio.open(
+        path, 'w', driver='GTiff', height=data.shape[0], width=data.shape[1], count=1, dtype='float32',
+        crs='EPSG:4326', transform=from_origin(west, north, DEM_RES, DEM_RES), nodata=NODATA
+    ) as dst:
+        dst.write(data, 1)
+    return path
@@ -0,0 +1,49 @@
+"""
+Synthetic monthly SLA files for the pipeline tests
+A 10 degree global grid in the layout of the CMEMS files (0..360 longitudes,
+sla in meters, NaN over a land band), small enough to ingest in milliseconds.
+"""
+
+import os
+
+import numpy as np
+import xarray as xr
+
+LATITUDE = np.arange(-85.0, 90.0, 10.0)
+LONGITUDE = np.arange(5.0, 360.0, 10.0)
+
+
+def month_keys(start_year: int, n_months: int) -> list:
+    return [f"{start_year + i // 12}-{i % 12 + 1:02d}" for i in range(n_months)]
+
+
+def synthetic_grid(key: str, offset: float = 0.0) -> np.ndarray:
+    """Seasonal cycle plus trend plus noise (meters), NaN over a land band"""
+    year, month = int(key[:4]), int(key[5:7])
+    rng = np.random.default_rng(year * 100 + month)
+    t = year + (month - 0.5) / 12.0
+    grid = (
+        0.05 * np.sin(2 * np.pi * month / 12.0)
+        + 0.003 * (t - 2000.0)
+        + 0.02 * rng.standard_normal((len(LATITUDE), len(LONGITUDE)))
+        + offset
+    )
+    grid[:, 10:13] = np.nan
+    return grid.astype('float32')
+
+
+def write_month(data_dir, key: str, grid: np.ndarray = None):
+    """Write one monthly file named like the CMEMS downloads"""
+    grid = synthetic_grid(key) if grid is None else grid
+    path = data_dir / f"dt_global_twosat_phy_l4_{key[:4]}{key[5:7]}_vDT2021-M01.nc"
+    xr.Dataset(
+        {'sla': (('time', 'latitude', 'longitude'), grid[None])},
+        coords={'latitude': LATITUDE, 'longitude': LONGITUDE}
+    ).to_netcdf(path)
+    return path
+
+
+def touch_later(path, seconds: float = 10.0):
+    """Move a file's mtime forward so signature checks see a rewrite"""
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + int(seconds * 1e9)))
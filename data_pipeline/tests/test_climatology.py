@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+
+from climatology import decimal_year, derive_products, update_climatology, welford_update
+from sla_ingest import ingest
+from synthetic_sla import month_keys, write_month
+
+
+def random_months(n_years: int, shape=(4, 5), seed=0):
+    """(keys, values in mm) with a seasonal cycle, a trend and missing values"""
+    rng = np.random.default_rng(seed)
+    keys = month_keys(1995, 12 * n_years)
+    values = np.empty((len(keys),) + shape)
+    for i, key in enumerate(keys):
+        month = int(key[5:7])
+        values[i] = 40.0 * np.cos(month) + 3.0 * (decimal_year(key) - 1995) + 15.0 * rng.standard_normal(shape)
+    values[rng.random(values.shape) < 0.2] = np.nan
+    values[:, 0, 0] = np.nan
+    return keys, values
+
+
+def fold(keys, values):
+    state = np.zeros((12, 6) + values.shape[1:])
+    for key, grid in zip(keys, values):
+        welford_update(state[int(key[5:7]) - 1], decimal_year(key), grid)
+    return state
+
+
+@pytest.mark.filterwarnings("ignore:Mean of empty slice", "ignore:Degrees of freedom")
+def test_welford_matches_nanmean_and_nanstd():
+    keys, values = random_months(20)
+
+    clim_mean, clim_std, _ = derive_products(fold(keys, values))
+
+    for month in range(12):
+        sample = values[month::12]
+        np.testing.assert_allclose(clim_mean[month], np.nanmean(sample, axis=0), rtol=1e-5, equal_nan=True)
+        np.testing.assert_allclose(clim_std[month], np.nanstd(sample, axis=0, ddof=1), rtol=1e-5, equal_nan=True)
+    assert np.isnan(clim_mean[:, 0, 0]).all()
+
+
+def test_trend_matches_regression_with_monthly_means():
+    keys, values = random_months(15)
+    values[np.isnan(values)] = 0.0
+
+    _, _, trend = derive_products(fold(keys, values))
+
+    # Least squares on time plus one intercept per calendar month
+    t = np.array([decimal_year(key) for key in keys])
+    design = np.column_stack([t] + [[int(key[5:7]) == m for key in keys] for m in range(1, 13)]).astype(float)
+    coefficients, *_ = np.linalg.lstsq(design, values.reshape(len(keys), -1), rcond=None)
+    np.testing.assert_allclose(trend.ravel(), coefficients[0], rtol=1e-4)
+
+
+def test_incremental_update_matches_rebuild(raw_dir, store_dir):
+    keys = month_keys(2000, 30)
+    for key in keys[:18]:
+        write_month(raw_dir, key)
+    ingest(raw_dir, store_dir)
+    for key in keys[18:]:
+        write_month(raw_dir, key)
+    ingest(raw_dir, store_dir)
+    incremental = [np.load(store_dir / f"{name}.npy") for name in ("clim_mean", "clim_std", "anomaly_trend")]
+
+    update_climatology(store_dir, rebuild=True)
+
+    for name, array in zip(("clim_mean", "clim_std", "anomaly_trend"), incremental):
+        np.testing.assert_allclose(np.load(store_dir / f"{name}.npy"), array, rtol=1e-5, equal_nan=True)
@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+
+rasterio = pytest.importorskip("rasterio")
+from rasterio.warp import transform
+
+from dem_processing import DEM_NODATA, _iter_windows, _overview_factors, convert_dem_to_cog, process_dem_asset
+from synthetic_dem import DEM_NORTH, DEM_RES, DEM_WEST, ramp, write_geotiff
+
+
+@pytest.fixture
+def source(tmp_path):
+    return write_geotiff(tmp_path / "source.tif")
+
+
+def read(path):
+    with rasterio.open(path) as src:
+        return src.read(1), src.profile, src.overviews(1)
+
+
+def test_windowed_output_matches_a_single_window(source, tmp_path):
+    windowed = convert_dem_to_cog(source, tmp_path / "windowed.tif", block_size=32, window_size=32, workers=2)
+    whole = convert_dem_to_cog(source, tmp_path / "whole.tif", block_size=32, window_size=4096, workers=1)
+
+    data, profile, overviews = read(windowed)
+    np.testing.assert_array_equal(data, read(whole)[0])
+    assert profile['tiled'] and (profile['blockxsize'], profile['blockysize']) == (32, 32)
+    assert profile['compress'] == 'deflate' and profile['nodata'] == DEM_NODATA
+    assert overviews == _overview_factors(profile['width'], profile['height'], 32)
+    assert not (tmp_path / "windowed.tmp.tif").exists()
+
+
+def test_web_mercator_output_keeps_the_elevations(source, tmp_path):
+    path = convert_dem_to_cog(source, tmp_path / "dem.tif", block_size=32, workers=1)
+
+    lon, lat = DEM_WEST + 80.5 * DEM_RES, DEM_NORTH - 60.5 * DEM_RES
+    xs, ys = transform('EPSG:4326', 'EPSG:3857', [lon, DEM_WEST + 2 * DEM_RES], [lat, DEM_NORTH - 2 * DEM_RES])
+    with rasterio.open(path) as src:
+        assert src.crs.to_string() == 'EPSG:3857'
+        value, corner = (v[0] for v in src.sample(zip(xs, ys)))
+
+    assert value == pytest.approx(ramp()[60, 80], abs=0.1)
+    assert corner == DEM_NODATA
+
+
+def test_region_crops_the_output(source, tmp_path):
+    region = (DEM_WEST + 0.2, DEM_NORTH - 0.4, DEM_WEST + 0.5, DEM_NORTH - 0.1)
+
+    path = process_dem_asset(output_dir=tmp_path / "dem", region=region, source_path=source,
+                             dst_crs='EPSG:4326', block_size=32, workers=1)
+
+    data, profile, _ = read(path)
+    assert path.endswith("coastal_dem.tif")
+    assert profile['width'] == pytest.approx(0.3 / DEM_RES, abs=1)
+    assert profile['height'] == pytest.approx(0.3 / DEM_RES, abs=1)
+    np.testing.assert_allclose(data[0, 0], ramp()[20, 40], atol=0.1)
+
+
+def test_region_outside_the_source_is_rejected(source, tmp_path):
+    with pytest.raises(ValueError):
+        convert_dem_to_cog(source, tmp_path / "dem.tif", region=(10.0, 10.0, 11.0, 11.0), workers=1)
+
+
+def test_windows_cover_the_grid_once():
+    windows = list(_iter_windows(100, 70, 32))
+
+    covered = np.zeros((70, 100), dtype=int)
+    for col_off, row_off, width, height in windows:
+        covered[row_off:row_off + height, col_off:col_off + width] += 1
+    assert (covered == 1).all()
+    assert len(windows) == 4 * 3
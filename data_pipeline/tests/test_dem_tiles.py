@@ -0,0 +1,96 @@
+import numpy as np
+import pytest
+
+rasterio = pytest.importorskip("rasterio")
+from PIL import Image
+
+from dem_processing import (
+    TILE_SIZE, _render_parent_tiles, _tile_path, colorize_elevation, convert_dem_to_cog, generate_dem_tiles
+)
+from synthetic_dem import DEM_NORTH, DEM_RES, DEM_SHAPE, DEM_WEST, write_geotiff
+
+ZOOMS = range(7, 11)
+DEM_BOUNDS = (DEM_WEST, DEM_NORTH - DEM_SHAPE[0] * DEM_RES, DEM_WEST + DEM_SHAPE[1] * DEM_RES, DEM_NORTH)
+
+
+def lonlat_tile(lon: float, lat: float, z: int) -> tuple:
+    n = 2 ** z
+    return int((lon + 180) / 360 * n), int((1 - np.arcsinh(np.tan(np.radians(lat))) / np.pi) / 2 * n)
+
+
+def tiles_on_disk(tiles_dir, z: int) -> set:
+    return {(int(p.parent.name), int(p.stem)) for p in (tiles_dir / str(z)).glob("*/*.png")}
+
+
+def expected_tiles(z: int) -> set:
+    west, south, east, north = DEM_BOUNDS
+    x0, y0 = lonlat_tile(west, north, z)
+    x1, y1 = lonlat_tile(east, south, z)
+    return {(x, y) for x in range(x0, x1 + 1) for y in range(y0, y1 + 1)}
+
+
+@pytest.fixture
+def cog(tmp_path):
+    source = write_geotiff(tmp_path / "source.tif")
+    return convert_dem_to_cog(source, tmp_path / "dem.tif", block_size=32, workers=1)
+
+
+def test_pyramid_covers_the_dem_at_every_zoom(cog, tmp_path):
+    tiles_dir = tmp_path / "tiles"
+
+    generate_dem_tiles(cog, tiles_dir, zoom_levels=ZOOMS, workers=2, chunk_size=2)
+
+    for z in ZOOMS:
+        assert tiles_on_disk(tiles_dir, z) == expected_tiles(z)
+    with Image.open(_tile_path(tiles_dir, 7, *expected_tiles(7).pop(), 'png')) as image:
+        assert image.size == (TILE_SIZE, TILE_SIZE) and image.mode == 'RGBA'
+
+
+def test_parent_tiles_average_their_children(tmp_path):
+    tiles_dir = tmp_path / "tiles"
+    red = np.zeros((TILE_SIZE, TILE_SIZE, 4), dtype='uint8')
+    red[..., 0] = 200
+    red[..., 3] = 255
+    child = _tile_path(tiles_dir, 5, 10, 20, 'png')
+    child.parent.mkdir(parents=True)
+    Image.fromarray(red, 'RGBA').save(child)
+
+    written = _render_parent_tiles(4, [(5, 10), (6, 10)], str(tiles_dir), 'png')
+
+    with Image.open(_tile_path(tiles_dir, 4, 5, 10, 'png')) as image:
+        parent = np.asarray(image)
+    assert written == 1
+    assert not _tile_path(tiles_dir, 4, 6, 10, 'png').exists()
+    # Only the top-left quarter has data; it keeps the child's colour, not a darkened one
+    np.testing.assert_array_equal(parent[:TILE_SIZE // 2, :TILE_SIZE // 2], np.broadcast_to([200, 0, 0, 255], (128, 128, 4)))
+    assert not parent[TILE_SIZE // 2:, :, 3].any() and not parent[:, TILE_SIZE // 2:, 3].any()
+
+
+def test_dirty_rebuild_only_touches_the_dirty_region(cog, tmp_path):
+    tiles_dir = tmp_path / "tiles"
+    generate_dem_tiles(cog, tiles_dir, zoom_levels=ZOOMS, workers=1)
+    paths = {p: p.stat().st_mtime_ns for p in tiles_dir.rglob("*.png")}
+    # A tile left over from an older DEM, in the dirty region but outside the new one
+    stale = _tile_path(tiles_dir, 10, *lonlat_tile(DEM_WEST - 0.5, DEM_NORTH - 0.3, 10), 'png')
+    stale.parent.mkdir(parents=True, exist_ok=True)
+    stale.write_bytes(b'old')
+
+    dirty = (DEM_WEST - 0.5, DEM_NORTH - 0.35, DEM_WEST - 0.4, DEM_NORTH - 0.25)
+    generate_dem_tiles(cog, tiles_dir, zoom_levels=ZOOMS, workers=1, dirty_bounds=[dirty])
+
+    assert not stale.exists()
+    assert all(p.stat().st_mtime_ns == mtime for p, mtime in paths.items() if '/10/' in str(p))
+    for z in ZOOMS:
+        assert tiles_on_disk(tiles_dir, z) == expected_tiles(z)
+
+
+def test_colour_ramp_and_nodata():
+    rgba = colorize_elevation(np.array([[np.nan, 0.0, 2000.0]]))
+
+    assert rgba[0, 0, 3] == 0
+    np.testing.assert_array_equal(rgba[0, 1:], [[199, 233, 180, 255], [255, 255, 255, 255]])
+
+
+def test_unsupported_format_is_rejected(cog, tmp_path):
+    with pytest.raises(ValueError):
+        generate_dem_tiles(cog, tmp_path / "tiles", tile_format='jpg')
@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+from scipy.stats import genextreme
+
+from extremes import fit_extremes, fit_gev, gev_return_level, sample_lmoments
+
+# scipy's genextreme shape c has the same sign convention as Hosking's k
+SHAPES = (-0.2, 0.05, 0.25)
+
+
+def test_lmoments_match_direct_formula():
+    rng = np.random.default_rng(1)
+    sample = rng.gumbel(100.0, 20.0, size=(40, 1))
+    sample[[3, 17]] = np.nan
+
+    l1, l2, t3, count = sample_lmoments(sample)
+
+    x = np.sort(sample[~np.isnan(sample)])
+    n = len(x)
+    j = np.arange(n)
+    b0 = x.mean()
+    b1 = np.sum(j / (n - 1) * x) / n
+    b2 = np.sum(j * (j - 1) / ((n - 1) * (n - 2)) * x) / n
+    assert count[0] == n
+    np.testing.assert_allclose([l1[0], l2[0], t3[0]], [b0, 2 * b1 - b0, (6 * b2 - 6 * b1 + b0) / (2 * b1 - b0)])
+
+
+@pytest.mark.parametrize("shape", SHAPES)
+def test_gev_fit_recovers_scipy_parameters(shape):
+    sample = genextreme.rvs(shape, loc=500.0, scale=80.0, size=(20000, 1), random_state=7)
+
+    l1, l2, t3, _ = sample_lmoments(sample)
+    location, scale, k = fit_gev(l1, l2, t3)
+
+    assert location[0] == pytest.approx(500.0, rel=0.02)
+    assert scale[0] == pytest.approx(80.0, rel=0.05)
+    assert k[0] == pytest.approx(shape, abs=0.03)
+
+
+@pytest.mark.parametrize("shape", SHAPES + (0.0,))
+def test_return_levels_match_scipy(shape):
+    for period in (10, 50, 100):
+        expected = genextreme.isf(1.0 / period, shape, loc=500.0, scale=80.0)
+        assert float(gev_return_level(500.0, 80.0, np.float64(shape), period)) == pytest.approx(expected, rel=1e-9)
+
+
+def test_fit_extremes_needs_min_years():
+    maxima = genextreme.rvs(0.1, loc=300.0, scale=50.0, size=(30, 3, 2), random_state=3).astype('float32')
+    maxima[:25, 0, 0] = np.nan
+
+    gev, gumbel = fit_extremes(maxima, min_years=10, band_rows=2)
+
+    assert np.isnan(gev[:, 0, 0]).all() and np.isnan(gumbel[:, 0, 0]).all()
+    assert np.isfinite(gev[:, 1:]).all()
+    assert gev.shape == (3, 3, 2) and gumbel.shape == (2, 3, 2)
@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+from ocean_index import build_nearest_ocean_index, compute_nearest_ocean, haversine_km
+from synthetic_sla import LATITUDE, LONGITUDE, write_month
+
+
+def test_ocean_cells_map_to_themselves_and_land_to_the_nearest_ocean():
+    land = np.zeros((5, 8), dtype=bool)
+    land[1:4, 2:5] = True
+
+    rows, cols = compute_nearest_ocean(land)
+
+    ocean_rows, ocean_cols = np.nonzero(~land)
+    np.testing.assert_array_equal(rows[~land], ocean_rows)
+    np.testing.assert_array_equal(cols[~land], ocean_cols)
+    assert (rows[2, 2], cols[2, 2]) == (2, 1)
+    assert (rows[2, 4], cols[2, 4]) == (2, 5)
+    assert not land[rows, cols].any()
+
+
+def test_snapping_wraps_across_the_antimeridian():
+    land = np.ones((3, 12), dtype=bool)
+    land[:, [5, 11]] = False
+
+    _, cols = compute_nearest_ocean(land)
+    _, unwrapped = compute_nearest_ocean(land, wrap=False)
+
+    # Column 0 is one cell east of column 11 on the globe
+    assert cols[1, 0] == 11 and cols[1, 1] == 11
+    assert unwrapped[1, 0] == 5 and unwrapped[1, 1] == 5
+
+
+def test_index_is_built_from_a_monthly_file(raw_dir, tmp_path):
+    source = write_month(raw_dir, '2000-01')
+    output = tmp_path / "nearest_ocean.npz"
+
+    build_nearest_ocean_index(str(source), str(output))
+
+    with np.load(output) as index:
+        np.testing.assert_array_equal(index['latitude'], LATITUDE)
+        np.testing.assert_array_equal(index['longitude'], LONGITUDE)
+        # synthetic_sla's land band is columns 10..12
+        assert index['land'][:, 10:13].all() and index['land'].sum() == 3 * len(LATITUDE)
+        assert (index['nearest_col'][:, 10] == 9).all() and (index['nearest_col'][:, 12] == 13).all()
+        np.testing.assert_array_equal(index['nearest_row'][:, 11], np.arange(len(LATITUDE)))
+
+
+def test_haversine_km():
+    assert haversine_km(0.0, 0.0, 0.0, 1.0) == pytest.approx(111.19, abs=0.01)
+    assert haversine_km(10.0, 179.5, 10.0, -179.5) == pytest.approx(haversine_km(10.0, 0.0, 10.0, 1.0))
+    assert haversine_km(90.0, 0.0, -90.0, 0.0) == pytest.approx(np.pi * 6371.0)
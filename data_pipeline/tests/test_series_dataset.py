@@ -0,0 +1,88 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from jiayou_sat_data import sa_data
+from jiayou_sat_data import series_dataset
+from jiayou_sat_data.series_dataset import append_series, compact_series, last_exported, load_series
+
+DATES = pd.date_range('2000-01-01', periods=36, freq='MS') + pd.Timedelta(days=14)
+
+
+def station_frame(series_id, dates=DATES):
+    return pd.DataFrame({
+        'series_id': str(series_id), 'station_id': int(series_id), 'name': f"station {series_id}",
+        'lat': 10.0, 'lon': 20.0, 'cell_lat': None, 'cell_lon': None, 'snap_km': None,
+        'date': dates, 'sla': np.arange(len(dates), dtype='float32') + int(series_id)
+    })
+
+
+def part_counts(dataset_dir):
+    return [len(list(year_dir.glob("part-*.parquet"))) for year_dir in sorted(dataset_dir.glob("year=*"))]
+
+
+def test_single_station_appends_are_compacted(tmp_path, monkeypatch):
+    monkeypatch.setattr(series_dataset, 'COMPACT_FILES', 4)
+    dataset_dir = tmp_path / "series"
+
+    for station in range(10):
+        append_series(station_frame(station), dataset_dir)
+
+    assert max(part_counts(dataset_dir)) <= 4
+    frame = load_series(dataset_dir)
+    assert len(frame) == 10 * len(DATES)
+    assert not frame.duplicated(['series_id', 'date']).any()
+    assert compact_series(dataset_dir) > 0
+    assert part_counts(dataset_dir) == [1, 1, 1]
+    pd.testing.assert_frame_equal(load_series(dataset_dir), frame)
+
+
+def test_lookup_of_known_series_reads_only_the_newest_year(tmp_path):
+    dataset_dir = tmp_path / "series"
+    append_series(station_frame(1), dataset_dir)
+    append_series(station_frame(2, DATES[:12]), dataset_dir)
+    # A file a full scan would fail on
+    (dataset_dir / "year=2000" / "part-broken.parquet").write_bytes(b'not parquet')
+
+    assert last_exported(dataset_dir, ['1']) == {'1': DATES[-1]}
+    with pytest.raises(Exception):
+        last_exported(dataset_dir)
+
+
+def test_rows_seen_twice_during_compaction_are_dropped(tmp_path):
+    dataset_dir = tmp_path / "series"
+    append_series(station_frame(1), dataset_dir)
+    part = next((dataset_dir / "year=2001").glob("part-*.parquet"))
+    part.with_name("part-copy.parquet").write_bytes(part.read_bytes())
+
+    assert len(load_series(dataset_dir)) == len(DATES)
+
+
+@pytest.fixture
+def station_source(monkeypatch):
+    calls = []
+
+    def read_satellite_data(lat, lon, **kwargs):
+        calls.append((lat, lon))
+        return pd.DataFrame({'date': DATES.strftime('%Y-%m-%d'), 'sla': np.linspace(-0.1, 0.1, len(DATES))})
+
+    monkeypatch.setattr(sa_data, 'resolve_station', lambda station: (12, 40.7, -74.0))
+    monkeypatch.setattr(sa_data, 'read_satellite_data', read_satellite_data)
+    return calls
+
+
+def test_station_series_has_one_shape_fresh_or_cached(tmp_path, station_source):
+    fresh = sa_data.read_satellite_data_station(12, dataset_dir=tmp_path / "series")
+    cached = sa_data.read_satellite_data_station(12, dataset_dir=tmp_path / "series")
+
+    assert len(station_source) == 1
+    assert list(fresh.columns) == ['date', 'sla']
+    assert fresh['date'].dtype == 'datetime64[ns]' and fresh['sla'].dtype == 'float32'
+    pd.testing.assert_frame_equal(cached, fresh)
+
+
+def test_save_dir_is_deprecated_but_honoured(tmp_path, station_source):
+    with pytest.deprecated_call():
+        sa_data.read_satellite_data_station(12, save_dir=str(tmp_path))
+
+    assert last_exported(tmp_path / "sla_series") == {'12': DATES[-1]}
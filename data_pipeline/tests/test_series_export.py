@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+
+from jiayou_sat_data.series_dataset import append_series, last_exported, load_series
+from series_export import export_series, point_series_id, store_series
+from sla_ingest import ingest
+from synthetic_sla import month_keys, synthetic_grid, write_month
+
+
+def point(lat, lon):
+    return {'series_id': point_series_id(lat, lon), 'station_id': None, 'name': None, 'lat': lat, 'lon': lon}
+
+
+POINTS = [point(15.0, -175.0), point(-25.0, 45.0)]
+
+
+def test_export_appends_only_new_months(tmp_path, raw_dir, store_dir):
+    dataset_dir = tmp_path / "series"
+    keys = month_keys(2000, 14)
+    for key in keys[:12]:
+        write_month(raw_dir, key)
+    ingest(raw_dir, store_dir)
+
+    assert export_series(POINTS, store_dir, dataset_dir, index_path=None) == 24
+    assert export_series(POINTS, store_dir, dataset_dir, index_path=None) == 0
+
+    for key in keys[12:]:
+        write_month(raw_dir, key)
+    ingest(raw_dir, store_dir)
+    assert export_series(POINTS + [POINTS[0]], store_dir, dataset_dir, index_path=None) == 4
+
+    frame = load_series(dataset_dir)
+    assert len(frame) == 28
+    assert not frame.duplicated(['series_id', 'date']).any()
+    assert last_exported(dataset_dir)[POINTS[0]['series_id']] == pd.Timestamp('2001-02-15')
+
+    # Values come from the cell under the point (lat 15 is row 10, lon -175 is col 18)
+    series = frame[frame['series_id'] == POINTS[0]['series_id']]
+    expected = [synthetic_grid(key)[10, 18] for key in keys]
+    np.testing.assert_allclose(series['sla'].to_numpy(), expected, rtol=1e-6)
+
+
+def test_append_drops_rows_already_exported(tmp_path, raw_dir, store_dir):
+    dataset_dir = tmp_path / "series"
+    for key in month_keys(2000, 6):
+        write_month(raw_dir, key)
+    ingest(raw_dir, store_dir)
+    frame = store_series(POINTS, store_dir=store_dir, index_path=None)
+
+    assert append_series(frame.iloc[:8], dataset_dir) == 8
+    assert append_series(frame, dataset_dir) == len(frame) - 8
+    assert append_series(frame, dataset_dir) == 0
+    assert len(load_series(dataset_dir)) == len(frame)
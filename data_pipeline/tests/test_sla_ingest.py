@@ -0,0 +1,103 @@
+import numpy as np
+import pytest
+
+from sla_ingest import CUBE_FILENAME, ingest, load_manifest, open_cube
+from synthetic_sla import month_keys, synthetic_grid, touch_later, write_month
+
+
+def cube_month(store_dir, key):
+    manifest = load_manifest(store_dir)
+    return np.asarray(open_cube(store_dir, manifest)[manifest['months'].index(key)])
+
+
+@pytest.mark.filterwarnings("ignore:Mean of empty slice")
+def test_first_ingest_builds_version_1(raw_dir, store_dir):
+    keys = month_keys(2000, 24)
+    for key in keys:
+        write_month(raw_dir, key)
+
+    manifest = ingest(raw_dir, store_dir)
+
+    assert manifest['data_version'] == 1
+    assert manifest['months'] == keys
+    assert manifest['changed_months'] == keys
+    np.testing.assert_array_equal(cube_month(store_dir, '2001-07'), synthetic_grid('2001-07'))
+
+    # Statistics (mm) per calendar month match a direct reduction of the cube
+    cube = np.asarray(open_cube(store_dir, manifest))
+    januaries = cube[[keys.index(k) for k in keys if k.endswith('-01')]]
+    expected = np.nanmean(januaries, axis=0) * 1000.0
+    np.testing.assert_allclose(np.load(store_dir / "stats_mean.npy")[0], expected, rtol=1e-5, equal_nan=True)
+
+
+def test_unchanged_files_keep_the_version(raw_dir, store_dir):
+    for key in month_keys(2000, 12):
+        write_month(raw_dir, key)
+    ingest(raw_dir, store_dir)
+    cube_inode = (store_dir / CUBE_FILENAME).stat().st_ino
+
+    manifest = ingest(raw_dir, store_dir)
+
+    assert manifest['data_version'] == 1
+    assert (store_dir / CUBE_FILENAME).stat().st_ino == cube_inode
+
+
+def test_new_months_are_appended(raw_dir, store_dir):
+    for key in month_keys(2000, 12):
+        write_month(raw_dir, key)
+    ingest(raw_dir, store_dir)
+    before = cube_month(store_dir, '2000-05')
+
+    for key in ('2001-01', '2001-02'):
+        write_month(raw_dir, key)
+    manifest = ingest(raw_dir, store_dir)
+
+    assert manifest['data_version'] == 2
+    assert manifest['months'][-2:] == ['2001-01', '2001-02']
+    assert manifest['changed_months'] == ['2001-01', '2001-02']
+    np.testing.assert_array_equal(cube_month(store_dir, '2000-05'), before)
+    np.testing.assert_array_equal(cube_month(store_dir, '2001-02'), synthetic_grid('2001-02'))
+
+
+def test_replaced_month_is_rewritten_in_a_new_cube(raw_dir, store_dir):
+    for key in month_keys(2000, 12):
+        write_month(raw_dir, key)
+    ingest(raw_dir, store_dir)
+    reader = open_cube(store_dir, load_manifest(store_dir))
+    old_march = np.array(reader[2])
+
+    replacement = synthetic_grid('2000-03', offset=0.5)
+    touch_later(write_month(raw_dir, '2000-03', replacement))
+    manifest = ingest(raw_dir, store_dir)
+
+    assert manifest['data_version'] == 2
+    assert manifest['changed_months'] == ['2000-03']
+    np.testing.assert_array_equal(cube_month(store_dir, '2000-03'), replacement)
+    # A reader that mapped the old cube still sees it intact
+    np.testing.assert_array_equal(reader[2], old_march)
+
+
+def test_back_filled_month_rebuilds_with_a_higher_version(raw_dir, store_dir):
+    keys = month_keys(2000, 12)
+    for key in keys[:5] + keys[6:]:
+        write_month(raw_dir, key)
+    ingest(raw_dir, store_dir)
+
+    write_month(raw_dir, keys[5])
+    manifest = ingest(raw_dir, store_dir)
+
+    assert manifest['data_version'] == 2
+    assert manifest['months'] == keys
+    np.testing.assert_array_equal(cube_month(store_dir, keys[5]), synthetic_grid(keys[5]))
+
+
+def test_up_to_date_store_gets_missing_products(raw_dir, store_dir):
+    for key in month_keys(2000, 12):
+        write_month(raw_dir, key)
+    ingest(raw_dir, store_dir)
+    (store_dir / "climatology.json").unlink()
+
+    manifest = ingest(raw_dir, store_dir)
+
+    assert manifest['data_version'] == 1
+    assert (store_dir / "climatology.json").exists()
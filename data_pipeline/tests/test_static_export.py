@@ -0,0 +1,77 @@
+import json
+
+import numpy as np
+import pytest
+
+from ocean_index import haversine_km
+from sla_ingest import ingest, load_manifest, open_cube
+from static_export import SERIES_HEADER_BYTES, SERIES_NODATA, SHARD_SIZE, _snap_sources, export_static_bundle
+from synthetic_sla import LATITUDE, LONGITUDE, month_keys, write_month
+
+
+def read_record(output_dir, index, row, col):
+    """Decode one cell's record the way the static frontend does"""
+    shard_row, shard_col = row // SHARD_SIZE, col // SHARD_SIZE
+    path = output_dir / index['shardPath'].format(shardRow=shard_row, shardCol=shard_col)
+    offset = ((row % SHARD_SIZE) * SHARD_SIZE + col % SHARD_SIZE) * index['recordBytes']
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        record = f.read(index['recordBytes'])
+    src_row, src_col = np.frombuffer(record, '<i2', count=2)
+    value_offset, scale = np.frombuffer(record, '<f4', count=2, offset=4)
+    codes = np.frombuffer(record, 'u1', offset=SERIES_HEADER_BYTES)
+    return (int(src_row), int(src_col)), value_offset, scale, codes
+
+
+@pytest.fixture
+def bundle(raw_dir, store_dir, tmp_path):
+    for key in month_keys(2000, 14):
+        write_month(raw_dir, key)
+    ingest(raw_dir, store_dir)
+    output_dir = tmp_path / "static"
+    with open(export_static_bundle(store_dir, output_dir, index_path=None)) as f:
+        return output_dir, json.load(f)
+
+
+def test_records_sit_at_their_computed_offsets(bundle, store_dir):
+    output_dir, index = bundle
+    manifest = load_manifest(store_dir)
+    cube = np.asarray(open_cube(store_dir, manifest)) * 1000.0
+
+    assert index['formatVersion'] == 2
+    assert index['recordBytes'] == SERIES_HEADER_BYTES + 14
+    assert index['grid']['nlat'] == len(LATITUDE) and index['grid']['nlon'] == len(LONGITUDE)
+    # Last row and column sit in a padded edge shard
+    for row, col in [(0, 0), (5, 20), (17, 35)]:
+        source, value_offset, scale, codes = read_record(output_dir, index, row, col)
+        assert source == (row, col)
+        np.testing.assert_allclose(value_offset + codes * scale, cube[:, row, col], atol=scale / 2 + 1e-3)
+
+
+def test_land_and_padding_records(bundle):
+    output_dir, index = bundle
+    shard = output_dir / index['shardPath'].format(shardRow=1, shardCol=2)
+
+    assert shard.stat().st_size == SHARD_SIZE * SHARD_SIZE * index['recordBytes']
+    source, _, _, codes = read_record(output_dir, index, 3, 11)
+    assert source == (3, 11) and (codes == SERIES_NODATA).all()
+    # Grid row 18 is past the edge of the 18 row grid
+    source, _, _, codes = read_record(output_dir, index, 18, 33)
+    assert source == (-1, -1) and (codes == SERIES_NODATA).all()
+
+
+def test_coastal_cells_snap_within_the_limit():
+    latitude = np.array([-10.0, 0.0, 10.0])
+    longitude = np.array([0.0, 10.0, 20.0])
+    land = np.zeros((3, 3), dtype=bool)
+    land[:, 1:] = True
+    nearest_row, nearest_col = np.indices((3, 3))
+    nearest_col[:, 1:] = 0
+    step_km = haversine_km(0.0, 0.0, 0.0, 10.0)
+
+    src_row, src_col = _snap_sources(land, nearest_row, nearest_col, latitude, longitude, 1.5 * step_km)
+
+    # Ocean cells read themselves, one step inland snaps, two steps is inland
+    np.testing.assert_array_equal(src_col[1], [0, 0, -1])
+    np.testing.assert_array_equal(src_row[1], [1, 1, -1])
+    assert step_km == pytest.approx(1111.95, abs=0.01)
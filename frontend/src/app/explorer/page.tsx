@@ -17,6 +17,10 @@ const TileLayerSLA = dynamic(() => import('@/components/map/layers/TileLayerSLA'
   ssr: false
 });
 
+const TileLayerAnomaly = dynamic(() => import('@/components/map/layers/TileLayerAnomaly'), {
+  ssr: false
+});
+
 const TileLayerDEM = dynamic(() => import('@/components/map/layers/TileLayerDEM'), {
   ssr: false
 });
@@ -101,6 +105,17 @@ export default function ExplorerPage() {
                           Sea Level Anomaly
                         </span>
                       </label>
+                      <label className="flex items-center">
+                        <input
+                          type="checkbox"
+                          checked={activeLayers.anomaly}
+                          onChange={() => toggleLayer('anomaly')}
+                          className="h-4 w-4 text-blue-600 focus:ring-blue-500 border-gray-300 rounded"
+                        />
+                        <span className="ml-2 text-sm text-gray-700 dark:text-gray-300">
+                          Standardized Anomaly
+                        </span>
+                      </label>
                       <label className="flex items-center">
                         <input
                           type="checkbox"
@@ -129,6 +144,7 @@ export default function ExplorerPage() {
         <div className="flex-1 relative">
           <InteractiveMap center={[40.7128, -74.0060]} zoom={8}>
             <TileLayerSLA />
+            <TileLayerAnomaly />
             <TileLayerDEM />
           </InteractiveMap>
         </div>
@@ -20,6 +20,10 @@ const TileLayerDEM = dynamic(() => import('@/components/map/layers/TileLayerDEM'
   ssr: false
 });
 
+const FloodScenarioSweep = dynamic(() => import('@/components/map/FloodScenarioSweep'), {
+  ssr: false
+});
+
 const TileLayerFloodDEM = dynamic(() => import('@/components/map/layers/TileLayerFloodDEM'), {
   ssr: false
 });
@@ -153,6 +157,7 @@ export default function FloodMapperPage() {
           <InteractiveMap center={[40.7128, -74.0060]} zoom={8}>
             <TileLayerDEM />
             <TileLayerFloodDEM />
+            <FloodScenarioSweep />
           </InteractiveMap>
         </div>
       </div>
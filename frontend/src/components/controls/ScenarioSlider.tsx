@@ -3,7 +3,12 @@
 import { useAppStore } from '@/store/useAppStore';
 
 export default function ScenarioSlider() {
-  const { scenarioMeters, setScenarioMeters } = useAppStore();
+  const { scenarioMeters, setScenarioMeters, floodSweep } = useAppStore();
+
+  // The sweep covers every slider step, so moving the slider needs no request
+  const current = floodSweep?.scenarios.reduce((best, s) =>
+    Math.abs(s.scenario - scenarioMeters) < Math.abs(best.scenario - scenarioMeters) ? s : best
+  );
 
   return (
     <div className="space-y-4">
@@ -35,6 +40,12 @@ export default function ScenarioSlider() {
         <p className="mt-1">
           <strong>Current scenario:</strong> {scenarioMeters === 0 ? 'Present day' : `+${scenarioMeters}m SLR`}
         </p>
+        {floodSweep && current && (
+          <p className="mt-1">
+            <strong>Inundated in view:</strong> {current.inundatedAreaKm2.toFixed(1)} km²
+            ({(current.fraction * 100).toFixed(1)}% of land, {current.exposedCells.toLocaleString()} cells)
+          </p>
+        )}
       </div>
     </div>
   );
@@ -0,0 +1,50 @@
+'use client';
+
+import { useEffect } from 'react';
+import { useMap } from 'react-leaflet';
+import { useAppStore } from '@/store/useAppStore';
+import { dataClient } from '@/lib/dataClient';
+
+// Fetches inundated areas for every slider step over the visible map region
+export default function FloodScenarioSweep() {
+  const map = useMap();
+  const { activeLayers, setFloodSweep } = useAppStore();
+
+  useEffect(() => {
+    if (!activeLayers.flood) {
+      setFloodSweep(null);
+      return;
+    }
+
+    let controller: AbortController | null = null;
+
+    const update = () => {
+      controller?.abort();
+      controller = new AbortController();
+      const bounds = map.getBounds();
+      dataClient
+        .getFloodScenarios(
+          [bounds.getWest(), bounds.getSouth(), bounds.getEast(), bounds.getNorth()],
+          undefined,
+          controller.signal
+        )
+        .then(setFloodSweep)
+        .catch((error) => {
+          if (error.name !== 'AbortError') {
+            console.warn('Flood scenario sweep failed:', error.message);
+            setFloodSweep(null);
+          }
+        });
+    };
+
+    update();
+    map.on('moveend', update);
+
+    return () => {
+      map.off('moveend', update);
+      controller?.abort();
+    };
+  }, [map, activeLayers.flood, setFloodSweep]);
+
+  return null;
+}
@@ -0,0 +1,38 @@
+'use client';
+
+import { useEffect } from 'react';
+import { useMap } from 'react-leaflet';
+import L from 'leaflet';
+import { useAppStore } from '@/store/useAppStore';
+import { dataClient } from '@/lib/dataClient';
+
+export default function TileLayerAnomaly() {
+  const map = useMap();
+  const { selectedYear, selectedMonth, activeLayers } = useAppStore();
+
+  useEffect(() => {
+    if (!activeLayers.anomaly) return;
+
+    // Standardized anomaly against the monthly climatology (-3 to +3 sigma)
+    const anomalyLayer = L.tileLayer(
+      dataClient.buildTileUrl('anomaly', '{z}', '{x}', '{y}', {
+        year: selectedYear,
+        month: selectedMonth,
+      }),
+      {
+        attribution: 'Sea Level Anomaly Data: NOAA/NASA',
+        opacity: 0.7,
+        zIndex: 2,
+      }
+    );
+
+    // Add layer to map
+    anomalyLayer.addTo(map);
+
+    return () => {
+      map.removeLayer(anomalyLayer);
+    };
+  }, [map, selectedYear, selectedMonth, activeLayers.anomaly]);
+
+  return null;
+}
@@ -15,7 +15,10 @@ export default function TileLayerSLA() {
 
     // Create SLA tile layer
     const slaLayer = L.tileLayer(
-      dataClient.buildTileUrl('slr', '{z}', '{x}', '{y}'),
+      dataClient.buildTileUrl('slr', '{z}', '{x}', '{y}', {
+        year: selectedYear,
+        month: selectedMonth,
+      }),
       {
         attribution: 'Sea Level Anomaly Data: NOAA/NASA',
         opacity: 0.7,
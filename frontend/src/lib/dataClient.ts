@@ -1,14 +1,18 @@
 import { Catalog } from '@/types/catalog';
-import { TimeSeries } from '@/types/analytics';
+import { TimeSeries, FloodScenarioSweep, SlaGrid, SlaGridDtype, SlaGridInfo } from '@/types/analytics';
 import { StormCollection } from '@/types/storm';
+import { StaticDataClient, computeTimeSeriesStats } from '@/lib/staticData';
 
 const TILES_BASE_URL = process.env.NEXT_PUBLIC_TILES_BASE_URL || '';
 const CATALOG_URL = process.env.NEXT_PUBLIC_DATA_CATALOG_URL || '';
 const USE_MOCK_DATA = process.env.NEXT_PUBLIC_USE_MOCK_DATA === 'true';
 const BACKEND_API_URL = process.env.NEXT_PUBLIC_BACKEND_API_URL || 'http://localhost:5001';
+// Static SLA bundle (data_pipeline/static_export.py); when set, point queries need no backend
+const STATIC_DATA_URL = process.env.NEXT_PUBLIC_STATIC_DATA_URL || '';
 
 export class DataClient {
   private static instance: DataClient;
+  private staticData: StaticDataClient | null = STATIC_DATA_URL ? new StaticDataClient(STATIC_DATA_URL) : null;
   
   private constructor() {}
   
@@ -95,6 +99,57 @@ export class DataClient {
     return url;
   }
   
+  // Inundated area for many sea-level-rise scenarios over a region in one request
+  async getFloodScenarios(
+    bbox: [number, number, number, number],
+    scenarios?: number[],
+    signal?: AbortSignal
+  ): Promise<FloodScenarioSweep> {
+    const params = new URLSearchParams({ bbox: bbox.join(',') });
+    if (scenarios) params.append('scenarios', scenarios.join(','));
+
+    const response = await fetch(`${BACKEND_API_URL}/api/flood-scenarios?${params.toString()}`, { signal });
+    if (!response.ok) {
+      throw new Error(`Failed to fetch flood scenarios: ${response.statusText}`);
+    }
+    return response.json();
+  }
+
+  async getSlaGrid(
+    year: number,
+    month: number,
+    options: {
+      bbox?: [number, number, number, number];
+      stride?: number;
+      dtype?: SlaGridDtype;
+      vmin?: number;
+      vmax?: number;
+      signal?: AbortSignal;
+    } = {}
+  ): Promise<SlaGrid> {
+    const { bbox, stride, dtype, vmin, vmax, signal } = options;
+    const params = new URLSearchParams({ year: String(year), month: String(month) });
+    if (bbox) params.append('bbox', bbox.join(','));
+    if (stride) params.append('stride', String(stride));
+    if (dtype) params.append('dtype', dtype);
+    if (vmin !== undefined) params.append('vmin', String(vmin));
+    if (vmax !== undefined) params.append('vmax', String(vmax));
+
+    const response = await fetch(`${BACKEND_API_URL}/api/sla-grid?${params.toString()}`, { signal });
+    if (!response.ok) {
+      throw new Error(`Failed to fetch SLA grid: ${response.statusText}`);
+    }
+    const info: SlaGridInfo = JSON.parse(response.headers.get('X-Grid-Info') || '{}');
+    const buffer = await response.arrayBuffer();
+    // The body is little-endian, which is the byte order of every browser platform
+    const data = info.dtype === 'uint8'
+      ? new Uint8Array(buffer)
+      : info.dtype === 'uint16'
+        ? new Uint16Array(buffer)
+        : new Float32Array(buffer);
+    return { info, data };
+  }
+
   buildCOGUrl(layer: string, filename: string): string {
     if (USE_MOCK_DATA) {
       return `/mock/cogs/${layer}/${filename}`;
@@ -217,6 +272,23 @@ export class DataClient {
       };
     }
 
+    if (this.staticData) {
+      const monthNumber = Number(month || '1');
+      const [timeSeries, seaLevel] = await Promise.all([
+        this.staticData.getTimeSeries(lat, lon, monthNumber),
+        this.staticData.getSeaLevel(lat, lon, Number(year || '2020'), monthNumber),
+      ]);
+      if (timeSeries.data.length === 0) {
+        throw new Error(`No SLA data available for location (${lat}, ${lon})`);
+      }
+      return {
+        elevation: null,
+        seaLevel,
+        timeSeries,
+        stats: computeTimeSeriesStats(timeSeries.data),
+      };
+    }
+
     // Call the backend API
     const params = new URLSearchParams({
       lat: lat.toString(),
@@ -247,6 +319,11 @@ export class DataClient {
       return Math.random() * 10;
     }
 
+    // The static bundle carries no DEM
+    if (this.staticData) {
+      return null;
+    }
+
     const params = new URLSearchParams({
       lat: lat.toString(),
       lon: lon.toString(),
@@ -269,6 +346,10 @@ export class DataClient {
       return Math.random() * 100 - 50;
     }
 
+    if (this.staticData) {
+      return this.staticData.getSeaLevel(lat, lon, Number(year || '2020'), Number(month || '1'));
+    }
+
     const params = new URLSearchParams({
       lat: lat.toString(),
       lon: lon.toString(),
@@ -292,6 +373,10 @@ export class DataClient {
       return this.getMockTimeSeries(lat, lon);
     }
 
+    if (this.staticData) {
+      return this.staticData.getTimeSeries(lat, lon, Number(month || '1'));
+    }
+
     const params = new URLSearchParams({
       lat: lat.toString(),
       lon: lon.toString(),
@@ -0,0 +1,174 @@
+import { TimeSeries, TimeSeriesPoint, AnalyticsStats } from '@/types/analytics';
+
+// Static SLA bundle written by data_pipeline/static_export.py
+export interface StaticIndex {
+  formatVersion: number;
+  dataVersion: number;
+  months: string[];
+  grid: {
+    lat0: number;
+    dlat: number;
+    nlat: number;
+    lon0: number;
+    dlon: number;
+    nlon: number;
+  };
+  shardSize: number;
+  shardPath: string;
+  recordBytes: number;
+  // Record: int16 source row/col, float32 offset/scale, one uint8 code per month
+  series: { unit: string; dtype: 'uint8'; headerBytes: number; nodata: number };
+  stats: { path: string; unit: string; dtype: 'int16'; nodata: number; scales: Record<string, number> };
+}
+
+export interface StaticCellHistory {
+  // Grid cell the series was read from (nearest ocean cell for coastal land cells)
+  gridCell: { lat: number; lon: number } | null;
+  months: string[];
+  values: (number | null)[];
+}
+
+export class StaticDataClient {
+  private indexPromise: Promise<StaticIndex> | null = null;
+
+  constructor(private baseUrl: string) {}
+
+  getIndex(): Promise<StaticIndex> {
+    if (!this.indexPromise) {
+      this.indexPromise = fetch(`${this.baseUrl}/index.json`, { cache: 'no-cache' }).then((response) => {
+        if (!response.ok) {
+          throw new Error(`Failed to fetch static data index: ${response.statusText}`);
+        }
+        return response.json();
+      });
+      // Allow a retry after a failed fetch
+      this.indexPromise.catch(() => {
+        this.indexPromise = null;
+      });
+    }
+    return this.indexPromise;
+  }
+
+  // Full monthly history of the cell containing a point, fetched with one ranged GET
+  async getCellHistory(lat: number, lon: number, retried = false): Promise<StaticCellHistory> {
+    const index = await this.getIndex();
+    const { grid, shardSize, recordBytes, series } = index;
+
+    const row = Math.min(Math.max(Math.round((lat - grid.lat0) / grid.dlat), 0), grid.nlat - 1);
+    const lon360 = ((lon % 360) + 360) % 360;
+    const col = ((Math.round((lon360 - grid.lon0) / grid.dlon) % grid.nlon) + grid.nlon) % grid.nlon;
+
+    const path = index.shardPath
+      .replace('{shardRow}', String(Math.floor(row / shardSize)))
+      .replace('{shardCol}', String(Math.floor(col / shardSize)));
+    const offset = ((row % shardSize) * shardSize + (col % shardSize)) * recordBytes;
+
+    const empty: StaticCellHistory = { gridCell: null, months: index.months, values: index.months.map(() => null) };
+
+    const response = await fetch(`${this.baseUrl}/${path}`, {
+      headers: { Range: `bytes=${offset}-${offset + recordBytes - 1}` },
+    });
+    // Shards without any data are not exported; only the current version is
+    // kept, so a 404 may also mean this index is stale
+    if (response.status === 404) {
+      if (retried) {
+        return empty;
+      }
+      this.indexPromise = null;
+      const fresh = await this.getIndex();
+      return fresh.dataVersion === index.dataVersion ? empty : this.getCellHistory(lat, lon, true);
+    }
+    if (!response.ok) {
+      throw new Error(`Failed to fetch static data shard: ${response.statusText}`);
+    }
+
+    let buffer = await response.arrayBuffer();
+    // Servers that ignore Range return the whole shard
+    if (response.status !== 206 && buffer.byteLength > recordBytes) {
+      buffer = buffer.slice(offset, offset + recordBytes);
+    }
+
+    const view = new DataView(buffer);
+    const srcRow = view.getInt16(0, true);
+    const srcCol = view.getInt16(2, true);
+    if (srcRow < 0 || srcCol < 0) {
+      return empty;
+    }
+
+    const offsetMm = view.getFloat32(4, true);
+    const scaleMm = view.getFloat32(8, true);
+    const values = index.months.map((_, i) => {
+      const code = view.getUint8(series.headerBytes + i);
+      return code === series.nodata ? null : offsetMm + code * scaleMm;
+    });
+    const cellLon = grid.lon0 + srcCol * grid.dlon;
+
+    return {
+      gridCell: { lat: grid.lat0 + srcRow * grid.dlat, lon: cellLon > 180 ? cellLon - 360 : cellLon },
+      months: index.months,
+      values,
+    };
+  }
+
+  // Same shape as the backend's /api/timeseries for one calendar month
+  async getTimeSeries(lat: number, lon: number, month: number): Promise<TimeSeries> {
+    const history = await this.getCellHistory(lat, lon);
+    const data: TimeSeriesPoint[] = [];
+    history.months.forEach((key, i) => {
+      const value = history.values[i];
+      if (Number(key.slice(5, 7)) === month && value !== null) {
+        data.push({ date: `${key}-15`, value: Math.round(value * 100) / 100 });
+      }
+    });
+    return {
+      data,
+      unit: 'mm',
+      variable: 'Sea Level Anomaly',
+      location: { lat, lon },
+    };
+  }
+
+  async getSeaLevel(lat: number, lon: number, year: number, month: number): Promise<number | null> {
+    const history = await this.getCellHistory(lat, lon);
+    const i = history.months.indexOf(`${year}-${String(month).padStart(2, '0')}`);
+    return i >= 0 ? history.values[i] : null;
+  }
+}
+
+// Mirrors the statistics computed by the backend's /api/point-analytics
+export function computeTimeSeriesStats(data: TimeSeriesPoint[]): AnalyticsStats {
+  const values = data.map((d) => d.value);
+  const n = values.length;
+  if (n === 0) {
+    return { mean: 0, median: 0, min: 0, max: 0, trend: 0, recentChange: 0 };
+  }
+  const sorted = [...values].sort((a, b) => a - b);
+  const mean = values.reduce((sum, v) => sum + v, 0) / n;
+
+  const years = data.map((d) => Number(d.date.split('-')[0]));
+  let trend = 0;
+  if (n > 1) {
+    const sumX = years.reduce((sum, x) => sum + x, 0);
+    const sumY = values.reduce((sum, y) => sum + y, 0);
+    const sumXY = years.reduce((sum, x, i) => sum + x * values[i], 0);
+    const sumX2 = years.reduce((sum, x) => sum + x * x, 0);
+    trend = (n * sumXY - sumX * sumY) / (n * sumX2 - sumX * sumX);
+  }
+
+  let recentChange = 0;
+  if (n >= 10) {
+    const recent = values.slice(-5).reduce((sum, v) => sum + v, 0) / 5;
+    const early = values.slice(0, 5).reduce((sum, v) => sum + v, 0) / 5;
+    recentChange = recent - early;
+  }
+
+  const round = (v: number) => Math.round(v * 100) / 100;
+  return {
+    mean: round(mean),
+    median: round(sorted[Math.floor(n / 2)]),
+    min: round(sorted[0]),
+    max: round(sorted[n - 1]),
+    trend: round(trend),
+    recentChange: round(recentChange),
+  };
+}
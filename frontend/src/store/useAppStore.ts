@@ -1,5 +1,5 @@
 import { create } from 'zustand';
-import { MapClickData, TimeSeries } from '@/types/analytics';
+import { MapClickData, TimeSeries, FloodScenarioSweep } from '@/types/analytics';
 import { StormSummary } from '@/types/storm';
 
 interface AppState {
@@ -12,10 +12,13 @@ interface AppState {
   // Scenario controls
   scenarioMeters: number;
   setScenarioMeters: (meters: number) => void;
+  floodSweep: FloodScenarioSweep | null;
+  setFloodSweep: (sweep: FloodScenarioSweep | null) => void;
   
   // Active layers
   activeLayers: {
     sla: boolean;
+    anomaly: boolean;
     dem: boolean;
     flood: boolean;
     storms: boolean;
@@ -64,10 +67,13 @@ export const useAppStore = create<AppState>((set) => ({
   // Scenario controls
   scenarioMeters: 0,
   setScenarioMeters: (meters) => set({ scenarioMeters: meters }),
+  floodSweep: null,
+  setFloodSweep: (sweep) => set({ floodSweep: sweep }),
   
   // Active layers
   activeLayers: {
     sla: true,
+    anomaly: false,
     dem: false,
     flood: false,
     storms: false,
@@ -28,6 +28,46 @@ export type TimeSeriesPoint = z.infer<typeof TimeSeriesPointSchema>;
 export type TimeSeries = z.infer<typeof TimeSeriesSchema>;
 export type AnalyticsStats = z.infer<typeof AnalyticsStatsSchema>;
 
+// Flood scenario sweep over a region (backend /api/flood-scenarios)
+export interface FloodScenarioResult {
+  scenario: number; // meters above current sea level
+  inundatedAreaKm2: number;
+  exposedCells: number;
+  fraction: number; // of the land area in the region
+}
+
+export interface FloodScenarioSweep {
+  bbox: [number, number, number, number];
+  zoom: number;
+  pixelSizeM: number;
+  landCells: number;
+  landAreaKm2: number;
+  referenceMonths: [string, string] | null;
+  scenarios: FloodScenarioResult[];
+}
+
+// Downsampled monthly SLA slab (backend /api/sla-grid)
+export type SlaGridDtype = 'float32' | 'uint16' | 'uint8';
+
+export interface SlaGridInfo {
+  shape: [number, number]; // rows (north to south), cols (west to east)
+  dtype: SlaGridDtype;
+  unit: 'mm';
+  lat: [number, number]; // first row center, step (negative)
+  lon: [number, number]; // first column center, step
+  stride: number;
+  year: number;
+  month: number;
+  scale: number; // value = raw * scale + offset
+  offset: number;
+  nodata: number | null; // null for float32, where NaN marks land
+}
+
+export interface SlaGrid {
+  info: SlaGridInfo;
+  data: Float32Array | Uint16Array | Uint8Array;
+}
+
 // Map click data
 export interface MapClickData {
   lat: number;